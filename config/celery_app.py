@@ -1,10 +1,17 @@
 import os
+import sys
+from pathlib import Path
 
 from celery import Celery
 
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
 
+# Mirror the wsgi entrypoints so that workers can resolve the
+# `notification.messages.*` modules used by the email senders.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "zedasignal_backend"))
+
 app = Celery("zedasignal_backend")
 
 # Using a string here means the worker doesn't have to serialize
@@ -6,6 +6,7 @@ from datetime import timedelta
 from pathlib import Path
 
 import environ
+from kombu import Queue
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
 # zedasignal_backend/
@@ -90,6 +91,7 @@ LOCAL_APPS = [
     # Your stuff: custom apps go here
     "zedasignal_backend.apps.users",
     "zedasignal_backend.apps.trading",
+    "zedasignal_backend.apps.notifications",
 ]
 
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -228,6 +230,14 @@ EMAIL_BACKEND = env(
 )
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-timeout
 EMAIL_TIMEOUT = 5
+# Number of recipients built and sent at a time by MassEmailSender
+MASS_EMAIL_CHUNK_SIZE = env.int("MASS_EMAIL_CHUNK_SIZE", default=200)
+# Concurrent SMTP sessions used by the asyncio transport
+EMAIL_ASYNC_CONNECTIONS = env.int("EMAIL_ASYNC_CONNECTIONS", default=10)
+# Concurrent connections used by send_mass_html_mail
+EMAIL_POOL_CONNECTIONS = env.int("EMAIL_POOL_CONNECTIONS", default=4)
+# Envelope recipients per SMTP transaction when the same email is broadcast to many users
+EMAIL_BROADCAST_BATCH_SIZE = env.int("EMAIL_BROADCAST_BATCH_SIZE", default=50)
 
 # ADMIN
 # ------------------------------------------------------------------------------
@@ -262,6 +272,10 @@ LOGGING = {
         }
     },
     "root": {"level": "INFO", "handlers": ["console"]},
+    "loggers": {
+        # httpx logs every request at INFO
+        "httpx": {"level": "WARNING"},
+    },
 }
 
 # Celery
@@ -294,10 +308,37 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-schedule
+CELERY_BEAT_SCHEDULE = {
+    "relay-outbox-events": {
+        "task": "zedasignal_backend.apps.notifications.tasks.relay_outbox_events",
+        "schedule": env.float("NOTIFICATION_OUTBOX_RELAY_INTERVAL", default=30),
+    },
+}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-send-task-events
 CELERY_WORKER_SEND_TASK_EVENTS = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_send_sent_event
 CELERY_TASK_SEND_SENT_EVENT = True
+# https://docs.celeryq.dev/en/stable/userguide/routing.html
+# Signal delivery has a queue of its own so a burst of transactional emails can't delay it, and
+# housekeeping can't hold up either. The Procfile runs a worker per queue, with the prefetch and
+# concurrency suited to its tasks; a worker consuming several queues drains them in this order.
+CELERY_TASK_QUEUES = (
+    Queue("signals", routing_key="signals"),
+    Queue("transactional", routing_key="transactional"),
+    Queue("maintenance", routing_key="maintenance"),
+)
+CELERY_TASK_DEFAULT_QUEUE = "transactional"
+CELERY_TASK_ROUTES = {
+    "zedasignal_backend.apps.trading.tasks.*": {"queue": "signals"},
+    # the relay hands new signals over to the fan-out, so it sits on the signal delivery path
+    "zedasignal_backend.apps.notifications.tasks.relay_outbox_events": {"queue": "signals"},
+    "zedasignal_backend.apps.notifications.tasks.send_queued_notification": {"queue": "transactional"},
+    "zedasignal_backend.apps.users.tasks.*": {"queue": "maintenance"},
+    "celery.backend_cleanup": {"queue": "maintenance"},
+}
+# https://docs.celeryq.dev/projects/kombu/en/stable/reference/kombu.transport.redis.html#transport-options
+CELERY_BROKER_TRANSPORT_OPTIONS = {"queue_order_strategy": "priority"}
 # django-allauth
 # ------------------------------------------------------------------------------
 ACCOUNT_ALLOW_REGISTRATION = env.bool("DJANGO_ACCOUNT_ALLOW_REGISTRATION", True)
@@ -459,6 +500,12 @@ DJANGO_REST_PASSWORDRESET_TOKEN_CONFIG = {
 
 # views default page size
 DEFAULT_PAGE_SIZE = 50
+# Seconds a payload cached by a view with `cache_models` is kept. Changes to those models invalidate it
+# straight away, the timeout only bounds how long payloads of older versions linger in the cache.
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=60 * 60)
+# Seconds a changed row is held back from delta syncs (see `ChangesCursorPagination`). It should outlast the
+# longest transaction that saves one, or a row committed late could be skipped by a client's cursor.
+DELTA_SYNC_SETTLE_SECONDS = env.int("DELTA_SYNC_SETTLE_SECONDS", default=5)
 
 
 # Termii Settings
@@ -466,3 +513,55 @@ DEFAULT_PAGE_SIZE = 50
 TERMII_BASE_URL = env.str("TERMII_BASE_URL")
 TERMII_SENDER_ID = env.str("TERMII_SENDER_ID")
 TERMII_API_KEY = env.str("TERMII_API_KEY")
+# Pooled keep-alive HTTP session shared by the SMS clients
+TERMII_HTTP_POOL_CONNECTIONS = env.int("TERMII_HTTP_POOL_CONNECTIONS", default=4)
+TERMII_HTTP_POOL_SIZE = env.int("TERMII_HTTP_POOL_SIZE", default=16)
+TERMII_HTTP_CONNECT_TIMEOUT = env.float("TERMII_HTTP_CONNECT_TIMEOUT", default=3.05)
+TERMII_HTTP_READ_TIMEOUT = env.float("TERMII_HTTP_READ_TIMEOUT", default=15)
+# Bulk sms recipients are sent in batches, concurrently. Keep the workers within the pool size.
+TERMII_BULK_BATCH_SIZE = env.int("TERMII_BULK_BATCH_SIZE", default=1000)
+TERMII_BULK_MAX_WORKERS = env.int("TERMII_BULK_MAX_WORKERS", default=8)
+# Upper bound on concurrent requests made by the asyncio termii client
+TERMII_ASYNC_MAX_IN_FLIGHT = env.int("TERMII_ASYNC_MAX_IN_FLIGHT", default=100)
+
+# Notifications transport
+# ------------------------------------------------------------------------------
+# "sync" sends signal fan-out with the blocking clients, "async" with the asyncio termii client and
+# asyncio SMTP sender. The asyncio SMTP sender talks to EMAIL_HOST directly, only use it with SMTP.
+NOTIFICATION_TRANSPORT = env.str("NOTIFICATION_TRANSPORT", default="sync")
+# Token buckets shared by every worker, as (requests per second, burst size) per provider. A rate of 0
+# disables the limit. Termii is limited per api request, email per recipient.
+NOTIFICATION_RATE_LIMITS = {
+    "termii": (env.float("TERMII_RATE_LIMIT", default=20), env.int("TERMII_RATE_LIMIT_BURST", default=20)),
+    "email": (env.float("EMAIL_RATE_LIMIT", default=50), env.int("EMAIL_RATE_LIMIT_BURST", default=50)),
+}
+# Sends that fail with a transient provider error (a dropped connection, a timeout, a 429 or 5xx from
+# termii, a 4xx from the SMTP server) are retried this many times. The n-th retry waits a random delay
+# of up to BASE_DELAY * 2 ** n seconds, capped at MAX_DELAY. Recipients that still fail are kept as
+# dead letters, see `manage.py replay_dead_letters`.
+NOTIFICATION_RETRY_ATTEMPTS = env.int("NOTIFICATION_RETRY_ATTEMPTS", default=3)
+NOTIFICATION_RETRY_BASE_DELAY = env.float("NOTIFICATION_RETRY_BASE_DELAY", default=0.5)
+NOTIFICATION_RETRY_MAX_DELAY = env.float("NOTIFICATION_RETRY_MAX_DELAY", default=10)
+# Once termii or the email server fails FAILURE_THRESHOLD times with a transient error within
+# FAILURE_WINDOW seconds, its circuit opens and sends fail straight away instead of waiting for the
+# provider's timeout. After RESET_TIMEOUT seconds a single send probes the provider and closes the
+# circuit if it answers. The circuit is shared by every worker through the default cache, see
+# `manage.py notification_circuit_breakers`. A threshold of 0 disables the circuit breakers.
+NOTIFICATION_CIRCUIT_BREAKER_FAILURE_THRESHOLD = env.int("NOTIFICATION_CIRCUIT_BREAKER_FAILURE_THRESHOLD", default=10)
+NOTIFICATION_CIRCUIT_BREAKER_FAILURE_WINDOW = env.float("NOTIFICATION_CIRCUIT_BREAKER_FAILURE_WINDOW", default=60)
+NOTIFICATION_CIRCUIT_BREAKER_RESET_TIMEOUT = env.float("NOTIFICATION_CIRCUIT_BREAKER_RESET_TIMEOUT", default=30)
+
+# Notifications outbox
+# ------------------------------------------------------------------------------
+# Number of outbox events locked and relayed per transaction
+NOTIFICATION_OUTBOX_BATCH_SIZE = env.int("NOTIFICATION_OUTBOX_BATCH_SIZE", default=100)
+# Events whose handler failed this many times are left for inspection in the admin
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = env.int("NOTIFICATION_OUTBOX_MAX_ATTEMPTS", default=5)
+
+# Signal dispatch
+# ------------------------------------------------------------------------------
+# Number of subscribers handled by a single signal fan-out child task
+SIGNAL_DISPATCH_CHUNK_SIZE = env.int("SIGNAL_DISPATCH_CHUNK_SIZE", default=500)
+# Seconds after which deliveries claimed by a fan-out task that never finished, e.g. because its worker
+# died, can be claimed again. It should outlast the slowest chunk.
+SIGNAL_DELIVERY_CLAIM_TIMEOUT = env.int("SIGNAL_DELIVERY_CLAIM_TIMEOUT", default=15 * 60)
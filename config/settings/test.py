@@ -25,6 +25,16 @@ PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
+# NOTIFICATIONS
+# ------------------------------------------------------------------------------
+NOTIFICATION_RATE_LIMITS: dict = {}
+NOTIFICATION_RETRY_BASE_DELAY = 0
+NOTIFICATION_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 0
+
+# DELTA SYNC
+# ------------------------------------------------------------------------------
+DELTA_SYNC_SETTLE_SECONDS = 0
+
 # DEBUGGING FOR TEMPLATES
 # ------------------------------------------------------------------------------
 TEMPLATES[0]["OPTIONS"]["debug"] = True  # type: ignore # noqa: F405
@@ -27,6 +27,7 @@ urlpatterns += [
     # API base url
     path(f"{API_PATH_PREFIX}auth/", include("config.auth_api_router")),
     path(f"{API_PATH_PREFIX}trading/", include("zedasignal_backend.apps.trading.urls"), name="trading"),  # type: ignore # noqa: E501
+    path(f"{API_PATH_PREFIX}notifications/", include("zedasignal_backend.apps.notifications.urls")),
     path(f"{API_PATH_PREFIX}schema/", SpectacularAPIView.as_view(), name="api-schema"),  # type: ignore
     path(
         f"{API_PATH_PREFIX}docs/",
@@ -0,0 +1,31 @@
+from django.contrib import admin
+
+from zedasignal_backend.apps.notifications import models
+
+
+@admin.register(models.OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = (
+        "event_type",
+        "payload",
+        "attempts",
+        "processed_at",
+        "created_at",
+    )
+    list_filter = ("event_type",)
+    readonly_fields = ("created_at",)
+
+
+@admin.register(models.DeadLetter)
+class DeadLetterAdmin(admin.ModelAdmin):
+    list_display = (
+        "kind",
+        "channel",
+        "recipient",
+        "error",
+        "replayed_at",
+        "created_at",
+    )
+    list_filter = ("kind", "channel")
+    search_fields = ("recipient",)
+    readonly_fields = ("created_at",)
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class NotificationsConfig(AppConfig):
+    name = "zedasignal_backend.apps.notifications"
+    verbose_name = _("Notifications")
+    default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        import zedasignal_backend.apps.notifications.checks  # noqa
+        from zedasignal_backend.core.notification_catalog import notification_catalog
+
+        notification_catalog.load()
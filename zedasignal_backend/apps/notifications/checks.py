@@ -0,0 +1,20 @@
+from django.core.checks import Error, register
+
+from zedasignal_backend.core.notification_catalog import notification_catalog
+
+
+@register()
+def check_notification_catalog(app_configs, **kwargs):
+    """
+    Reports the notification messages whose module or html template couldn't be loaded.
+    """
+    if not notification_catalog.loaded:
+        notification_catalog.load()
+    return [
+        Error(
+            f"Notification message can't be loaded: {error}",
+            hint="Check the module's MyMessages class and that its HTML_TEMPLATE exists.",
+            id="notifications.E001",
+        )
+        for error in notification_catalog.errors
+    ]
@@ -0,0 +1,57 @@
+from collections.abc import Callable
+
+import environ
+from django.db import transaction
+
+from zedasignal_backend.apps.notifications.models import OutboxEvent
+from zedasignal_backend.apps.trading.models import Subscription
+from zedasignal_backend.apps.trading.tasks import dispatch_signal_notifications
+from zedasignal_backend.apps.users.utils import get_custom_user_model
+from zedasignal_backend.core.sender import Sender
+
+User = get_custom_user_model()
+env = environ.Env()
+
+
+def handle_signal_created(signal_id: int):
+    """
+    Hands the signal over to the celery fan-out pipeline once the relay's batch commits. The fan-out
+    tasks claim each delivery before sending it, so a redelivered event never notifies a subscriber twice.
+    """
+    transaction.on_commit(lambda: dispatch_signal_notifications.delay(signal_id))
+
+
+def handle_subscription_activated(subscription_id: int):
+    subscription = Subscription.objects.select_related("user", "plan").get(id=subscription_id)
+    domain = env.str("DOMAIN_NAME")
+    Sender(
+        subscription.user,
+        email_content_object="notification.messages.subscription_activation",
+        email_notif=True,
+        context={
+            "subscription_plan": subscription.plan,
+            "subscription": subscription,
+            "user": subscription.user,
+            "domain": domain,
+        },
+        queued=True,
+    )
+
+
+def handle_user_registered(user_id: int):
+    user = User.objects.get(id=user_id)
+    domain = env.str("DOMAIN_NAME")
+    Sender(
+        user,
+        email_content_object="notification.messages.registration_success_welcome",
+        email_notif=True,
+        context={"user": user, "domain": domain},
+        queued=True,
+    )
+
+
+EVENT_HANDLERS: dict[str, Callable[..., None]] = {
+    OutboxEvent.EventType.SIGNAL_CREATED: handle_signal_created,
+    OutboxEvent.EventType.SUBSCRIPTION_ACTIVATED: handle_subscription_activated,
+    OutboxEvent.EventType.USER_REGISTERED: handle_user_registered,
+}
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from zedasignal_backend.core.circuit_breaker import PROVIDERS, get_circuit_breaker
+
+
+class Command(BaseCommand):
+    help = "Reports the circuit breaker state of every notification provider, and optionally closes them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--close",
+            action="store_true",
+            help="Close the circuits, e.g. once a provider outage is known to be over.",
+        )
+
+    def handle(self, *args, **options):
+        for provider in PROVIDERS:
+            breaker = get_circuit_breaker(provider)
+            if breaker is None:
+                self.stdout.write(f"{provider}: circuit breaker disabled")
+                continue
+            if options["close"]:
+                breaker.close()
+            self.stdout.write(
+                f"{provider}: {breaker.state}, {breaker.failures}/{breaker.failure_threshold} failures "
+                f"in the last {breaker.failure_window:.0f}s"
+            )
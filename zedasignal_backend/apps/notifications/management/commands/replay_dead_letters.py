@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from zedasignal_backend.apps.notifications.models import DeadLetter
+from zedasignal_backend.apps.notifications.services import DeadLetterService
+
+
+class Command(BaseCommand):
+    help = "Queues the notifications that failed after their retries again, once the provider has recovered."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--kind", choices=DeadLetter.Kind.values, help="Only replay dead letters of this kind.")
+        parser.add_argument("--channel", help='Only replay dead letters of this channel, e.g. "email".')
+        parser.add_argument("--limit", type=int, help="Replay at most this many dead letters, oldest first.")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the dead letters waiting for a replay without queueing them.",
+        )
+
+    def handle(self, *args, **options):
+        dead_letters = DeadLetter.objects.filter(replayed_at__isnull=True).order_by("id")
+        if options["kind"]:
+            dead_letters = dead_letters.filter(kind=options["kind"])
+        if options["channel"]:
+            dead_letters = dead_letters.filter(channel=options["channel"])
+        if options["limit"]:
+            dead_letters = DeadLetter.objects.filter(
+                id__in=list(dead_letters.values_list("id", flat=True)[: options["limit"]])
+            )
+
+        if options["dry_run"]:
+            self.stdout.write(f"{dead_letters.count()} dead letters waiting for a replay.")
+            return
+        replayed = DeadLetterService.replay(dead_letters)
+        self.stdout.write(self.style.SUCCESS(f"Replayed {replayed} dead letters."))
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.4 on 2026-10-18 07:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("signal.created", "Signal created"),
+                            ("subscription.activated", "Subscription activated"),
+                            ("user.registered", "User registered"),
+                        ],
+                        max_length=50,
+                        verbose_name="event type",
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        default=dict, help_text="The ids of the objects the event is about.", verbose_name="payload"
+                    ),
+                ),
+                (
+                    "processed_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the event was handled. Pending events have none.",
+                        null=True,
+                        verbose_name="processed at",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="The number of failed attempts at handling the event.",
+                        verbose_name="attempts",
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True, default="", verbose_name="last error")),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("processed_at__isnull", True)), fields=["id"], name="outbox_event_pending"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.4 on 2026-10-18 07:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeadLetter",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("signal_delivery", "Signal delivery"), ("notification", "Notification")],
+                        max_length=30,
+                        verbose_name="kind",
+                    ),
+                ),
+                ("channel", models.CharField(max_length=20, verbose_name="channel")),
+                (
+                    "recipient",
+                    models.CharField(
+                        help_text="The email address or phone number the notification was sent to.",
+                        max_length=255,
+                        verbose_name="recipient",
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(
+                        default=dict,
+                        help_text="What is needed to send the notification again.",
+                        verbose_name="payload",
+                    ),
+                ),
+                ("error", models.TextField(blank=True, default="", verbose_name="error")),
+                (
+                    "replayed_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the notification was queued again. Dead letters waiting for a replay have none.",
+                        null=True,
+                        verbose_name="replayed at",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("replayed_at__isnull", True)), fields=["id"], name="dead_letter_pending"
+                    )
+                ],
+            },
+        ),
+    ]
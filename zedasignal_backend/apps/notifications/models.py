@@ -0,0 +1,106 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from zedasignal_backend.core.mixins import CreatedAtMixin
+
+
+class OutboxEvent(CreatedAtMixin, models.Model):
+    """
+    An event written in the same transaction as the change it describes, and relayed to its handler
+    by `relay_outbox_events` once committed. Events are never lost when a worker dies mid-way, and
+    handlers are kept out of the request.
+    """
+
+    class EventType(models.TextChoices):
+        SIGNAL_CREATED = "signal.created", "Signal created"
+        SUBSCRIPTION_ACTIVATED = "subscription.activated", "Subscription activated"
+        USER_REGISTERED = "user.registered", "User registered"
+
+    id: int
+    event_type = models.CharField(
+        _("event type"),
+        max_length=50,
+        choices=EventType.choices,
+    )
+    payload = models.JSONField(
+        _("payload"),
+        default=dict,
+        help_text=_("The ids of the objects the event is about."),
+    )
+    processed_at = models.DateTimeField(
+        _("processed at"),
+        blank=True,
+        null=True,
+        help_text=_("When the event was handled. Pending events have none."),
+    )
+    attempts = models.PositiveIntegerField(
+        _("attempts"),
+        default=0,
+        help_text=_("The number of failed attempts at handling the event."),
+    )
+    last_error = models.TextField(
+        _("last error"),
+        blank=True,
+        default="",
+    )
+
+    class Meta:
+        indexes = [
+            # The relay only ever scans pending events, in id order
+            models.Index(fields=["id"], condition=models.Q(processed_at__isnull=True), name="outbox_event_pending"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} #{self.id}"
+
+
+class DeadLetter(CreatedAtMixin, models.Model):
+    """
+    A notification that still failed once its retries were exhausted. It keeps what is needed to send
+    the notification again, so it can be replayed with `manage.py replay_dead_letters` once the
+    provider has recovered.
+    """
+
+    class Kind(models.TextChoices):
+        SIGNAL_DELIVERY = "signal_delivery", "Signal delivery"
+        NOTIFICATION = "notification", "Notification"
+
+    id: int
+    kind = models.CharField(
+        _("kind"),
+        max_length=30,
+        choices=Kind.choices,
+    )
+    channel = models.CharField(
+        _("channel"),
+        max_length=20,
+    )
+    recipient = models.CharField(
+        _("recipient"),
+        max_length=255,
+        help_text=_("The email address or phone number the notification was sent to."),
+    )
+    payload = models.JSONField(
+        _("payload"),
+        default=dict,
+        help_text=_("What is needed to send the notification again."),
+    )
+    error = models.TextField(
+        _("error"),
+        blank=True,
+        default="",
+    )
+    replayed_at = models.DateTimeField(
+        _("replayed at"),
+        blank=True,
+        null=True,
+        help_text=_("When the notification was queued again. Dead letters waiting for a replay have none."),
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["id"], condition=models.Q(replayed_at__isnull=True), name="dead_letter_pending"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} to {self.recipient} #{self.id}"
@@ -0,0 +1,151 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from zedasignal_backend.apps.notifications.models import DeadLetter, OutboxEvent
+from zedasignal_backend.apps.trading.models import SignalDelivery, SubscriptionPlan
+from zedasignal_backend.core.circuit_breaker import PROVIDERS, CircuitBreaker, get_circuit_breaker
+from zedasignal_backend.core.metrics import get_counter
+
+CIRCUIT_BREAKER_STATES = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+
+
+class OutboxService:
+    @staticmethod
+    def publish(event_type: OutboxEvent.EventType, **payload) -> OutboxEvent:
+        """
+        This method writes an event to the outbox in the current transaction, and nudges the relay once the
+        transaction commits. Events of rolled back transactions are discarded with them.
+
+        Args:
+            event_type (OutboxEvent.EventType): The type of the event.
+            **payload: The ids of the objects the event is about, e.g. `signal_id=1`.
+        """
+        from zedasignal_backend.apps.notifications.tasks import relay_outbox_events
+
+        event = OutboxEvent.objects.create(event_type=event_type, payload=payload)
+        transaction.on_commit(relay_outbox_events.delay)
+        return event
+
+
+class DeadLetterService:
+    @staticmethod
+    def record_signal_deliveries(signal_id: int, channel: str, recipients: dict[int, str], error: str):
+        """
+        This method records the subscribers a signal couldn't be delivered to.
+
+        Args:
+            signal_id (int): The id of the signal.
+            channel (str): The channel the signal was sent by, e.g. "email".
+            recipients (dict[int, str]): The email address or phone number of each failed subscriber, by user id.
+            error (str): Why the signal couldn't be delivered.
+        """
+        DeadLetter.objects.bulk_create(
+            DeadLetter(
+                kind=DeadLetter.Kind.SIGNAL_DELIVERY,
+                channel=channel,
+                recipient=recipient or "",
+                payload={"signal_id": signal_id, "user_id": user_id},
+                error=error,
+            )
+            for user_id, recipient in recipients.items()
+        )
+
+    @staticmethod
+    def record_notification(recipient: dict, sender_kwargs: dict, error: str) -> DeadLetter:
+        """
+        This method records a queued notification that couldn't be sent.
+
+        Args:
+            recipient (dict): The serialised recipient the notification was queued for.
+            sender_kwargs (dict): The serialised arguments of the `Sender`.
+            error (str): Why the notification couldn't be sent.
+        """
+        channel = "email" if sender_kwargs.get("email_notif") else "sms"
+        return DeadLetter.objects.create(
+            kind=DeadLetter.Kind.NOTIFICATION,
+            channel=channel,
+            recipient=str(recipient.get("email" if channel == "email" else "phone_number") or recipient),
+            payload={"recipient": recipient, "kwargs": sender_kwargs},
+            error=error,
+        )
+
+    @staticmethod
+    def replay(dead_letters: QuerySet[DeadLetter]) -> int:
+        """
+        This method queues the dead letters that weren't replayed yet again, and marks them replayed.
+        Signal deliveries are sent again in one task per signal and channel. Returns the number of dead
+        letters replayed.
+
+        Args:
+            dead_letters (QuerySet[DeadLetter]): The dead letters to replay.
+        """
+        from zedasignal_backend.apps.notifications.tasks import send_queued_notification
+        from zedasignal_backend.apps.trading.tasks import CHANNEL_TASKS
+
+        with transaction.atomic():
+            dead_letters = list(dead_letters.filter(replayed_at__isnull=True).select_for_update(skip_locked=True))
+            user_ids_by_signal = defaultdict(list)
+            for dead_letter in dead_letters:
+                if dead_letter.kind == DeadLetter.Kind.SIGNAL_DELIVERY:
+                    key = (dead_letter.payload["signal_id"], dead_letter.channel)
+                    user_ids_by_signal[key].append(dead_letter.payload["user_id"])
+                else:
+                    payload = dead_letter.payload
+                    transaction.on_commit(
+                        lambda payload=payload: send_queued_notification.delay(
+                            payload["recipient"], **payload["kwargs"]
+                        )
+                    )
+            for (signal_id, channel), user_ids in user_ids_by_signal.items():
+                task = CHANNEL_TASKS[channel]
+                transaction.on_commit(
+                    lambda task=task, signal_id=signal_id, user_ids=user_ids: task.delay(signal_id, user_ids)
+                )
+
+            DeadLetter.objects.filter(id__in=[dead_letter.id for dead_letter in dead_letters]).update(
+                replayed_at=timezone.now()
+            )
+        return len(dead_letters)
+
+
+class NotificationMetricsService:
+    @staticmethod
+    def render() -> str:
+        """
+        This method returns the notification metrics in the Prometheus text format: the signal deliveries
+        marked per channel and status, and the state, recent failures and openings of each provider's circuit.
+        """
+        lines = [
+            "# HELP signal_deliveries_total Signal deliveries marked sent, failed or skipped.",
+            "# TYPE signal_deliveries_total counter",
+        ]
+        for channel in SubscriptionPlan.NotificationChannels.values:
+            for status in (SignalDelivery.Status.SENT, SignalDelivery.Status.FAILED, SignalDelivery.Status.SKIPPED):
+                value = get_counter("signal_deliveries_total", channel=channel, status=status)
+                lines.append(f'signal_deliveries_total{{channel="{channel}",status="{status}"}} {value}')
+
+        breakers = {provider: get_circuit_breaker(provider) for provider in PROVIDERS}
+        lines += [
+            "# HELP circuit_breaker_state State of the provider's circuit: 0 closed, 1 half open, 2 open.",
+            "# TYPE circuit_breaker_state gauge",
+        ]
+        for provider, breaker in breakers.items():
+            state = CIRCUIT_BREAKER_STATES[breaker.state] if breaker else 0
+            lines.append(f'circuit_breaker_state{{provider="{provider}"}} {state}')
+        lines += [
+            "# HELP circuit_breaker_failures Transient failures of the provider within the failure window.",
+            "# TYPE circuit_breaker_failures gauge",
+        ]
+        for provider, breaker in breakers.items():
+            lines.append(f'circuit_breaker_failures{{provider="{provider}"}} {breaker.failures if breaker else 0}')
+        lines += [
+            "# HELP circuit_breaker_opened_total Times the provider's circuit opened.",
+            "# TYPE circuit_breaker_opened_total counter",
+        ]
+        for provider in PROVIDERS:
+            value = get_counter("circuit_breaker_opened_total", provider=provider)
+            lines.append(f'circuit_breaker_opened_total{{provider="{provider}"}} {value}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,110 @@
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from config import celery_app
+from zedasignal_backend.apps.notifications.handlers import EVENT_HANDLERS
+from zedasignal_backend.apps.notifications.models import OutboxEvent
+from zedasignal_backend.apps.notifications.services import DeadLetterService
+from zedasignal_backend.core.circuit_breaker import CircuitOpenError
+from zedasignal_backend.core.sender import Sender, deserialize_notification_value
+from zedasignal_backend.core.termii.utils import is_transient_termii_error
+from zedasignal_backend.core.utils.dict_to_object import DictToObject
+from zedasignal_backend.core.utils.smtp_pool import is_transient_smtp_error
+
+
+def relay_outbox_batch(after_id: int = 0) -> list[int]:
+    """
+    Locks the next batch of pending events after `after_id`, hands each to its handler and records
+    the outcome. Returns the ids of the events in the batch.
+
+    Events locked by another relay are skipped rather than waited for, so several relays can drain
+    the outbox in parallel without handling an event twice.
+    """
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(
+                id__gt=after_id,
+                processed_at__isnull=True,
+                attempts__lt=settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS,
+            )
+            .order_by("id")[: settings.NOTIFICATION_OUTBOX_BATCH_SIZE]
+        )
+        for event in events:
+            try:
+                with transaction.atomic():
+                    EVENT_HANDLERS[event.event_type](**event.payload)
+            except Exception as error:
+                event.attempts += 1
+                event.last_error = repr(error)
+            else:
+                event.processed_at = timezone.now()
+        OutboxEvent.objects.bulk_update(events, ["processed_at", "attempts", "last_error"])
+    return [event.id for event in events]
+
+
+@celery_app.task(acks_late=True, ignore_result=True)
+def relay_outbox_events():
+    """
+    Drains the outbox batch by batch, each event at most once per run. Nudged whenever an event is
+    committed, and run periodically by celery beat to pick up events whose nudge was lost or whose
+    handler failed.
+    """
+    number_of_relayed_events = 0
+    event_ids = relay_outbox_batch()
+    while event_ids:
+        number_of_relayed_events += len(event_ids)
+        if len(event_ids) < settings.NOTIFICATION_OUTBOX_BATCH_SIZE:
+            break
+        event_ids = relay_outbox_batch(after_id=event_ids[-1])
+    return number_of_relayed_events
+
+
+class DeadLetterTask(celery_app.Task):
+    """
+    Records the notification of a task that failed for good in the dead letters.
+    """
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        DeadLetterService.record_notification(args[0], kwargs, repr(exc))
+
+
+@celery_app.task(
+    base=DeadLetterTask,
+    bind=True,
+    max_retries=5,
+    ignore_result=True,
+)
+def send_queued_notification(self, recipient: dict, **kwargs):
+    """
+    Sends a notification queued with `Sender(..., queued=True)`. Transient failures of the email or
+    sms provider, or its circuit being open, are retried with a jittered exponential backoff, and the
+    notification is kept in the dead letters once the retries are exhausted. Permanent failures, like a
+    refused recipient or a rejected sms, are kept in the dead letters straight away.
+
+    Args:
+        recipient (dict): The serialised recipient, a model reference or its email and phone number.
+        **kwargs: The serialised arguments of the `Sender`.
+    """
+    user_account = deserialize_notification_value(recipient)
+    if isinstance(user_account, dict):
+        user_account = DictToObject(user_account)
+    kwargs["context"] = deserialize_notification_value(kwargs.get("context"))
+    try:
+        Sender(user_account, **kwargs)
+    except Exception as error:
+        if not is_transient_notification_error(error):
+            raise
+        countdown = get_exponential_backoff_interval(
+            factor=1, retries=self.request.retries, maximum=600, full_jitter=True
+        )
+        raise self.retry(exc=error, countdown=countdown)
+
+
+def is_transient_notification_error(error: Exception) -> bool:
+    """
+    Tells whether sending a queued notification again may succeed.
+    """
+    return isinstance(error, CircuitOpenError) or is_transient_smtp_error(error) or is_transient_termii_error(error)
@@ -0,0 +1,183 @@
+from io import StringIO
+from smtplib import SMTPRecipientsRefused
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+from zedasignal_backend.apps.notifications.models import DeadLetter
+from zedasignal_backend.apps.trading.models import SignalDelivery
+from zedasignal_backend.apps.trading.services import SignalDeliveryService
+from zedasignal_backend.apps.trading.tasks import (
+    send_signal_to_subscribers_by_email,
+    send_signal_to_subscribers_by_sms,
+)
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory, SubscriptionFactory
+from zedasignal_backend.core.mass_email_sender import MassEmailSender
+from zedasignal_backend.core.sender import Sender
+from zedasignal_backend.core.termii.bulk_termii_sender import TermiiBulkSmsSender
+
+pytestmark = pytest.mark.django_db
+
+
+class RefusingEmailBackend(EmailBackend):
+    """
+    Refuses every message sent to one of `refused_recipients` for good, like a mailbox that doesn't exist.
+    """
+
+    refused_recipients: set[str] = set()
+
+    def send_messages(self, messages):
+        for message in messages:
+            refused = self.refused_recipients.intersection(message.recipients())
+            if refused:
+                raise SMTPRecipientsRefused({recipient: (550, b"No such user") for recipient in refused})
+        return super().send_messages(messages)
+
+
+def test_sms_batches_are_retried_through_a_brief_outage(settings, termii_server):
+    settings.TERMII_BULK_BATCH_SIZE = 2
+    termii_server.status_codes = [503, 429]
+
+    result = TermiiBulkSmsSender().send_bulk_sms(to=["+2348030000001", "+2348030000002"], message="x")
+
+    assert result.succeeded
+    assert len(termii_server.requests) == 3
+
+
+def test_sms_batches_failing_after_their_retries_become_dead_letters(settings, termii_server):
+    settings.TERMII_BULK_BATCH_SIZE = 2
+    settings.NOTIFICATION_RETRY_ATTEMPTS = 2
+    termii_server.status_code = 503
+    subscriptions = SubscriptionFactory.create_batch(3)
+    user_ids = [subscription.user.id for subscription in subscriptions]
+    signal = SignalFactory()
+    SignalDeliveryService.create_pending_deliveries(signal.id, "sms", user_ids)
+
+    send_signal_to_subscribers_by_sms(signal.id, user_ids)
+
+    # each of the 2 batches is sent once and retried twice
+    assert len(termii_server.requests) == 6
+    dead_letters = DeadLetter.objects.filter(kind=DeadLetter.Kind.SIGNAL_DELIVERY, channel="sms")
+    assert sorted(dead_letter.payload["user_id"] for dead_letter in dead_letters) == sorted(user_ids)
+    assert all(dead_letter.payload["signal_id"] == signal.id for dead_letter in dead_letters)
+    assert all("503" in dead_letter.error for dead_letter in dead_letters)
+
+
+def test_refused_emails_become_dead_letters_and_the_rest_are_sent(settings, monkeypatch):
+    settings.EMAIL_BACKEND = f"{__name__}.RefusingEmailBackend"
+    subscriptions = SubscriptionFactory.create_batch(3)
+    refused_user = subscriptions[0].user
+    monkeypatch.setattr(RefusingEmailBackend, "refused_recipients", {refused_user.username})
+    user_ids = [subscription.user.id for subscription in subscriptions]
+    signal = SignalFactory()
+    SignalDeliveryService.create_pending_deliveries(signal.id, "email", user_ids)
+
+    send_signal_to_subscribers_by_email(signal.id, user_ids)
+
+    assert len(mail.outbox) == 2
+    statuses = dict(SignalDelivery.objects.filter(signal=signal, channel="email").values_list("user_id", "status"))
+    assert statuses.pop(refused_user.id) == SignalDelivery.Status.FAILED
+    assert set(statuses.values()) == {SignalDelivery.Status.SENT}
+    dead_letter = DeadLetter.objects.get()
+    assert dead_letter.recipient == refused_user.username
+    assert dead_letter.payload == {"signal_id": signal.id, "user_id": refused_user.id}
+    assert "550" in dead_letter.error
+
+
+def test_users_already_dead_lettered_are_not_recorded_again_when_the_task_fails(settings, monkeypatch):
+    settings.EMAIL_BACKEND = f"{__name__}.RefusingEmailBackend"
+    settings.MASS_EMAIL_CHUNK_SIZE = 1
+    users = sorted((subscription.user for subscription in SubscriptionFactory.create_batch(3)), key=lambda u: u.id)
+    monkeypatch.setattr(RefusingEmailBackend, "refused_recipients", {users[0].username})
+    user_ids = [user.id for user in users]
+    signal = SignalFactory()
+    SignalDeliveryService.create_pending_deliveries(signal.id, "email", user_ids)
+    setup_user_for_mass_emails = MassEmailSender.setup_user_for_mass_emails
+
+    def fail_after_the_first_chunk(self, users_chunk):
+        if users_chunk[0] != users[0]:
+            raise RuntimeError("worker shutting down")
+        return setup_user_for_mass_emails(self, users_chunk)
+
+    monkeypatch.setattr(MassEmailSender, "setup_user_for_mass_emails", fail_after_the_first_chunk)
+    with pytest.raises(RuntimeError):
+        send_signal_to_subscribers_by_email(signal.id, user_ids)
+
+    dead_letters = DeadLetter.objects.filter(kind=DeadLetter.Kind.SIGNAL_DELIVERY).order_by("payload__user_id")
+    assert [dead_letter.payload["user_id"] for dead_letter in dead_letters] == user_ids
+    assert "550" in dead_letters[0].error
+    assert "worker shutting down" in dead_letters[1].error
+
+
+def test_queued_notification_becomes_a_dead_letter_after_its_retries(settings, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    subscription = SubscriptionFactory()
+
+    with mock.patch.object(EmailMultiAlternatives, "send", side_effect=ConnectionRefusedError("refused")) as send:
+        with django_capture_on_commit_callbacks(execute=True):
+            Sender(
+                subscription.user,
+                email_content_object="notification.messages.subscription_activation",
+                email_notif=True,
+                context={"user": subscription.user},
+                queued=True,
+            )
+
+    assert send.call_count == 6
+    dead_letter = DeadLetter.objects.get(kind=DeadLetter.Kind.NOTIFICATION)
+    assert dead_letter.channel == "email"
+    assert dead_letter.payload["kwargs"]["email_content_object"] == "notification.messages.subscription_activation"
+    assert "ConnectionRefusedError" in dead_letter.error
+
+
+def test_queued_notification_refused_for_good_becomes_a_dead_letter_at_once(
+    settings, django_capture_on_commit_callbacks
+):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    subscription = SubscriptionFactory()
+    refused = SMTPRecipientsRefused({subscription.user.email: (550, b"No such user")})
+
+    with mock.patch.object(EmailMultiAlternatives, "send", side_effect=refused) as send:
+        with django_capture_on_commit_callbacks(execute=True):
+            Sender(
+                subscription.user,
+                email_content_object="notification.messages.subscription_activation",
+                email_notif=True,
+                context={"user": subscription.user},
+                queued=True,
+            )
+
+    assert send.call_count == 1
+    dead_letter = DeadLetter.objects.get(kind=DeadLetter.Kind.NOTIFICATION)
+    assert "550" in dead_letter.error
+
+
+def test_replay_queues_dead_letters_again_once(settings, termii_server, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.NOTIFICATION_RETRY_ATTEMPTS = 0
+    termii_server.status_code = 503
+    user_ids = [subscription.user.id for subscription in SubscriptionFactory.create_batch(2)]
+    signal = SignalFactory()
+    SignalDeliveryService.create_pending_deliveries(signal.id, "sms", user_ids)
+    send_signal_to_subscribers_by_sms(signal.id, user_ids)
+    termii_server.status_code = 200
+    termii_server.requests.clear()
+
+    output = StringIO()
+    call_command("replay_dead_letters", "--dry-run", stdout=output)
+    assert "2 dead letters" in output.getvalue()
+    assert termii_server.requests == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("replay_dead_letters", "--channel", "sms", stdout=output)
+        call_command("replay_dead_letters", stdout=output)
+
+    assert len(termii_server.recipients) == 2
+    assert not DeadLetter.objects.filter(replayed_at__isnull=True).exists()
+    assert set(SignalDelivery.objects.filter(signal=signal, channel="sms").values_list("status", flat=True)) == {
+        SignalDelivery.Status.SENT
+    }
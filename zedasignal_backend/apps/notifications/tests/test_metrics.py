@@ -0,0 +1,53 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from zedasignal_backend.apps.trading.models import SignalDelivery
+from zedasignal_backend.apps.trading.services import SignalDeliveryService
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory, SubscriptionFactory
+from zedasignal_backend.apps.users.models import User
+from zedasignal_backend.apps.users.tests.factories import UserFactory
+from zedasignal_backend.core.circuit_breaker import get_circuit_breaker
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def fetch_metrics(user: User):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client.get(reverse("notification-metrics"))
+
+
+def test_metrics_count_marked_deliveries_and_report_the_circuits(settings):
+    settings.NOTIFICATION_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3
+    signal = SignalFactory()
+    user_ids = [subscription.user_id for subscription in SubscriptionFactory.create_batch(3)]
+    SignalDeliveryService.create_pending_deliveries(signal.id, "email", user_ids)
+    SignalDeliveryService.mark_deliveries(signal.id, "email", user_ids[:2], SignalDelivery.Status.SENT)
+    SignalDeliveryService.mark_deliveries(signal.id, "email", user_ids, SignalDelivery.Status.FAILED, "refused")
+    get_circuit_breaker("termii").open()
+
+    response = fetch_metrics(UserFactory(type=User.ADMIN))
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    metrics = response.content.decode().splitlines()
+    # deliveries that were already sent are not counted again as failed
+    assert 'signal_deliveries_total{channel="email",status="sent"} 2' in metrics
+    assert 'signal_deliveries_total{channel="email",status="failed"} 1' in metrics
+    assert 'signal_deliveries_total{channel="sms",status="sent"} 0' in metrics
+    assert 'circuit_breaker_state{provider="termii"} 2' in metrics
+    assert 'circuit_breaker_state{provider="email"} 0' in metrics
+    assert 'circuit_breaker_opened_total{provider="termii"} 1' in metrics
+
+
+def test_metrics_are_only_served_to_admins():
+    assert fetch_metrics(UserFactory()).status_code == 403
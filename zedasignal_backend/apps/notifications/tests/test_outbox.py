@@ -0,0 +1,149 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from zedasignal_backend.apps.notifications import handlers
+from zedasignal_backend.apps.notifications.models import OutboxEvent
+from zedasignal_backend.apps.notifications.services import OutboxService
+from zedasignal_backend.apps.notifications.tasks import relay_outbox_batch, relay_outbox_events
+from zedasignal_backend.apps.trading.tasks import dispatch_signal_notifications
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory, SubscriptionPlanFactory
+from zedasignal_backend.apps.users.models import User
+from zedasignal_backend.apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_signal_event_is_written_in_the_signal_transaction(django_capture_on_commit_callbacks):
+    with mock.patch.object(relay_outbox_events, "delay") as delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            signal = SignalFactory()
+
+    event = OutboxEvent.objects.get()
+    assert event.event_type == OutboxEvent.EventType.SIGNAL_CREATED
+    assert event.payload == {"signal_id": signal.id}
+    delay.assert_called_once_with()
+
+
+def test_rolled_back_signal_leaves_no_event(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        with pytest.raises(RuntimeError), transaction.atomic():
+            SignalFactory()
+            raise RuntimeError("rollback")
+
+    assert not OutboxEvent.objects.exists()
+    assert callbacks == []
+
+
+def test_relay_hands_signals_to_the_fan_out_once(django_capture_on_commit_callbacks):
+    signal = SignalFactory()
+
+    with mock.patch.object(dispatch_signal_notifications, "delay") as delay:
+        with django_capture_on_commit_callbacks() as callbacks:
+            assert relay_outbox_events() == 1
+        # the fan-out only starts once the relay has committed its claim on the event
+        delay.assert_not_called()
+        for callback in callbacks:
+            callback()
+        with django_capture_on_commit_callbacks(execute=True):
+            assert relay_outbox_events() == 0
+
+    delay.assert_called_once_with(signal.id)
+    assert OutboxEvent.objects.get().processed_at is not None
+
+
+def test_failed_events_are_retried_until_max_attempts(settings, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS = 2
+    settings.NOTIFICATION_OUTBOX_BATCH_SIZE = 1
+    failing = OutboxService.publish(OutboxEvent.EventType.USER_REGISTERED, user_id=0)
+    user = UserFactory()
+    OutboxService.publish(OutboxEvent.EventType.USER_REGISTERED, user_id=user.id)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert relay_outbox_events() == 2
+        assert relay_outbox_events() == 1
+        assert relay_outbox_events() == 0
+
+    failing.refresh_from_db()
+    assert failing.processed_at is None
+    assert failing.attempts == 2
+    assert "DoesNotExist" in failing.last_error
+    assert [message.to for message in mail.outbox] == [[user.email]]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_relays_skip_events_locked_by_another_relay():
+    locked, other = (
+        OutboxEvent.objects.create(event_type=OutboxEvent.EventType.USER_REGISTERED, payload={"user_id": 0})
+        for _ in range(2)
+    )
+    event_locked, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        with transaction.atomic():
+            OutboxEvent.objects.select_for_update().get(id=locked.id)
+            event_locked.set()
+            release.wait(5)
+        connection.close()
+
+    thread = threading.Thread(target=hold_lock)
+    thread.start()
+    event_locked.wait(5)
+    with mock.patch.dict(handlers.EVENT_HANDLERS, {OutboxEvent.EventType.USER_REGISTERED: lambda user_id: None}):
+        assert relay_outbox_batch() == [other.id]
+    release.set()
+    thread.join()
+
+    assert OutboxEvent.objects.get(id=locked.id).processed_at is None
+
+
+def test_registration_and_subscription_activation_send_emails_through_the_outbox(
+    settings, django_capture_on_commit_callbacks
+):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    client = APIClient()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            reverse("auth-api:client-user-register"),
+            {
+                "email": "trader@example.com",
+                "password": "A-strong-passw0rd",
+                "phoneNumber": "+2348031234567",
+                "fullName": "Ada Obi",
+            },
+            format="json",
+        )
+    assert response.status_code == 201, response.json()
+
+    admin = UserFactory(type=User.ADMIN)
+    client.force_authenticate(admin)
+    now = timezone.now()
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            reverse("activate-user-subscription-plan"),
+            {
+                "plan": str(SubscriptionPlanFactory().uuid),
+                "user": User.objects.get(email="trader@example.com").username,
+                "startTimestamp": now.isoformat(),
+                "endTimestamp": (now + timedelta(days=30)).isoformat(),
+            },
+            format="json",
+        )
+    assert response.status_code == 200, response.json()
+
+    assert [event.event_type for event in OutboxEvent.objects.order_by("id")] == [
+        OutboxEvent.EventType.USER_REGISTERED,
+        OutboxEvent.EventType.SUBSCRIPTION_ACTIVATED,
+    ]
+    assert not OutboxEvent.objects.filter(processed_at__isnull=True).exists()
+    assert [message.subject for message in mail.outbox][-1] == "Subscription Activation Notification"
+    assert all(message.to == ["trader@example.com"] for message in mail.outbox)
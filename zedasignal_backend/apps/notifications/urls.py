@@ -0,0 +1,7 @@
+from django.urls import path
+
+from zedasignal_backend.apps.notifications.views import NotificationMetricsView
+
+urlpatterns = [
+    path("metrics/", NotificationMetricsView.as_view(), name="notification-metrics"),  # type: ignore
+]
@@ -0,0 +1,17 @@
+from django.http import HttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework.views import APIView
+
+from zedasignal_backend.apps.notifications.services import NotificationMetricsService
+from zedasignal_backend.core.decorators import admin_required
+
+
+class NotificationMetricsView(APIView):
+    """
+    Notification metrics view for Zedasignal Backend, scraped by Prometheus.
+    """
+
+    @extend_schema(exclude=True)
+    @admin_required
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(NotificationMetricsService.render(), content_type="text/plain; version=0.0.4")
@@ -41,3 +41,19 @@ class SubscriptionAdmin(admin.ModelAdmin):
         "created_at",
     )
     readonly_fields = ("uuid", "created_at")
+
+
+@admin.register(models.SignalDelivery)
+class SignalDeliveryAdmin(admin.ModelAdmin):
+    list_display = (
+        "signal",
+        "user",
+        "channel",
+        "status",
+        "sent_at",
+        "created_at",
+    )
+    list_filter = ("channel", "status")
+    list_select_related = ("signal", "user")
+    raw_id_fields = ("signal", "user")
+    readonly_fields = ("created_at", "updated_at", "sent_at")
@@ -1,3 +1,5 @@
+from functools import wraps
+
 from rest_framework import status
 
 from zedasignal_backend.apps.users.utils import get_custom_user_model
@@ -25,7 +27,7 @@ def user_has_active_subscription(function=None):
             )
 
     if function:
-        return _wrapped_view
+        return wraps(function)(_wrapped_view)
 
     return user_is_subscribed
 
@@ -49,6 +51,6 @@ def user_has_active_subscription_or_is_admin(function=None):
             )
 
     if function:
-        return _wrapped_view
+        return wraps(function)(_wrapped_view)
 
     return user_is_subscribed
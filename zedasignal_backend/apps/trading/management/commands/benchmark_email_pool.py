@@ -0,0 +1,64 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+
+from zedasignal_backend.core.utils import send_mass_html_mail
+from zedasignal_backend.core.utils.smtp_pool import SMTPConnectionPool
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares sending emails over a single SMTP connection with sending them over an SMTPConnectionPool, "
+        "against a local SMTP stand-in. Requires aiosmtpd from requirements/local.txt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--emails", type=int, default=10_000, help="Number of emails to send.")
+        parser.add_argument("--connections", type=int, default=settings.EMAIL_POOL_CONNECTIONS)
+        parser.add_argument(
+            "--smtp-latency",
+            type=float,
+            default=0.005,
+            help="Seconds the local SMTP server waits before accepting each message.",
+        )
+
+    def handle(self, *args, **options):
+        from zedasignal_backend.core.utils.stub_smtp_server import StubSMTPServer
+
+        logging.getLogger("mail.log").setLevel(logging.WARNING)
+        # Measure the connections themselves, not the provider rate limit
+        settings.NOTIFICATION_RATE_LIMITS = {}
+
+        with StubSMTPServer(latency=options["smtp_latency"]) as smtp_server:
+            settings.EMAIL_HOST, settings.EMAIL_PORT = smtp_server.host, smtp_server.port
+            settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ""
+            settings.EMAIL_USE_TLS = settings.EMAIL_USE_SSL = False
+            messages = [
+                EmailMultiAlternatives(
+                    "Signal Alert", "New signal", "alerts@zedasignal.com", [f"user{index}@example.com"]
+                )
+                for index in range(options["emails"])
+            ]
+            backend = "django.core.mail.backends.smtp.EmailBackend"
+
+            started_at = time.perf_counter()
+            send_mass_html_mail(messages, connection=get_connection(backend))
+            single_seconds = time.perf_counter() - started_at
+
+            started_at = time.perf_counter()
+            with SMTPConnectionPool(size=options["connections"], backend=backend) as pool:
+                pool.send_messages(messages)
+            pool_seconds = time.perf_counter() - started_at
+
+        number_of_messages = len(messages)
+        self.stdout.write(
+            f"{number_of_messages} emails: single connection {single_seconds:.2f}s "
+            f"({number_of_messages / single_seconds:.0f}/s), {options['connections']} pooled connections "
+            f"{pool_seconds:.2f}s ({number_of_messages / pool_seconds:.0f}/s), "
+            f"speedup {single_seconds / pool_seconds:.1f}x"
+        )
+        for stats in pool.stats:
+            self.stdout.write(f"  {stats}")
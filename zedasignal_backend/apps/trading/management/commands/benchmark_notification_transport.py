@@ -0,0 +1,87 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.management.base import BaseCommand
+
+from zedasignal_backend.core.termii.async_client import send_bulk_sms_async
+from zedasignal_backend.core.termii.bulk_sms_client import TermiiBulkSmsClient
+from zedasignal_backend.core.termii.session import close_http_session
+from zedasignal_backend.core.termii.stub_server import StubTermiiServer
+from zedasignal_backend.core.utils import send_mass_html_mail
+from zedasignal_backend.core.utils.async_emails import send_mass_html_mail_async
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the blocking and asyncio notification transports against local stand-ins for Termii and "
+        "an SMTP relay. Requires aiosmtpd from requirements/local.txt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sms-recipients", type=int, default=50_000, help="Number of sms recipients.")
+        parser.add_argument("--emails", type=int, default=1_000, help="Number of emails to send.")
+        parser.add_argument(
+            "--smtp-latency",
+            type=float,
+            default=0.005,
+            help="Seconds the local SMTP server waits before accepting each message.",
+        )
+
+    def handle(self, *args, **options):
+        from zedasignal_backend.core.utils.stub_smtp_server import StubSMTPServer
+
+        logging.getLogger("mail.log").setLevel(logging.WARNING)
+        # Measure the transports themselves, not the provider rate limits
+        settings.NOTIFICATION_RATE_LIMITS = {}
+
+        phone_numbers = [f"+234803{index:07d}" for index in range(options["sms_recipients"])]
+        with StubTermiiServer() as termii_server:
+            settings.TERMII_BASE_URL = termii_server.base_url
+            self.report(
+                "sms",
+                len(phone_numbers),
+                *self.time_both(
+                    lambda: TermiiBulkSmsClient().post(to=phone_numbers, message="Signal Alert"),
+                    lambda: send_bulk_sms_async(to=phone_numbers, message="Signal Alert"),
+                ),
+            )
+            close_http_session()
+
+        with StubSMTPServer(latency=options["smtp_latency"]) as smtp_server:
+            settings.EMAIL_HOST, settings.EMAIL_PORT = smtp_server.host, smtp_server.port
+            settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ""
+            settings.EMAIL_USE_TLS = settings.EMAIL_USE_SSL = False
+            messages = [
+                EmailMultiAlternatives(
+                    "Signal Alert", "New signal", "alerts@zedasignal.com", [f"user{index}@example.com"]
+                )
+                for index in range(options["emails"])
+            ]
+            connection = get_connection("django.core.mail.backends.smtp.EmailBackend")
+            self.report(
+                "email",
+                len(messages),
+                *self.time_both(
+                    lambda: send_mass_html_mail(messages, connection=connection),
+                    lambda: send_mass_html_mail_async(messages),
+                ),
+            )
+
+    def time_both(self, send_sync, send_async) -> tuple[float, float]:
+        started_at = time.perf_counter()
+        send_sync()
+        sync_seconds = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        send_async()
+        async_seconds = time.perf_counter() - started_at
+        return sync_seconds, async_seconds
+
+    def report(self, channel: str, number_of_messages: int, sync_seconds: float, async_seconds: float):
+        self.stdout.write(
+            f"{number_of_messages} {channel}: sync {sync_seconds:.2f}s ({number_of_messages / sync_seconds:.0f}/s), "
+            f"async {async_seconds:.2f}s ({number_of_messages / async_seconds:.0f}/s), "
+            f"speedup {sync_seconds / async_seconds:.1f}x"
+        )
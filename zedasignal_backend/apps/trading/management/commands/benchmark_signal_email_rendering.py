@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+
+from zedasignal_backend.apps.trading.models import Signal
+from zedasignal_backend.apps.users.utils import get_custom_user_model
+from zedasignal_backend.core.utils.templates import PersonalisedTemplate
+
+User = get_custom_user_model()
+
+SIGNAL_TEMPLATE = "emails/trading/signals/notification.html"
+
+
+class Command(BaseCommand):
+    help = "Compares per-user rendering of the signal notification email with render-once personalisation."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--recipients",
+            nargs="+",
+            type=int,
+            default=[10_000, 100_000],
+            help="Number of recipients to render the notification for.",
+        )
+
+    def handle(self, *args, **options):
+        author = User(username="author", first_name="Zed", last_name="Apex", nickname="zedapex")
+        signal = Signal(
+            entry=1.0842,
+            take_profit=1.0921,
+            stop_loss=1.0801,
+            pair_base="eur",
+            pair_quote="usd",
+            author=author,
+        )
+        context = {"signal": signal, "domain": "https://zedasignal.com"}
+
+        for number_of_recipients in options["recipients"]:
+            users = [
+                User(username=f"user{index}@example.com", first_name=f"User {index}")
+                for index in range(number_of_recipients)
+            ]
+
+            started_at = time.perf_counter()
+            for user in users:
+                render_to_string(SIGNAL_TEMPLATE, context={**context, "user": user})
+            per_user_seconds = time.perf_counter() - started_at
+
+            started_at = time.perf_counter()
+            template = PersonalisedTemplate(SIGNAL_TEMPLATE, context)
+            for user in users:
+                template.render(user)
+            render_once_seconds = time.perf_counter() - started_at
+
+            self.stdout.write(
+                f"{number_of_recipients} recipients: per-user render {per_user_seconds:.2f}s, "
+                f"render-once {render_once_seconds:.2f}s, speedup {per_user_seconds / render_once_seconds:.1f}x"
+            )
@@ -0,0 +1,210 @@
+import json
+import logging
+import subprocess
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core import mail
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from zedasignal_backend.apps.trading.models import Signal, Subscription, SubscriptionPlan
+from zedasignal_backend.apps.trading.services import ChannelAudienceService, SignalService
+from zedasignal_backend.apps.users.models import User
+from zedasignal_backend.core.termii.session import close_http_session
+from zedasignal_backend.core.termii.stub_server import StubTermiiServer
+from zedasignal_backend.core.utils.main import chunked
+
+FAN_OUTS = {
+    "email": SignalService.publish_signal_to_active_subscribers_by_email,
+    "sms": SignalService.publish_signal_to_active_subscribers_by_sms,
+}
+SEED_BATCH_SIZE = 2_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the signal fan-out by email and sms for growing numbers of subscribers, against the locmem "
+        "email backend and a local stand-in for Termii. Runs in a throwaway test database and appends the "
+        "results to a JSON lines file, comparing them with the previous run of the same size. Peak memory of the "
+        "email fan-out includes the messages kept in the locmem outbox."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--subscribers",
+            nargs="+",
+            type=int,
+            default=[1_000, 10_000, 100_000],
+            help="Numbers of subscribers to run the fan-out for.",
+        )
+        parser.add_argument("--channels", nargs="+", choices=list(FAN_OUTS), default=list(FAN_OUTS))
+        parser.add_argument(
+            "--results-file",
+            type=Path,
+            default=settings.BASE_DIR / "benchmarks" / "signal_fan_out.jsonl",
+            help="JSON lines file the results are appended to.",
+        )
+        parser.add_argument("--label", default="", help="Free text stored with the results, e.g. a branch name.")
+
+    def handle(self, *args, **options):
+        logging.getLogger("zedasignal_backend").setLevel(logging.WARNING)
+        previous_results = self.load_results(options["results_file"])
+
+        old_database_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with (
+                StubTermiiServer() as termii_server,
+                override_settings(
+                    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+                    TERMII_BASE_URL=termii_server.base_url,
+                    # Measure the fan-out itself, not the provider rate limits
+                    NOTIFICATION_RATE_LIMITS={},
+                ),
+            ):
+                author = User.objects.create_user(
+                    username="analyst", email="analyst@example.com", first_name="Signal", last_name="Analyst"
+                )
+                results = []
+                seeded = 0
+                for number_of_subscribers in sorted(options["subscribers"]):
+                    self.seed_subscribers(author, seeded, number_of_subscribers)
+                    seeded = number_of_subscribers
+                    for channel in options["channels"]:
+                        result = self.run_fan_out(author, channel, number_of_subscribers, termii_server)
+                        result["label"] = options["label"]
+                        results.append(result)
+                        self.report(result, previous_results.get((channel, number_of_subscribers)))
+                close_http_session()
+        finally:
+            connection.creation.destroy_test_db(old_database_name, verbosity=0)
+
+        self.store_results(options["results_file"], results)
+
+    def seed_subscribers(self, author: User, number_of_existing_subscribers: int, number_of_subscribers: int):
+        """
+        Tops the subscribers up to `number_of_subscribers`. Users are inserted in bulk, which skips the
+        audience receivers, so the audience is rebuilt afterwards.
+        """
+        started_at = time.perf_counter()
+        plan = SubscriptionPlan.objects.create(
+            name=f"Benchmark {number_of_subscribers}",
+            monthly_price=10,
+            yearly_price=100,
+            notification_channels=[SubscriptionPlan.EMAIL, SubscriptionPlan.SMS],
+            creator=author,
+        )
+        # hashing a password per seeded user would take longer than the fan-out itself
+        password = make_password(None)
+        now = timezone.now()
+        for user_indexes in chunked(range(number_of_existing_subscribers, number_of_subscribers), SEED_BATCH_SIZE):
+            users = User.objects.bulk_create(
+                User(
+                    username=f"subscriber{index}@example.com",
+                    email=f"subscriber{index}@example.com",
+                    first_name="Subscriber",
+                    last_name=str(index),
+                    phone_number=f"+234803{index:07d}",
+                    password=password,
+                )
+                for index in user_indexes
+            )
+            Subscription.objects.bulk_create(
+                Subscription(user=user, plan=plan, start_timestamp=now, end_timestamp=now + timedelta(days=30))
+                for user in users
+            )
+        ChannelAudienceService.rebuild()
+        self.stdout.write(
+            f"Seeded {number_of_subscribers - number_of_existing_subscribers} subscribers "
+            f"in {time.perf_counter() - started_at:.1f}s"
+        )
+
+    def run_fan_out(
+        self, author: User, channel: str, number_of_subscribers: int, termii_server: StubTermiiServer
+    ) -> dict:
+        signal = Signal.objects.create(
+            entry=1.0842, take_profit=1.0921, stop_loss=1.0801, pair_base="eur", pair_quote="usd", author=author
+        )
+        fan_out = FAN_OUTS[channel]
+
+        mail.outbox = []
+        termii_server.requests.clear()
+        with CaptureQueriesContext(connection) as queries:
+            started_at = time.perf_counter()
+            fan_out(signal)
+            wall_seconds = time.perf_counter() - started_at
+        delivered = len(mail.outbox) if channel == "email" else len(termii_server.recipients)
+
+        # tracing allocations slows the fan-out down, so memory is measured on a separate run
+        mail.outbox = []
+        tracemalloc.start()
+        fan_out(signal)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        mail.outbox = []
+
+        return {
+            "channel": channel,
+            "subscribers": number_of_subscribers,
+            "delivered": delivered,
+            "wall_seconds": round(wall_seconds, 3),
+            "messages_per_second": round(delivered / wall_seconds, 1),
+            "peak_memory_mb": round(peak_memory / 2**20, 1),
+            "queries": len(queries),
+            "transport": settings.NOTIFICATION_TRANSPORT,
+            "commit": self.current_commit(),
+            "recorded_at": timezone.now().isoformat(),
+        }
+
+    def report(self, result: dict, previous_result: dict | None):
+        line = (
+            f"{result['subscribers']} {result['channel']}: {result['wall_seconds']:.2f}s, "
+            f"{result['messages_per_second']:.0f} msg/s, peak {result['peak_memory_mb']:.1f} MB, "
+            f"{result['queries']} queries"
+        )
+        if previous_result is not None:
+            change = previous_result["wall_seconds"] / result["wall_seconds"]
+            line += (
+                f" (previously {previous_result['wall_seconds']:.2f}s, {previous_result['peak_memory_mb']:.1f} MB, "
+                f"{previous_result['queries']} queries at {previous_result['commit'] or 'unknown commit'}: "
+                f"{change:.2f}x)"
+            )
+        self.stdout.write(line)
+
+    def load_results(self, results_file: Path) -> dict[tuple[str, int], dict]:
+        """
+        Returns the latest stored result of each channel and number of subscribers.
+        """
+        if not results_file.exists():
+            return {}
+        results = {}
+        for line in results_file.read_text().splitlines():
+            if line.strip():
+                result = json.loads(line)
+                results[(result["channel"], result["subscribers"])] = result
+        return results
+
+    def store_results(self, results_file: Path, results: list[dict]):
+        results_file.parent.mkdir(parents=True, exist_ok=True)
+        with results_file.open("a") as file:
+            for result in results:
+                file.write(json.dumps(result) + "\n")
+        self.stdout.write(f"Results appended to {results_file}")
+
+    def current_commit(self) -> str | None:
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
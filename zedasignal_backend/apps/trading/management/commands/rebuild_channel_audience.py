@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from zedasignal_backend.apps.trading.services import ChannelAudienceService
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the materialised channel audience from the active subscriptions."
+
+    def handle(self, *args, **options):
+        audience_size = ChannelAudienceService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt channel audience with {audience_size} entries."))
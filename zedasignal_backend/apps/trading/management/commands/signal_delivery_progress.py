@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from zedasignal_backend.apps.trading.services import SignalDeliveryService
+from zedasignal_backend.apps.trading.tasks import dispatch_signal_notifications
+
+
+class Command(BaseCommand):
+    help = "Reports the delivery progress and throughput of a signal, and optionally resumes its fan-out."
+
+    def add_arguments(self, parser):
+        parser.add_argument("signal_id", type=int, help="The id of the signal.")
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Dispatch the signal again to its pending and failed recipients.",
+        )
+
+    def handle(self, *args, **options):
+        signal_id = options["signal_id"]
+        for channel, progress in SignalDeliveryService.fetch_progress(signal_id).items():
+            throughput = progress["messages_per_second"]
+            self.stdout.write(
+                f"{channel}: {progress['sent']}/{progress['total']} sent, {progress['sending']} sending, "
+                f"{progress['pending']} pending, "
+                f"{progress['failed']} failed, {progress['skipped']} skipped"
+                + (f", {throughput:.1f} msgs/s" if throughput is not None else "")
+            )
+
+        if options["resume"]:
+            dispatch_signal_notifications.delay(signal_id)
+            self.stdout.write(self.style.SUCCESS(f"Resumed the fan-out of signal {signal_id}."))
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.4 on 2026-10-18 07:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_channel_audience(apps, schema_editor):
+    Subscription = apps.get_model("trading", "Subscription")
+    ChannelAudience = apps.get_model("trading", "ChannelAudience")
+
+    active_subscriptions = Subscription.objects.filter(is_active=True, user__is_active=True).values_list(
+        "user_id", "plan__notification_channels"
+    )
+    audience = {(user_id, channel) for user_id, channels in active_subscriptions.iterator() for channel in channels}
+    ChannelAudience.objects.bulk_create(
+        [ChannelAudience(user_id=user_id, channel=channel) for user_id, channel in audience],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("trading", "0015_subscription_created_by"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChannelAudience",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "channel",
+                    models.CharField(
+                        choices=[
+                            ("telegram", "Telegram"),
+                            ("whatsapp", "WhatsApp"),
+                            ("email", "Email"),
+                            ("sms", "SMS"),
+                        ],
+                        max_length=10,
+                        verbose_name="channel",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="channel_audiences",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="channelaudience",
+            constraint=models.UniqueConstraint(fields=("channel", "user"), name="unique_channel_audience_user"),
+        ),
+        migrations.RunPython(backfill_channel_audience, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-18 07:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trading", "0017_signaldelivery"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="signal",
+            index=models.Index(
+                condition=models.Q(("is_active", True)), fields=["-updated_at", "-id"], name="signal_feed"
+            ),
+        ),
+    ]
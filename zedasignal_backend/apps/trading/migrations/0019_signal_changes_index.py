@@ -0,0 +1,16 @@
+# Generated by Django 4.2.4 on 2026-10-18 08:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trading", "0018_signal_feed_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="signal",
+            index=models.Index(fields=["updated_at", "id"], name="signal_changes"),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trading", "0019_signal_changes_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="signaldelivery",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("sending", "Sending"),
+                    ("sent", "Sent"),
+                    ("failed", "Failed"),
+                    ("skipped", "Skipped"),
+                ],
+                default="pending",
+                max_length=10,
+                verbose_name="status",
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:40
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trading", "0020_alter_signaldelivery_status"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="signal",
+            name="signal_feed",
+        ),
+    ]
@@ -4,7 +4,7 @@ from django_jsonform.models.fields import ArrayField
 from djmoney.models.fields import MoneyField
 
 from zedasignal_backend.apps.users.utils import get_custom_user_model
-from zedasignal_backend.core.mixins import CreatedAndUpdatedAtMixin, UUIDMixin
+from zedasignal_backend.core.mixins import CreatedAndUpdatedAtMixin, CreatedAtMixin, UUIDMixin
 
 User = get_custom_user_model()
 
@@ -99,6 +99,13 @@ class Signal(CreatedAndUpdatedAtMixin, UUIDMixin, models.Model):
         related_name="signals",
     )
 
+    class Meta:
+        indexes = [
+            # Backs the keyset pagination of the signals feed, read backwards, see `CustomCursorPagination`,
+            # and of its delta sync, which includes deactivated signals, see `ChangesCursorPagination`
+            models.Index(fields=["updated_at", "id"], name="signal_changes"),
+        ]
+
     def __str__(self):
         return f"{self.term} {self.action} signal at {self.entry}"
 
@@ -238,3 +245,100 @@ class Subscription(CreatedAndUpdatedAtMixin, UUIDMixin, models.Model):
 
     def __str__(self):
         return f"{self.user} - {self.plan}"
+
+
+class ChannelAudience(CreatedAtMixin, models.Model):
+    """
+    Materialised audience of each notification channel, one row per user and channel.
+
+    A user is in the audience of a channel while they are active and hold an active subscription to a
+    plan that notifies on that channel. The rows are kept up to date from Subscription, SubscriptionPlan
+    and User changes by the receivers in signals.py. Bulk `QuerySet.update()` calls bypass those
+    receivers, run the `rebuild_channel_audience` command after them.
+    """
+
+    id: int
+    user = models.ForeignKey(
+        User,
+        verbose_name=_("user"),
+        on_delete=models.CASCADE,
+        related_name="channel_audiences",
+    )
+    channel = models.CharField(
+        _("channel"),
+        max_length=10,
+        choices=SubscriptionPlan.NotificationChannels.choices,
+    )
+
+    class Meta:
+        constraints = [
+            # Also serves as the (channel, user) index that audience lookups are resolved with
+            models.UniqueConstraint(fields=["channel", "user"], name="unique_channel_audience_user"),
+        ]
+
+    def __str__(self):
+        return f"{self.channel} - {self.user}"
+
+
+class SignalDelivery(CreatedAndUpdatedAtMixin, models.Model):
+    """
+    Ledger of the delivery of a signal to one user on one channel.
+
+    A pending row is written for every recipient before the fan-out starts. A task claims the rows it sends to
+    by moving them to sending, and marks them as sent once the provider accepts the message, so a retried or
+    resumed fan-out, even one running alongside the first, only sends to recipients that are still pending or
+    failed.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+        SKIPPED = "skipped", "Skipped"
+
+    id: int
+    signal = models.ForeignKey(
+        Signal,
+        verbose_name=_("signal"),
+        on_delete=models.CASCADE,
+        related_name="deliveries",
+    )
+    user = models.ForeignKey(
+        User,
+        verbose_name=_("user"),
+        on_delete=models.CASCADE,
+        related_name="signal_deliveries",
+    )
+    channel = models.CharField(
+        _("channel"),
+        max_length=10,
+        choices=SubscriptionPlan.NotificationChannels.choices,
+    )
+    status = models.CharField(
+        _("status"),
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    sent_at = models.DateTimeField(
+        _("sent at"),
+        blank=True,
+        null=True,
+        help_text=_("When the provider accepted the message."),
+    )
+    error = models.TextField(
+        _("error"),
+        blank=True,
+        default="",
+        help_text=_("The last error returned while sending the message."),
+    )
+
+    class Meta:
+        verbose_name_plural = "signal deliveries"
+        constraints = [
+            models.UniqueConstraint(fields=["signal", "channel", "user"], name="unique_signal_delivery"),
+        ]
+
+    def __str__(self):
+        return f"{self.signal} - {self.channel} - {self.user}: {self.status}"
@@ -8,8 +8,18 @@ from .models import Signal, Subscription, SubscriptionPlan
 User = get_custom_user_model()
 
 
+class SignalAuthorSerializer(serializers.ModelSerializer[User]):
+    """
+    The author of a signal as subscribers see it.
+    """
+
+    class Meta:
+        model = User
+        fields = ("uuid", "nickname")
+
+
 class SignalReadSerializer(serializers.ModelSerializer[Signal]):
-    author = UserSerializer()
+    author = SignalAuthorSerializer()
 
     class Meta:
         model = Signal
@@ -77,6 +87,12 @@ class CreateUserSubscriptionSerializer(serializers.ModelSerializer[Subscription]
         )
 
 
+class SignalChangesSerializer(serializers.Serializer):
+    results = SignalReadSerializer(many=True)
+    cursor = serializers.CharField(allow_null=True)
+    has_more = serializers.BooleanField()
+
+
 class AdminDashboardStatistics(serializers.Serializer):
     total_users = serializers.IntegerField()
     total_signals_provided = serializers.IntegerField()
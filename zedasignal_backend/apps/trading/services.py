@@ -1,13 +1,22 @@
+from collections.abc import Callable
+from datetime import timedelta
 from typing import Literal
 
 import environ
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
 from django.db.models.query import QuerySet
+from django.utils import timezone
 
-from zedasignal_backend.apps.trading.models import Signal, Subscription
+from zedasignal_backend.apps.trading.models import ChannelAudience, Signal, SignalDelivery, Subscription
 from zedasignal_backend.apps.users.utils import get_custom_user_model
 from zedasignal_backend.core.mass_email_sender import MassEmailSender
+from zedasignal_backend.core.metrics import increment_counter
 from zedasignal_backend.core.sender import Sender
+from zedasignal_backend.core.termii.async_client import send_bulk_sms_async
 from zedasignal_backend.core.termii.bulk_termii_sender import TermiiBulkSmsSender
+from zedasignal_backend.core.utils.main import chunked
 
 User = get_custom_user_model()
 env = environ.Env()
@@ -16,40 +25,15 @@ channels_type = Literal["email", "sms", "whatsapp", "telegram"]
 
 
 class SignalService:
-    @staticmethod
-    def fetch_active_subscriptions_grouped_by_channels():
-        """
-        This method fetches all active subscriptions. Groups by subscription channels_type and returns a dictionary of
-        subscription channels_type and their respective subscribers.
-        """
-        active_subscriptions = Subscription.objects.select_related("user").filter(is_active=True, user__is_active=True)
-
-        active_subscriptions_by_channels: dict[channels_type, list[User]] = {}
-        for subscription in active_subscriptions:
-            all_channels = list(subscription.plan.notification_channels)  # type: ignore
-            for channel in all_channels:
-                if channel not in active_subscriptions_by_channels:
-                    active_subscriptions_by_channels[channel] = []
-                active_subscriptions_by_channels[channel].append(subscription.user)
-
-        return active_subscriptions_by_channels
-
     @staticmethod
     def fetch_active_subscriptions_users_by_channel(channel: channels_type):
         """
-        This method fetches all active subscriptions by channel.
+        This method fetches all active subscribers of a channel from the materialised channel audience.
 
         Args:
             channel (channels_type): The channel to fetch active subscriptions for.
         """
-        active_subscriptions = Subscription.objects.select_related("user").filter(
-            is_active=True,
-            user__is_active=True,
-            plan__notification_channels__contains=[channel],
-        )
-
-        user_ids = active_subscriptions.values_list("user", flat=True)
-        return User.objects.filter(id__in=user_ids)
+        return User.objects.filter(id__in=ChannelAudienceService.fetch_audience_user_ids(channel))
 
     @staticmethod
     def send_signal_to_subscriber(signal: Signal, user: User):
@@ -64,27 +48,35 @@ class SignalService:
         Sender(
             user,
             email_content_object="notification.messages.signals",
-            html_template="emails/trading/signals/notification.html",
             email_notif=True,
             context={"signal": signal, "user": user, "domain": domain},
         )
 
     @staticmethod
-    def send_signal_to_subscribers_by_email(signal: Signal, users: list[User] | QuerySet[User]):
+    def send_signal_to_subscribers_by_email(
+        signal: Signal,
+        users: list[User] | QuerySet[User],
+        on_chunk_sent: Callable[[list[User]], None] | None = None,
+        on_send_failed: Callable[[list[User], str], None] | None = None,
+    ):
         """
         This method sends a signal to subscribers by email.
 
         Args:
             signal (Signal): The signal to be sent.
             users (List[User] | QuerySet[User]): The list of users to send the signal to.
+            on_chunk_sent (Callable, optional): Called with each chunk of users whose emails were accepted.
+            on_send_failed (Callable, optional): Called with the users whose emails failed after their
+                retries, and the error. Without it, the first failure is raised.
         """
         domain = env.str("DOMAIN_NAME")
         MassEmailSender(
             users=users,
             email_content_object="notification.messages.signals",
-            html_template="emails/trading/signals/notification.html",
             include_user_in_context=True,
             context={"signal": signal, "domain": domain},
+            on_chunk_sent=on_chunk_sent,
+            on_send_failed=on_send_failed,
         )
 
     @staticmethod
@@ -97,7 +89,6 @@ class SignalService:
             users (List[User] | QuerySet[User]): The list of users to send the signal to.
         """
         users_phone_numbers = [user.phone_number for user in users if user.phone_number]
-        termii_sender = TermiiBulkSmsSender()
         message = f"""Signal Alert:
         {signal.author.nickname} is {signal.action}ing
         Pair: {signal.pair_base.upper()}/{signal.pair_quote.upper()}
@@ -107,7 +98,9 @@ class SignalService:
         SL: {signal.stop_loss}
         Powered by Zedapex
         """
-        termii_sender.bulk_client.post(to=users_phone_numbers, message=message)
+        if settings.NOTIFICATION_TRANSPORT == "async":
+            return send_bulk_sms_async(to=users_phone_numbers, message=message)
+        return TermiiBulkSmsSender().bulk_client.post(to=users_phone_numbers, message=message)
 
     @staticmethod
     def publish_signal_to_active_subscribers_by_email(signal: Signal):
@@ -133,3 +126,216 @@ class SignalService:
         users = SignalService.fetch_active_subscriptions_users_by_channel("sms")
 
         SignalService.send_signal_to_subscribers_by_sms(signal, users)
+
+
+class ChannelAudienceService:
+    @staticmethod
+    def fetch_audience_user_ids(channel: channels_type):
+        """
+        This method returns the ids of the users in the audience of a channel, ordered by id.
+        It is resolved from the (channel, user) index of the materialised audience.
+
+        Args:
+            channel (channels_type): The channel to fetch the audience for.
+        """
+        return ChannelAudience.objects.filter(channel=channel).order_by("user_id").values_list("user_id", flat=True)
+
+    @staticmethod
+    def sync_users(user_ids: list[int]):
+        """
+        This method brings the channel audience of the given users in line with their active subscriptions,
+        adding and removing only the rows that changed.
+
+        Args:
+            user_ids (list[int]): The ids of the users whose subscriptions, plans or status changed.
+        """
+        active_subscriptions = Subscription.objects.filter(
+            user_id__in=user_ids, is_active=True, user__is_active=True
+        ).values_list("user_id", "plan__notification_channels")
+        audience = {(user_id, channel) for user_id, channels in active_subscriptions for channel in channels}
+        existing_audience = set(ChannelAudience.objects.filter(user_id__in=user_ids).values_list("user_id", "channel"))
+
+        stale_audience: dict[str, list[int]] = {}
+        for user_id, channel in existing_audience - audience:
+            stale_audience.setdefault(channel, []).append(user_id)
+        for channel, stale_user_ids in stale_audience.items():
+            ChannelAudience.objects.filter(channel=channel, user_id__in=stale_user_ids).delete()
+
+        ChannelAudience.objects.bulk_create(
+            [ChannelAudience(user_id=user_id, channel=channel) for user_id, channel in audience - existing_audience],
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def sync_plan(plan_id: int):
+        """
+        This method re-syncs the channel audience of every user subscribed to a plan, in chunks.
+
+        Args:
+            plan_id (int): The id of the plan whose channels changed.
+        """
+        chunk_size = settings.SIGNAL_DISPATCH_CHUNK_SIZE
+        user_ids = Subscription.objects.filter(plan_id=plan_id).values_list("user_id", flat=True).distinct()
+        for user_ids_chunk in chunked(user_ids.iterator(chunk_size=chunk_size), chunk_size):
+            ChannelAudienceService.sync_users(user_ids_chunk)
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild() -> int:
+        """
+        This method rebuilds the whole channel audience from the active subscriptions and returns its size.
+        """
+        ChannelAudience.objects.all().delete()
+        active_subscriptions = Subscription.objects.filter(is_active=True, user__is_active=True).values_list(
+            "user_id", "plan__notification_channels"
+        )
+        audience = {
+            (user_id, channel) for user_id, channels in active_subscriptions.iterator() for channel in channels
+        }
+        ChannelAudience.objects.bulk_create(
+            [ChannelAudience(user_id=user_id, channel=channel) for user_id, channel in audience],
+            batch_size=1000,
+        )
+        return len(audience)
+
+
+class SignalDeliveryService:
+    @staticmethod
+    def create_pending_deliveries(signal_id: int, channel: channels_type, user_ids: list[int]):
+        """
+        This method writes a pending delivery for each recipient. Recipients that already have a delivery for the
+        signal and channel are left untouched, so a fan-out can be dispatched again safely.
+
+        Args:
+            signal_id (int): The id of the signal being sent.
+            channel (channels_type): The channel the signal is sent on.
+            user_ids (list[int]): The ids of the recipients.
+        """
+        SignalDelivery.objects.bulk_create(
+            [SignalDelivery(signal_id=signal_id, channel=channel, user_id=user_id) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def get_claimable_filter() -> Q:
+        """
+        This method returns the deliveries a task may claim: pending or failed ones, and the ones claimed by a task
+        that hasn't finished within `SIGNAL_DELIVERY_CLAIM_TIMEOUT`.
+        """
+        claim_expired_at = timezone.now() - timedelta(seconds=settings.SIGNAL_DELIVERY_CLAIM_TIMEOUT)
+        return Q(status__in=[SignalDelivery.Status.PENDING, SignalDelivery.Status.FAILED]) | Q(
+            status=SignalDelivery.Status.SENDING, updated_at__lt=claim_expired_at
+        )
+
+    @staticmethod
+    def fetch_undelivered_user_ids(signal_id: int, channel: channels_type):
+        """
+        This method returns the ids of the recipients still to be sent to for a signal and channel, ordered by id.
+        Recipients claimed by a running task are left out.
+
+        Args:
+            signal_id (int): The id of the signal being sent.
+            channel (channels_type): The channel the signal is sent on.
+        """
+        return (
+            SignalDelivery.objects.filter(
+                SignalDeliveryService.get_claimable_filter(), signal_id=signal_id, channel=channel
+            )
+            .order_by("user_id")
+            .values_list("user_id", flat=True)
+        )
+
+    @staticmethod
+    def claim_deliveries(signal_id: int, channel: channels_type, user_ids: list[int]) -> list[int]:
+        """
+        This method claims the deliveries of the recipients that are still to be sent to, by moving them to sending,
+        and returns the ids of the claimed recipients. Deliveries claimed by another task, even one running at the
+        same time, are left to it, so a recipient is never sent the signal twice.
+
+        Args:
+            signal_id (int): The id of the signal being sent.
+            channel (channels_type): The channel the signal is sent on.
+            user_ids (list[int]): The ids of the recipients to claim.
+        """
+        with transaction.atomic():
+            claimed_user_ids = list(
+                SignalDelivery.objects.filter(
+                    SignalDeliveryService.get_claimable_filter(),
+                    signal_id=signal_id,
+                    channel=channel,
+                    user_id__in=user_ids,
+                )
+                .select_for_update(skip_locked=True)
+                .order_by("user_id")
+                .values_list("user_id", flat=True)
+            )
+            SignalDelivery.objects.filter(signal_id=signal_id, channel=channel, user_id__in=claimed_user_ids).update(
+                status=SignalDelivery.Status.SENDING, updated_at=timezone.now()
+            )
+        return claimed_user_ids
+
+    @staticmethod
+    def mark_deliveries(
+        signal_id: int,
+        channel: channels_type,
+        user_ids: list[int],
+        status: SignalDelivery.Status,
+        error: str = "",
+    ) -> int:
+        """
+        This method updates the deliveries of many recipients in a single query and returns how many were updated.
+        Deliveries that were already sent are never updated again. The updated deliveries are counted in the
+        `signal_deliveries_total` metric of their channel and status.
+
+        Args:
+            signal_id (int): The id of the signal being sent.
+            channel (channels_type): The channel the signal is sent on.
+            user_ids (list[int]): The ids of the recipients.
+            status (SignalDelivery.Status): The new status of the deliveries.
+            error (str, optional): The error returned by the provider. Defaults to "".
+        """
+        now = timezone.now()
+        updated = (
+            SignalDelivery.objects.filter(signal_id=signal_id, channel=channel, user_id__in=user_ids)
+            .exclude(status=SignalDelivery.Status.SENT)
+            .update(
+                status=status,
+                error=error,
+                sent_at=now if status == SignalDelivery.Status.SENT else None,
+                updated_at=now,
+            )
+        )
+        increment_counter("signal_deliveries_total", updated, channel=channel, status=status)
+        return updated
+
+    @staticmethod
+    def fetch_progress(signal_id: int) -> dict[channels_type, dict]:
+        """
+        This method returns the delivery progress of a signal per channel: the number of deliveries in each status
+        and the throughput of the fan-out, in messages sent per second since it started.
+
+        Args:
+            signal_id (int): The id of the signal.
+        """
+        progress_by_channel = (
+            SignalDelivery.objects.filter(signal_id=signal_id)
+            .values("channel")
+            .annotate(
+                total=Count("id"),
+                **{status: Count("id", filter=Q(status=status)) for status in SignalDelivery.Status.values},
+                started_at=Min("created_at"),
+                last_sent_at=Max("sent_at"),
+            )
+            .order_by("channel")
+        )
+
+        progress: dict[channels_type, dict] = {}
+        for channel_progress in progress_by_channel:
+            channel = channel_progress.pop("channel")
+            started_at, last_sent_at = channel_progress["started_at"], channel_progress["last_sent_at"]
+            elapsed_seconds = (last_sent_at - started_at).total_seconds() if last_sent_at else 0
+            channel_progress["messages_per_second"] = (
+                channel_progress[SignalDelivery.Status.SENT] / elapsed_seconds if elapsed_seconds > 0 else None
+            )
+            progress[channel] = channel_progress
+        return progress
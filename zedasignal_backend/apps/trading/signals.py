@@ -1,15 +1,85 @@
-from django.db.models.signals import post_save
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from zedasignal_backend.apps.trading.models import Signal
-from zedasignal_backend.apps.trading.services import SignalService
+from zedasignal_backend.apps.notifications.models import OutboxEvent
+from zedasignal_backend.apps.notifications.services import OutboxService
+from zedasignal_backend.apps.trading.models import Signal, Subscription, SubscriptionPlan
+from zedasignal_backend.apps.trading.services import ChannelAudienceService
+from zedasignal_backend.apps.users.utils import get_custom_user_model
+from zedasignal_backend.core.response_cache import bump_model_version
+
+User = get_custom_user_model()
 
 
 @receiver(post_save, sender=Signal)
 def publish_signals_to_active_users_by_email(sender, instance: Signal, created, **kwargs):
     """
-    This method sends signals to active users by email.
+    This method records newly created signals in the outbox, in the same transaction as the signal.
+    The outbox relay then hands them over to the celery fan-out pipeline, which notifies active
+    subscribers on every channel without blocking the request.
+
+    Signals that are rolled back are never published, and a committed signal is published even if the
+    worker that would have dispatched it dies.
     """
     if created:
-        SignalService.publish_signal_to_active_subscribers_by_email(instance)
-        SignalService.publish_signal_to_active_subscribers_by_sms(instance)
+        OutboxService.publish(OutboxEvent.EventType.SIGNAL_CREATED, signal_id=instance.id)
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def sync_channel_audience_of_subscriber(sender, instance: Subscription, **kwargs):
+    """
+    This method keeps the channel audience of a subscriber in line with their active subscriptions.
+    """
+    ChannelAudienceService.sync_users([instance.user_id])  # type: ignore
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+def sync_channel_audience_of_plan(sender, instance: SubscriptionPlan, created, update_fields=None, **kwargs):
+    """
+    This method re-syncs the channel audience of a plan's subscribers when its notification channels may have changed.
+    """
+    if created or (update_fields is not None and "notification_channels" not in update_fields):
+        return
+    ChannelAudienceService.sync_plan(instance.id)
+
+
+@receiver(post_save, sender=User)
+def sync_channel_audience_of_user(sender, instance, created, update_fields=None, **kwargs):
+    """
+    This method adds or removes a user from the channel audience when they are activated or deactivated.
+    Saves that only touch other fields, like `last_login` on every login, are skipped.
+    """
+    if created or (update_fields is not None and "is_active" not in update_fields):
+        return
+    ChannelAudienceService.sync_users([instance.id])
+
+
+@receiver(post_save, sender=Signal)
+@receiver(post_delete, sender=Signal)
+@receiver(post_save, sender=SubscriptionPlan)
+@receiver(post_delete, sender=SubscriptionPlan)
+def invalidate_cached_responses(sender, **kwargs):
+    """
+    This method invalidates the cached signal and subscription plan responses when a row changes.
+    The version is bumped once the transaction commits: a request reading the rows in between would
+    otherwise cache the old rows under the new version.
+    """
+    transaction.on_commit(partial(bump_model_version, sender))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_signal_authors(sender, created=False, update_fields=None, **kwargs):
+    """
+    This method invalidates the cached signals when a user that may be embedded as their author changes.
+    New users haven't authored signals yet, and saves that only touch fields the signals don't embed,
+    like `last_login` on every login, are skipped.
+    """
+    embedded_fields = {"uuid", "nickname"}
+    if created or (update_fields is not None and not embedded_fields.intersection(update_fields)):
+        return
+    transaction.on_commit(partial(bump_model_version, sender))
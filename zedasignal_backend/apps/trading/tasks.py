@@ -0,0 +1,162 @@
+from celery import Task, group
+from django.conf import settings
+
+from config import celery_app
+from zedasignal_backend.apps.notifications.services import DeadLetterService
+from zedasignal_backend.apps.trading.models import Signal, SignalDelivery
+from zedasignal_backend.apps.trading.services import (
+    ChannelAudienceService,
+    SignalDeliveryService,
+    SignalService,
+    channels_type,
+)
+from zedasignal_backend.apps.users.models import User
+from zedasignal_backend.core.termii.utils import remove_plus_prefix
+from zedasignal_backend.core.utils.main import chunked
+
+
+# The delivery ledger makes the signal tasks safe to run again, so they are acknowledged once done and
+# put back on the queue if their worker dies. Nothing reads their results, so none are stored.
+@celery_app.task(acks_late=True, reject_on_worker_lost=True, ignore_result=True)
+def send_signal_to_subscribers_by_email(signal_id: int, user_ids: list[int]):
+    """
+    Sends a signal by email to the subscribers of a chunk that have not received it yet, and records
+    each batch of accepted emails in the delivery ledger as it is sent. Subscribers whose email still
+    failed after its retries are recorded as failed and kept in the dead letters. The deliveries are
+    claimed before sending, so a copy of the task running at the same time skips them.
+
+    Args:
+        signal_id (int): The id of the signal to be sent.
+        user_ids (list[int]): The ids of the subscribers in this chunk.
+    """
+    signal = Signal.objects.select_related("author").get(id=signal_id)
+    undelivered_user_ids = SignalDeliveryService.claim_deliveries(signal_id, "email", user_ids)
+    users = User.objects.filter(id__in=undelivered_user_ids).order_by("id")
+    dead_lettered_user_ids: set[int] = set()
+
+    def mark_chunk_sent(users_chunk: list[User]):
+        user_ids_chunk = [user.id for user in users_chunk]
+        SignalDeliveryService.mark_deliveries(signal_id, "email", user_ids_chunk, SignalDelivery.Status.SENT)
+
+    def mark_chunk_failed(users_chunk: list[User], error: str):
+        user_ids_chunk = [user.id for user in users_chunk]
+        SignalDeliveryService.mark_deliveries(signal_id, "email", user_ids_chunk, SignalDelivery.Status.FAILED, error)
+        DeadLetterService.record_signal_deliveries(
+            signal_id, "email", {user.id: user.username for user in users_chunk}, error
+        )
+        dead_lettered_user_ids.update(user_ids_chunk)
+
+    try:
+        SignalService.send_signal_to_subscribers_by_email(
+            signal, users, on_chunk_sent=mark_chunk_sent, on_send_failed=mark_chunk_failed
+        )
+    except Exception as error:
+        SignalDeliveryService.mark_deliveries(
+            signal_id, "email", undelivered_user_ids, SignalDelivery.Status.FAILED, str(error)
+        )
+        # the users of chunks that failed before the error are already in the dead letters
+        failed_user_ids = (
+            SignalDelivery.objects.filter(signal_id=signal_id, channel="email", user_id__in=undelivered_user_ids)
+            .exclude(status=SignalDelivery.Status.SENT)
+            .exclude(user_id__in=dead_lettered_user_ids)
+            .values_list("user_id", flat=True)
+        )
+        DeadLetterService.record_signal_deliveries(
+            signal_id,
+            "email",
+            dict(User.objects.filter(id__in=failed_user_ids).values_list("id", "username")),
+            str(error),
+        )
+        raise
+    return len(undelivered_user_ids)
+
+
+@celery_app.task(acks_late=True, reject_on_worker_lost=True, ignore_result=True)
+def send_signal_to_subscribers_by_sms(signal_id: int, user_ids: list[int]):
+    """
+    Sends a signal by sms to the subscribers of a chunk that have not received it yet, and records the
+    outcome of every recipient in the delivery ledger. Subscribers without a valid phone number are skipped.
+    Subscribers of batches that still failed after their retries are kept in the dead letters. The
+    deliveries are claimed before sending, so a copy of the task running at the same time skips them.
+
+    Args:
+        signal_id (int): The id of the signal to be sent.
+        user_ids (list[int]): The ids of the subscribers in this chunk.
+    """
+    signal = Signal.objects.select_related("author").get(id=signal_id)
+    undelivered_user_ids = SignalDeliveryService.claim_deliveries(signal_id, "sms", user_ids)
+    users = list(User.objects.filter(id__in=undelivered_user_ids).only("id", "phone_number"))
+    result = SignalService.send_signal_to_subscribers_by_sms(signal, users)
+
+    user_ids_by_phone_number: dict[str, list[int]] = {}
+    for user in users:
+        if user.phone_number:
+            user_ids_by_phone_number.setdefault(remove_plus_prefix(user.phone_number), []).append(user.id)
+
+    sent_user_ids = {
+        user_id
+        for phone_number in result.delivered_recipients
+        for user_id in user_ids_by_phone_number.get(phone_number, [])
+    }
+    SignalDeliveryService.mark_deliveries(signal_id, "sms", list(sent_user_ids), SignalDelivery.Status.SENT)
+    failed_user_ids = set()
+    for batch in result.failed_batches:
+        batch_user_ids = [
+            user_id for phone_number in batch.recipients for user_id in user_ids_by_phone_number[phone_number]
+        ]
+        SignalDeliveryService.mark_deliveries(
+            signal_id, "sms", batch_user_ids, SignalDelivery.Status.FAILED, batch.error
+        )
+        DeadLetterService.record_signal_deliveries(
+            signal_id,
+            "sms",
+            {
+                user_id: phone_number
+                for phone_number in batch.recipients
+                for user_id in user_ids_by_phone_number[phone_number]
+            },
+            batch.error,
+        )
+        failed_user_ids.update(batch_user_ids)
+    skipped_user_ids = set(undelivered_user_ids) - sent_user_ids - failed_user_ids
+    SignalDeliveryService.mark_deliveries(signal_id, "sms", list(skipped_user_ids), SignalDelivery.Status.SKIPPED)
+    return len(undelivered_user_ids)
+
+
+CHANNEL_TASKS: dict[channels_type, Task] = {
+    "email": send_signal_to_subscribers_by_email,
+    "sms": send_signal_to_subscribers_by_sms,
+}
+
+
+@celery_app.task(acks_late=True, reject_on_worker_lost=True, ignore_result=True)
+def dispatch_signal_notifications(signal_id: int):
+    """
+    Orchestrates the fan-out of a signal. Records a pending delivery for every subscriber of every
+    supported channel, then enqueues one child task per chunk of `SIGNAL_DISPATCH_CHUNK_SIZE`
+    undelivered subscribers, so the fan-out is spread over every available worker process.
+
+    Dispatching a signal again resumes its fan-out: only subscribers that are still pending or
+    failed in the delivery ledger are sent to.
+
+    Args:
+        signal_id (int): The id of the signal to be published.
+    """
+    if not Signal.objects.filter(id=signal_id).exists():
+        return 0
+
+    chunk_size = settings.SIGNAL_DISPATCH_CHUNK_SIZE
+    child_tasks = []
+    for channel, task in CHANNEL_TASKS.items():
+        audience_user_ids = ChannelAudienceService.fetch_audience_user_ids(channel)
+        for user_ids_chunk in chunked(audience_user_ids.iterator(chunk_size=chunk_size), chunk_size):
+            SignalDeliveryService.create_pending_deliveries(signal_id, channel, user_ids_chunk)
+
+        user_ids = SignalDeliveryService.fetch_undelivered_user_ids(signal_id, channel)
+        for user_ids_chunk in chunked(user_ids.iterator(chunk_size=chunk_size), chunk_size):
+            child_tasks.append(task.s(signal_id, user_ids_chunk))
+
+    if child_tasks:
+        group(child_tasks).apply_async()
+
+    return len(child_tasks)
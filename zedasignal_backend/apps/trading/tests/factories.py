@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from factory import Faker, LazyFunction, SubFactory
+from factory.django import DjangoModelFactory
+
+from zedasignal_backend.apps.trading.models import Signal, Subscription, SubscriptionPlan
+from zedasignal_backend.apps.users.tests.factories import UserFactory
+
+
+class SubscriptionPlanFactory(DjangoModelFactory):
+    name = Faker("word")
+    monthly_price = 10
+    yearly_price = 100
+    notification_channels = [SubscriptionPlan.EMAIL, SubscriptionPlan.SMS]
+    creator = SubFactory(UserFactory)
+
+    class Meta:
+        model = SubscriptionPlan
+
+
+class SubscriptionFactory(DjangoModelFactory):
+    user = SubFactory(UserFactory)
+    plan = SubFactory(SubscriptionPlanFactory)
+    start_timestamp = LazyFunction(timezone.now)
+    end_timestamp = LazyFunction(lambda: timezone.now() + timedelta(days=30))
+
+    class Meta:
+        model = Subscription
+
+
+class SignalFactory(DjangoModelFactory):
+    entry = 1.0842
+    take_profit = 1.0921
+    stop_loss = 1.0801
+    pair_base = "eur"
+    pair_quote = "usd"
+    author = SubFactory(UserFactory)
+
+    class Meta:
+        model = Signal
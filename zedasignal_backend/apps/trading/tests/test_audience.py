@@ -0,0 +1,74 @@
+import pytest
+from django.core.management import call_command
+
+from zedasignal_backend.apps.trading.models import ChannelAudience, Subscription, SubscriptionPlan
+from zedasignal_backend.apps.trading.services import ChannelAudienceService
+from zedasignal_backend.apps.trading.tests.factories import SubscriptionFactory, SubscriptionPlanFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def audience(channel):
+    return list(ChannelAudienceService.fetch_audience_user_ids(channel))
+
+
+def test_audience_follows_subscription_changes():
+    subscription = SubscriptionFactory()
+    user_id = subscription.user.id
+    assert audience("email") == audience("sms") == [user_id]
+
+    subscription.is_active = False
+    subscription.save()
+    assert audience("email") == audience("sms") == []
+
+    subscription.is_active = True
+    subscription.save()
+    subscription.delete()
+    assert not ChannelAudience.objects.exists()
+
+
+def test_audience_keeps_user_while_another_subscription_covers_the_channel():
+    subscription = SubscriptionFactory()
+    SubscriptionFactory(user=subscription.user, plan=SubscriptionPlanFactory(notification_channels=["email"]))
+
+    subscription.delete()
+
+    assert audience("email") == [subscription.user.id]
+    assert audience("sms") == []
+
+
+def test_audience_follows_plan_channels_and_user_status():
+    subscriptions = SubscriptionFactory.create_batch(3, plan=SubscriptionPlanFactory())
+    plan = subscriptions[0].plan
+    user_ids = sorted(subscription.user.id for subscription in subscriptions)
+
+    plan.notification_channels = [SubscriptionPlan.SMS, SubscriptionPlan.WHATSAPP]
+    plan.save()
+    assert audience("email") == []
+    assert audience("sms") == audience("whatsapp") == user_ids
+
+    user = subscriptions[0].user
+    user.is_active = False
+    user.save(update_fields=["is_active"])
+    assert audience("sms") == sorted(set(user_ids) - {user.id})
+
+    user.is_active = True
+    user.save()
+    assert audience("sms") == user_ids
+
+
+def test_rebuild_channel_audience_restores_bulk_updates():
+    subscriptions = SubscriptionFactory.create_batch(2)
+    Subscription.objects.filter(id=subscriptions[0].id).update(is_active=False)
+    ChannelAudience.objects.all().delete()
+
+    call_command("rebuild_channel_audience")
+
+    assert audience("email") == audience("sms") == [subscriptions[1].user.id]
+
+
+def test_audience_lookup_does_not_grow_with_plans(django_assert_num_queries):
+    SubscriptionFactory.create_batch(10)
+
+    with django_assert_num_queries(1):
+        assert len(audience("email")) == 10
@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from zedasignal_backend.apps.trading.models import Signal, SubscriptionPlan
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory, SubscriptionFactory, SubscriptionPlanFactory
+from zedasignal_backend.apps.users.models import User
+from zedasignal_backend.core.custom_view_pagination import CustomCursorPagination
+from zedasignal_backend.core.response_cache import bump_model_version, get_model_versions, get_response_cache_key
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def subscriber_client() -> APIClient:
+    client = APIClient()
+    client.force_authenticate(SubscriptionFactory().user)
+    return client
+
+
+def test_polling_the_feed_gets_a_not_modified_until_it_changes(subscriber_client, django_capture_on_commit_callbacks):
+    SignalFactory()
+    url = reverse("signals-list")
+
+    response = subscriber_client.get(url)
+    assert response.status_code == 200
+    etag = response["ETag"]
+    assert response["Last-Modified"]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = subscriber_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response["ETag"] == etag
+    assert not any('"trading_signal"' in query["sql"] for query in queries)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        SignalFactory()
+    response = subscriber_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert len(response.data["result"]["results"]) == 2
+
+
+def test_not_modified_only_reads_the_latest_updated_at_when_nothing_is_cached(subscriber_client):
+    SignalFactory.create_batch(3)
+    url = reverse("signals-list")
+    etag = subscriber_client.get(url)["ETag"]
+    # drop the cached payload, but not the model versions that are part of the ETag
+    cache.delete(
+        get_response_cache_key("SignalModelViewSet.list", get_model_versions(Signal, User), f"http://testserver{url}")
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = subscriber_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    (signal_query,) = [query["sql"] for query in queries if '"trading_signal"' in query["sql"]]
+    assert "MAX(" in signal_query
+    assert "COUNT(" not in signal_query
+
+
+def test_deleting_an_older_plan_changes_the_etag(django_capture_on_commit_callbacks):
+    older, _ = SubscriptionPlanFactory.create_batch(2)
+    client, url = APIClient(), reverse("subscription-plans-list")
+    etag = client.get(url)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        older.delete()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert len(response.data["result"]) == 1
+
+
+def test_subscription_plan_answers_if_modified_since():
+    plan = SubscriptionPlanFactory()
+    client, url = APIClient(), reverse("subscription-plans-detail", kwargs={"uuid": plan.uuid})
+    last_modified = client.get(url)["Last-Modified"]
+
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+    earlier = http_date((plan.updated_at - timedelta(hours=1)).timestamp())
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=earlier).status_code == 200
+
+    # updates that bypass the model signals bump the cache version themselves
+    SubscriptionPlan.objects.filter(id=plan.id).update(updated_at=timezone.now() + timedelta(hours=1))
+    bump_model_version(SubscriptionPlan)
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 200
+
+
+def test_malformed_lookup_is_still_a_not_found():
+    response = APIClient().get(reverse("subscription-plans-detail", kwargs={"uuid": "not-a-uuid"}))
+
+    assert response.status_code == 404
+
+
+def test_etag_changes_once_an_update_commits(django_capture_on_commit_callbacks):
+    plan = SubscriptionPlanFactory(name="Basic")
+    client, url = APIClient(), reverse("subscription-plans-list")
+    etag = client.get(url)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            plan.name = "Premium"
+            plan.save()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+    assert [plan["name"] for plan in response.data["result"]] == ["Premium"]
+
+
+def test_a_signal_committed_while_the_page_is_read_is_revalidated(subscriber_client, monkeypatch):
+    SignalFactory()
+    url = reverse("signals-list")
+    paginate_queryset = CustomCursorPagination.paginate_queryset
+
+    def paginate_queryset_after_a_write(self, *args, **kwargs):
+        # another request commits a signal between the validators and the page being read
+        SignalFactory()
+        bump_model_version(Signal)
+        return paginate_queryset(self, *args, **kwargs)
+
+    monkeypatch.setattr(CustomCursorPagination, "paginate_queryset", paginate_queryset_after_a_write)
+    response = subscriber_client.get(url)
+    monkeypatch.undo()
+
+    assert len(response.data["result"]["results"]) == 2
+    # the payload is fresher than its ETag, so the next poll gets it again rather than a 304
+    response = subscriber_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 200
+    assert len(response.data["result"]["results"]) == 2
+    assert subscriber_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 304
@@ -0,0 +1,92 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from zedasignal_backend.apps.trading.models import SubscriptionPlan
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory, SubscriptionFactory, SubscriptionPlanFactory
+from zedasignal_backend.apps.users.tests.factories import UserFactory
+from zedasignal_backend.core.response_cache import get_model_versions
+
+pytestmark = pytest.mark.django_db
+
+
+def fetch(client: APIClient, url: str) -> tuple[dict, list[str]]:
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200, response.data
+    return response.data["result"], [query["sql"] for query in queries]
+
+
+def test_cached_subscription_plans_skip_the_database_until_a_plan_changes(django_capture_on_commit_callbacks):
+    plan = SubscriptionPlanFactory(name="Basic")
+    client, url = APIClient(), reverse("subscription-plans-list")
+
+    first, first_queries = fetch(client, url)
+    second, second_queries = fetch(client, url)
+    assert first == second
+    assert any('"trading_subscriptionplan"' in sql for sql in first_queries)
+    assert not any('"trading_subscriptionplan"' in sql for sql in second_queries)
+
+    plan.name = "Premium"
+    with django_capture_on_commit_callbacks(execute=True):
+        plan.save()
+    third, third_queries = fetch(client, url)
+    assert [plan["name"] for plan in third] == ["Premium"]
+    assert any('"trading_subscriptionplan"' in sql for sql in third_queries)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        SubscriptionPlan.objects.get().delete()
+    assert fetch(client, url)[0] == []
+
+
+def test_cached_signals_still_check_the_subscription_of_every_caller():
+    SignalFactory()
+    subscriber, outsider = APIClient(), APIClient()
+    subscriber.force_authenticate(SubscriptionFactory().user)
+    outsider.force_authenticate(UserFactory())
+    url = reverse("signals-list")
+
+    fetch(subscriber, url)
+    _, cached_queries = fetch(subscriber, url)
+    assert not any('"trading_signal"' in sql for sql in cached_queries)
+    assert outsider.get(url).status_code == 403
+
+
+def test_cached_signals_reflect_new_signals_and_author_changes_at_once(django_capture_on_commit_callbacks):
+    signal = SignalFactory()
+    client = APIClient()
+    client.force_authenticate(SubscriptionFactory().user)
+    url = reverse("signals-list")
+    fetch(client, url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        SignalFactory()
+    assert len(fetch(client, url)[0]["results"]) == 2
+
+    author = signal.author
+    author.nickname = "fx-desk"
+    with django_capture_on_commit_callbacks(execute=True):
+        author.save(update_fields=["nickname"])
+    results = fetch(client, url)[0]["results"]
+    assert {"uuid": str(author.uuid), "nickname": "fx-desk"} in [result["author"] for result in results]
+
+    # logins touch the user row without changing the signals
+    with django_capture_on_commit_callbacks(execute=True):
+        author.save(update_fields=["last_login"])
+    _, queries = fetch(client, url)
+    assert not any('"trading_signal"' in sql for sql in queries)
+
+
+def test_versions_are_bumped_only_once_the_transaction_commits(django_capture_on_commit_callbacks):
+    version = get_model_versions(SubscriptionPlan)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        SubscriptionPlanFactory()
+    # a request served before the commit still reads the old rows, and caches them under the old version
+    assert get_model_versions(SubscriptionPlan) == version
+
+    for callback in callbacks:
+        callback()
+    assert get_model_versions(SubscriptionPlan) != version
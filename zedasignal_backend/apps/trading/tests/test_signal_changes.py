@@ -0,0 +1,82 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory, SubscriptionFactory
+from zedasignal_backend.apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def subscriber_client() -> APIClient:
+    client = APIClient()
+    client.force_authenticate(SubscriptionFactory().user)
+    return client
+
+
+def fetch_changes(client: APIClient, cursor: str | None = None, **params) -> dict:
+    if cursor is not None:
+        params["since"] = cursor
+    response = client.get(reverse("signals-changes"), params)
+    assert response.status_code == 200, response.data
+    return response.data["result"]
+
+
+def test_client_catches_up_with_only_the_signals_changed_since_its_cursor(subscriber_client):
+    unchanged, updated, deactivated = SignalFactory.create_batch(3)
+    cursor = fetch_changes(subscriber_client)["cursor"]
+
+    updated.entry_price = 1.2345
+    updated.save()
+    deactivated.is_active = False
+    deactivated.save()
+    created = SignalFactory()
+    changes = fetch_changes(subscriber_client, cursor)
+
+    assert [signal["uuid"] for signal in changes["results"]] == [
+        str(updated.uuid),
+        str(deactivated.uuid),
+        str(created.uuid),
+    ]
+    assert changes["results"][1]["is_active"] is False
+    assert changes["has_more"] is False
+
+    caught_up = fetch_changes(subscriber_client, changes["cursor"])
+    assert caught_up == {"results": [], "cursor": changes["cursor"], "has_more": False}
+    assert str(unchanged.uuid) not in [signal["uuid"] for signal in changes["results"]]
+
+
+def test_changes_are_paged_and_read_off_the_updated_at_index(subscriber_client):
+    signals = SignalFactory.create_batch(5)
+
+    first = fetch_changes(subscriber_client, page_size=3)
+    assert first["has_more"] is True
+    with CaptureQueriesContext(connection) as queries:
+        second = fetch_changes(subscriber_client, first["cursor"], page_size=3)
+
+    synced = [signal["uuid"] for signal in first["results"] + second["results"]]
+    assert synced == [str(signal.uuid) for signal in signals]
+    assert second["has_more"] is False
+    (changes_query,) = [query["sql"] for query in queries if 'FROM "trading_signal"' in query["sql"]]
+    assert "OFFSET" not in changes_query
+    assert "LIMIT 4" in changes_query
+
+
+def test_signals_changed_within_the_settle_window_are_held_back(settings, subscriber_client):
+    settings.DELTA_SYNC_SETTLE_SECONDS = 60
+    SignalFactory()
+
+    changes = fetch_changes(subscriber_client)
+
+    assert changes == {"results": [], "cursor": None, "has_more": False}
+
+
+def test_changes_need_a_subscription_and_a_valid_cursor(subscriber_client):
+    outsider = APIClient()
+    outsider.force_authenticate(UserFactory())
+
+    assert outsider.get(reverse("signals-changes")).status_code == 403
+    assert subscriber_client.get(reverse("signals-changes"), {"since": "cD1ub3QtYS1wb3NpdGlvbg=="}).status_code == 404
@@ -0,0 +1,91 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from zedasignal_backend.apps.trading.models import Signal
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory, SubscriptionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def subscriber_client() -> APIClient:
+    client = APIClient()
+    client.force_authenticate(SubscriptionFactory().user)
+    return client
+
+
+def fetch_page(client: APIClient, url: str) -> dict:
+    response = client.get(url)
+    assert response.status_code == 200, response.data
+    return response.data["result"]
+
+
+def test_feed_pages_through_signals_sharing_an_updated_at(subscriber_client):
+    signals = SignalFactory.create_batch(7)
+    SignalFactory(is_active=False)
+    # signals edited in the same transaction share their updated_at
+    Signal.objects.filter(id__in=[signal.id for signal in signals[2:5]]).update(updated_at=timezone.now())
+    expected = list(
+        Signal.objects.filter(is_active=True).order_by("-updated_at", "-id").values_list("uuid", flat=True)
+    )
+
+    pages, url = [], f"{reverse('signals-list')}?page_size=3"
+    while url:
+        page = fetch_page(subscriber_client, url)
+        pages.append([str(signal["uuid"]) for signal in page["results"]])
+        url = page["next"]
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [uuid for page in pages for uuid in page] == [str(uuid) for uuid in expected]
+
+    last_page = fetch_page(subscriber_client, f"{reverse('signals-list')}?page_size=3")
+    last_page = fetch_page(subscriber_client, fetch_page(subscriber_client, last_page["next"])["next"])
+    previous_page = fetch_page(subscriber_client, last_page["previous"])
+    assert [str(signal["uuid"]) for signal in previous_page["results"]] == pages[1]
+
+
+def test_later_pages_cost_the_same_as_the_first(subscriber_client):
+    SignalFactory.create_batch(12)
+    url = f"{reverse('signals-list')}?page_size=3"
+
+    with CaptureQueriesContext(connection) as first_page_queries:
+        url = fetch_page(subscriber_client, url)["next"]
+    for _ in range(2):
+        url = fetch_page(subscriber_client, url)["next"]
+    with CaptureQueriesContext(connection) as later_page_queries:
+        fetch_page(subscriber_client, url)
+
+    assert len(later_page_queries) == len(first_page_queries)
+    signal_queries = [query["sql"] for query in later_page_queries if 'FROM "trading_signal"' in query["sql"]]
+    # the other query is the aggregate of the conditional GET validators
+    (feed_query,) = [sql for sql in signal_queries if "MAX(" not in sql]
+    assert "OFFSET" not in feed_query
+    assert "LIMIT 4" in feed_query
+
+
+def test_feed_rejects_a_tampered_cursor(subscriber_client):
+    response = subscriber_client.get(f"{reverse('signals-list')}?cursor=cD1ub3QtYS1wb3NpdGlvbg%3D%3D")
+
+    assert response.status_code == 404
+
+
+def test_feed_embeds_the_author_without_extra_queries(subscriber_client, django_capture_on_commit_callbacks):
+    def count_queries() -> int:
+        with CaptureQueriesContext(connection) as queries:
+            fetch_page(subscriber_client, reverse("signals-list"))
+        return len(queries)
+
+    SignalFactory()
+    queries_for_one = count_queries()
+    with django_capture_on_commit_callbacks(execute=True):
+        SignalFactory.create_batch(10)
+    queries_for_many = count_queries()
+
+    assert queries_for_many == queries_for_one
+    author = Signal.objects.select_related("author").latest("id").author
+    first_signal = fetch_page(subscriber_client, reverse("signals-list"))["results"][0]
+    assert first_signal["author"] == {"uuid": str(author.uuid), "nickname": author.nickname}
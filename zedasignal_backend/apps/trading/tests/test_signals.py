@@ -0,0 +1,72 @@
+from unittest import mock
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from zedasignal_backend.apps.trading.services import SignalService
+from zedasignal_backend.apps.trading.tasks import dispatch_signal_notifications
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory, SubscriptionFactory
+from zedasignal_backend.apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+SIGNAL_PAYLOAD = {
+    "entry": 1.0842,
+    "takeProfit": 1.0921,
+    "stopLoss": 1.0801,
+    "term": "long",
+    "action": "buy",
+    "pairBase": "eur",
+    "pairQuote": "usd",
+}
+
+
+def test_signal_creation_dispatches_through_the_outbox_after_commit(settings, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    with mock.patch.object(dispatch_signal_notifications, "delay") as delay:
+        with django_capture_on_commit_callbacks() as callbacks:
+            signal = SignalFactory()
+        delay.assert_not_called()
+
+        # the relay defers the fan-out to its own commit
+        with django_capture_on_commit_callbacks(execute=True):
+            for callback in callbacks:
+                callback()
+
+    delay.assert_called_once_with(signal.id)
+
+
+def test_rolled_back_signal_is_never_dispatched(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        with pytest.raises(RuntimeError), transaction.atomic():
+            SignalFactory()
+            raise RuntimeError("rollback")
+
+    assert callbacks == []
+
+
+def create_signal_with_subscribers(number_of_subscribers: int):
+    SubscriptionFactory.create_batch(number_of_subscribers)
+    client = APIClient()
+    client.force_authenticate(UserFactory())
+
+    with mock.patch.object(SignalService, "send_signal_to_subscribers_by_email") as send_email:
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(reverse("create-signal"), SIGNAL_PAYLOAD, format="json")
+        sent_during_request = send_email.call_count
+
+    assert response.status_code == 200
+    return len(queries), sent_during_request
+
+
+def test_create_signal_transaction_does_not_grow_with_subscribers(settings, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    with django_capture_on_commit_callbacks():
+        queries_for_one, sent_for_one = create_signal_with_subscribers(1)
+        queries_for_many, sent_for_many = create_signal_with_subscribers(25)
+
+    assert queries_for_one == queries_for_many
+    assert sent_for_one == sent_for_many == 0
@@ -0,0 +1,149 @@
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPServerDisconnected
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.management import call_command
+from django.utils import timezone
+
+from zedasignal_backend.apps.trading.models import SignalDelivery
+from zedasignal_backend.apps.trading.services import SignalDeliveryService, SignalService
+from zedasignal_backend.apps.trading.tasks import (
+    dispatch_signal_notifications,
+    send_signal_to_subscribers_by_email,
+    send_signal_to_subscribers_by_sms,
+)
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory, SubscriptionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def eager_celery(settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+
+
+def test_dispatch_fans_out_one_child_task_per_chunk(settings, eager_celery):
+    settings.SIGNAL_DISPATCH_CHUNK_SIZE = 2
+    subscriptions = SubscriptionFactory.create_batch(5)
+    signal = SignalFactory()
+
+    with mock.patch.object(SignalService, "send_signal_to_subscribers_by_email") as send_email, mock.patch.object(
+        SignalService, "send_signal_to_subscribers_by_sms"
+    ) as send_sms:
+        result = dispatch_signal_notifications.delay(signal.id)
+
+    assert result.result == 6
+    assert send_email.call_count == 3
+    assert send_sms.call_count == 3
+    emailed_users = {user for call in send_email.call_args_list for user in call.args[1]}
+    assert emailed_users == {subscription.user for subscription in subscriptions}
+
+
+def test_dispatch_records_every_delivery_in_the_ledger(settings, eager_celery, termii_server):
+    subscriptions = SubscriptionFactory.create_batch(3)
+    without_phone_number = SubscriptionFactory(user__phone_number=None)
+    signal = SignalFactory()
+
+    dispatch_signal_notifications.delay(signal.id)
+
+    deliveries = SignalDelivery.objects.filter(signal=signal)
+    assert deliveries.filter(channel="email", status=SignalDelivery.Status.SENT).count() == 4
+    assert set(deliveries.filter(channel="sms", status=SignalDelivery.Status.SENT).values_list("user", flat=True)) == {
+        subscription.user.id for subscription in subscriptions
+    }
+    assert deliveries.get(channel="sms", user=without_phone_number.user).status == SignalDelivery.Status.SKIPPED
+    assert len(mail.outbox) == 4
+
+    progress = SignalDeliveryService.fetch_progress(signal.id)
+    assert progress["email"]["total"] == progress["email"]["sent"] == 4
+    assert progress["sms"]["sent"] == 3
+    assert progress["sms"]["skipped"] == 1
+
+    output = StringIO()
+    call_command("signal_delivery_progress", signal.id, stdout=output)
+    assert "email: 4/4 sent, 0 sending, 0 pending, 0 failed, 0 skipped" in output.getvalue()
+
+
+def test_email_fan_out_resumes_from_the_first_undelivered_recipient(settings, eager_celery):
+    settings.MASS_EMAIL_CHUNK_SIZE = 2
+    user_ids = sorted(subscription.user.id for subscription in SubscriptionFactory.create_batch(5))
+    signal = SignalFactory()
+    SignalDeliveryService.create_pending_deliveries(signal.id, "email", user_ids)
+    sent_chunks: list[list[EmailMultiAlternatives]] = []
+
+    def send_mass_html_mail(messages: list[EmailMultiAlternatives], **kwargs) -> int:
+        if sent_chunks:
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        sent_chunks.append(messages)
+        return len(messages)
+
+    with mock.patch("zedasignal_backend.core.mass_email_sender.send_mass_html_mail", send_mass_html_mail):
+        with pytest.raises(SMTPServerDisconnected):
+            send_signal_to_subscribers_by_email(signal.id, user_ids)
+
+    deliveries = SignalDelivery.objects.filter(signal=signal).order_by("user_id")
+    assert [delivery.status for delivery in deliveries] == ["sent"] * 2 + ["failed"] * 3
+    assert deliveries[2].error == "Connection unexpectedly closed"
+
+    assert dispatch_signal_notifications.delay(signal.id).result == 2
+    assert sorted(message.to[0] for message in mail.outbox) == sorted(
+        delivery.user.username for delivery in deliveries[2:]
+    )
+    assert not SignalDelivery.objects.filter(signal=signal, channel="email").exclude(status="sent").exists()
+
+
+def test_failed_sms_batches_are_recorded_for_retry(settings, termii_server):
+    settings.TERMII_BULK_BATCH_SIZE = 2
+    termii_server.status_code = 503
+    user_ids = [subscription.user.id for subscription in SubscriptionFactory.create_batch(3)]
+    signal = SignalFactory()
+    SignalDeliveryService.create_pending_deliveries(signal.id, "sms", user_ids)
+
+    assert send_signal_to_subscribers_by_sms(signal.id, user_ids) == 3
+
+    deliveries = SignalDelivery.objects.filter(signal=signal, channel="sms")
+    assert {delivery.status for delivery in deliveries} == {SignalDelivery.Status.FAILED}
+    assert all("503" in delivery.error for delivery in deliveries)
+    assert list(SignalDeliveryService.fetch_undelivered_user_ids(signal.id, "sms")) == sorted(user_ids)
+
+
+def test_a_copy_of_a_chunk_running_at_the_same_time_sends_nothing(settings):
+    user_ids = sorted(subscription.user.id for subscription in SubscriptionFactory.create_batch(3))
+    signal = SignalFactory()
+    SignalDeliveryService.create_pending_deliveries(signal.id, "email", user_ids)
+    send = SignalService.send_signal_to_subscribers_by_email
+    copies_sent: list[int] = []
+    copy_started = False
+
+    def send_while_a_copy_runs(*args, **kwargs):
+        nonlocal copy_started
+        # e.g. an outbox event relayed again, or a resumed fan-out, while the first copy is still sending
+        if not copy_started:
+            copy_started = True
+            copies_sent.append(send_signal_to_subscribers_by_email(signal.id, user_ids))
+        return send(*args, **kwargs)
+
+    with mock.patch.object(SignalService, "send_signal_to_subscribers_by_email", send_while_a_copy_runs):
+        assert send_signal_to_subscribers_by_email(signal.id, user_ids) == 3
+
+    assert copies_sent == [0]
+    assert len(mail.outbox) == 3
+    assert set(SignalDelivery.objects.filter(signal=signal).values_list("status", flat=True)) == {"sent"}
+
+
+def test_deliveries_claimed_by_a_task_that_died_are_claimed_again(settings):
+    settings.SIGNAL_DELIVERY_CLAIM_TIMEOUT = 60
+    user_ids = sorted(subscription.user.id for subscription in SubscriptionFactory.create_batch(2))
+    signal = SignalFactory()
+    SignalDeliveryService.create_pending_deliveries(signal.id, "email", user_ids)
+    assert SignalDeliveryService.claim_deliveries(signal.id, "email", user_ids) == user_ids
+    assert SignalDeliveryService.claim_deliveries(signal.id, "email", user_ids) == []
+
+    SignalDelivery.objects.filter(user_id=user_ids[0]).update(updated_at=timezone.now() - timedelta(minutes=2))
+
+    assert list(SignalDeliveryService.fetch_undelivered_user_ids(signal.id, "email")) == user_ids[:1]
+    assert SignalDeliveryService.claim_deliveries(signal.id, "email", user_ids) == user_ids[:1]
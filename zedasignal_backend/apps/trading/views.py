@@ -3,17 +3,21 @@ from typing import Any
 import environ
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from zedasignal_backend.apps.notifications.models import OutboxEvent
+from zedasignal_backend.apps.notifications.services import OutboxService
 from zedasignal_backend.apps.trading.decorators import user_has_active_subscription_or_is_admin
 from zedasignal_backend.apps.trading.models import Signal, SubscriptionPlan
 from zedasignal_backend.apps.trading.serializers import (
     AdminDashboardStatistics,
     CreateUserSubscriptionSerializer,
+    SignalChangesSerializer,
     SignalCreateSerializer,
     SignalReadSerializer,
     SubscriptionPlanReadSerializer,
@@ -22,10 +26,13 @@ from zedasignal_backend.apps.trading.serializers import (
 )
 from zedasignal_backend.apps.users.api.serializers import ErrorResponseSerializer, create_success_response_serializer
 from zedasignal_backend.apps.users.utils import get_custom_user_model
-from zedasignal_backend.core.custom_view_pagination import CustomPageNumberPagination
+from zedasignal_backend.core.custom_view_pagination import (
+    ChangesCursorPagination,
+    CustomCursorPagination,
+    CustomPageNumberPagination,
+)
 from zedasignal_backend.core.decorators import admin_required
 from zedasignal_backend.core.error_response import ErrorResponse
-from zedasignal_backend.core.sender import Sender
 from zedasignal_backend.core.success_response import SuccessResponse
 from zedasignal_backend.core.views_mixins import CustomReadOnlyViewSet
 
@@ -50,6 +57,7 @@ class AdminCreateSignal(APIView):
         serializer = self.serializer_class(data=request.data)
         if not serializer.is_valid():
             return ErrorResponse(details=serializer.errors, status=400, message="Invalid data")
+        # the request transaction (ATOMIC_REQUESTS) commits the signal and its outbox event together
         signal = serializer.save(author=request.user)
         return SuccessResponse(data=self.serializer_class(signal).data, message="Signal created.")
 
@@ -73,6 +81,18 @@ class AdminCreateSignal(APIView):
         operation_id="RetrieveSignal",
         description="Retrieve a signal.",
     ),
+    changes=extend_schema(
+        parameters=[
+            OpenApiParameter("since", str, description="The cursor returned by the previous call."),
+        ],
+        responses={
+            200: create_success_response_serializer(SignalChangesSerializer()),
+            404: ErrorResponseSerializer,
+        },
+        tags=["Trading"],
+        operation_id="ListSignalChanges",
+        description="List the signals created, updated or deactivated since a cursor, oldest first.",
+    ),
 )
 class SignalModelViewSet(CustomReadOnlyViewSet):
     """
@@ -80,8 +100,24 @@ class SignalModelViewSet(CustomReadOnlyViewSet):
     """
 
     serializer_class = SignalReadSerializer
-    queryset = Signal.objects.filter(is_active=True).order_by("-updated_at")
+    queryset = (
+        Signal.objects
+        # the author is joined in, with only the columns of `SignalAuthorSerializer`
+        .select_related("author")
+        .only(
+            *(field.name for field in Signal._meta.concrete_fields if not field.is_relation),
+            "author__uuid",
+            "author__nickname",
+        )
+        .order_by("-updated_at", "-id")
+    )
+    # pages are read backwards off the signal_changes index, so any page costs the same as the first one
+    pagination_class = CustomCursorPagination
     lookup_field = "uuid"
+    # the feed is the same for every subscriber, and only changes when a signal or its author does
+    cache_models = (Signal, User)
+    # polling clients revalidate with If-None-Match and get a 304 until the feed changes
+    last_modified_field = "updated_at"
 
     @user_has_active_subscription_or_is_admin
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
@@ -91,6 +127,22 @@ class SignalModelViewSet(CustomReadOnlyViewSet):
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         return super().retrieve(request, *args, **kwargs)
 
+    @action(detail=False)
+    @user_has_active_subscription_or_is_admin
+    def changes(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        # not cached, the settle window changes the answer without any signal changing
+        paginator = ChangesCursorPagination()
+        page = paginator.paginate_queryset(self.get_queryset(), request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return SuccessResponse(data=paginator.get_paginated_data(serializer.data))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # clients syncing changes need to hear about deactivated signals to drop them
+        if self.action == "changes":
+            return queryset
+        return queryset.filter(is_active=True)
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -121,6 +173,8 @@ class SubscriptionPlanViewSet(CustomReadOnlyViewSet):
     queryset = SubscriptionPlan.objects.filter(Q(is_active=True) | Q(coming_soon=True))
     lookup_field = "uuid"
     permission_classes = [AllowAny]
+    cache_models = (SubscriptionPlan,)
+    last_modified_field = "updated_at"
 
 
 class UserActiveSubscriptionPlans(APIView):
@@ -234,19 +288,7 @@ class AdminActivateUserSubscription(APIView):
         if not serializer.is_valid():
             return ErrorResponse(details=serializer.errors, status=400, message="Invalid data")
         subscription = serializer.save(created_by=request.user)
-        domain = env.str("DOMAIN_NAME")
-        Sender(
-            subscription.user,
-            email_content_object="notification.messages.subscription_activation",
-            html_template="emails/trading/subscription/activation-notification.html",
-            email_notif=True,
-            context={
-                "subscription_plan": subscription.plan,
-                "subscription": subscription,
-                "user": subscription.user,
-                "domain": domain,
-            },
-        )
+        OutboxService.publish(OutboxEvent.EventType.SUBSCRIPTION_ACTIVATED, subscription_id=subscription.id)
 
         return SuccessResponse(
             message="User subscription activated.",
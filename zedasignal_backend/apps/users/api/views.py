@@ -19,6 +19,8 @@ from rest_framework.viewsets import GenericViewSet
 from rest_framework_simplejwt.serializers import TokenBlacklistSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from zedasignal_backend.apps.notifications.models import OutboxEvent
+from zedasignal_backend.apps.notifications.services import OutboxService
 from zedasignal_backend.apps.users.models import VerificationCode
 from zedasignal_backend.apps.users.utils import get_tokens_for_user
 from zedasignal_backend.core.error_response import ErrorResponse
@@ -82,19 +84,7 @@ class UserRegistrationView(APIView):
 
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-
-        domain = env.str("DOMAIN_NAME")
-        context = {
-            "user": user,
-            "domain": domain,
-        }
-        Sender(
-            user,
-            email_content_object="notification.messages.registration_success_welcome",
-            html_template="emails/authentication/registration-welcome-message.html",
-            email_notif=True,
-            context=context,
-        )
+        OutboxService.publish(OutboxEvent.EventType.USER_REGISTERED, user_id=user.id)
 
         return SuccessResponse(
             message="User registered successfully",
@@ -180,9 +170,9 @@ class SendVerificationCode(APIView):
         Sender(
             user,
             email_content_object="notification.messages.user_registration",
-            html_template="emails/authentication/user-verification.html",
             email_notif=True,
             context=context,
+            queued=True,
         )
 
         return SuccessResponse(message="Verification code sent successfully", status=status.HTTP_200_OK)
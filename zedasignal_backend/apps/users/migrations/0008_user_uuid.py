@@ -0,0 +1,25 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:10
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0007_user_nickname"),
+    ]
+
+    operations = [
+        # Added without the unique constraint first: the default is evaluated once for the existing rows
+        migrations.AddField(
+            model_name="user",
+            name="uuid",
+            field=models.UUIDField(
+                default=uuid.uuid4,
+                editable=False,
+                help_text="Unique identifier for this object.",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:10
+
+import uuid
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def generate_uuids(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    users = []
+    for user in User.objects.only("id").iterator(chunk_size=BATCH_SIZE):
+        user.uuid = uuid.uuid4()
+        users.append(user)
+        if len(users) == BATCH_SIZE:
+            User.objects.bulk_update(users, ["uuid"])
+            users = []
+    User.objects.bulk_update(users, ["uuid"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0008_user_uuid"),
+    ]
+
+    operations = [
+        migrations.RunPython(generate_uuids, reverse_code=migrations.RunPython.noop),
+    ]
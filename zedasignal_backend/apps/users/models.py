@@ -7,11 +7,11 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from zedasignal_backend.apps.users.managers import CustomUserManager
-from zedasignal_backend.core.mixins import CreatedAndUpdatedAtMixin, CreatedAtMixin
+from zedasignal_backend.core.mixins import CreatedAndUpdatedAtMixin, CreatedAtMixin, UUIDMixin
 from zedasignal_backend.core.utils.main import generate_numeric_code
 
 
-class User(AbstractUser):
+class User(AbstractUser, UUIDMixin):
     """
     Default custom user model for Zedasignal Backend.
     If adding fields that need to be filled at user signup,
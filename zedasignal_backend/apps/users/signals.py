@@ -33,7 +33,7 @@ def password_reset_token_created(
     Sender(
         reset_password_token.user,
         email_content_object="notification.messages.reset_password_token",
-        html_template="emails/authentication/password-reset.html",
         email_notif=True,
         context=context,
+        queued=True,
     )
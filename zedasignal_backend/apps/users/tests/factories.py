@@ -11,7 +11,9 @@ from factory.django import DjangoModelFactory
 class UserFactory(DjangoModelFactory):
     username = Faker("user_name")
     email = Faker("email")
-    name = Faker("name")
+    first_name = Faker("first_name")
+    last_name = Faker("last_name")
+    phone_number = Faker("numerify", text="+234803#######")
 
     @post_generation
     def password(self, create: bool, extracted: Sequence[Any], **kwargs):
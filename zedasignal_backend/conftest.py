@@ -1,7 +1,10 @@
 import pytest
+from django.core.cache import cache
 
 from zedasignal_backend.apps.users.models import User
 from zedasignal_backend.apps.users.tests.factories import UserFactory
+from zedasignal_backend.core.termii.session import close_http_session
+from zedasignal_backend.core.termii.stub_server import StubTermiiServer
 
 
 @pytest.fixture(autouse=True)
@@ -9,6 +12,32 @@ def media_storage(settings, tmpdir):
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # cached responses outlive the test database rows they were built from
+    cache.clear()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
+
+
+@pytest.fixture
+def termii_server(settings):
+    with StubTermiiServer() as server:
+        settings.TERMII_BASE_URL = server.base_url
+        yield server
+    close_http_session()
+
+
+@pytest.fixture
+def smtp_server(settings):
+    from zedasignal_backend.core.utils.stub_smtp_server import StubSMTPServer
+
+    with StubSMTPServer() as server:
+        settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_HOST, settings.EMAIL_PORT = server.host, server.port
+        settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ""
+        settings.EMAIL_USE_TLS = settings.EMAIL_USE_SSL = False
+        yield server
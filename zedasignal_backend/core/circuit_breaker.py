@@ -0,0 +1,206 @@
+import inspect
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from redis.exceptions import RedisError
+
+from zedasignal_backend.core.metrics import increment_counter
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("termii", "email")
+
+
+class CircuitOpenError(OSError):
+    """
+    Raised instead of calling a provider while its circuit is open. It is an `OSError` so callers treat it
+    like the provider refusing the connection, without waiting for a timeout.
+    """
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker shared by every process that talks to the same provider.
+
+    While the circuit is closed, calls go through and the transient failures of the provider are counted.
+    Once `failure_threshold` failures happen within `failure_window` seconds, the circuit opens and calls
+    fail straight away with `CircuitOpenError`. After `reset_timeout` seconds the circuit is half open: a
+    single call is let through to probe the provider, and closes the circuit if the provider answers or
+    opens it again if it doesn't. The state is kept in the default cache so every gunicorn and celery
+    worker sees the same circuit. When the cache can't be reached, calls go through.
+
+    Usage:
+        with get_circuit_breaker("termii").guard(is_transient_termii_error):
+            response = session.post(...)
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, failure_window: float, reset_timeout: float):
+        self.name = name
+        self.failures_key = f"circuit-breaker:{name}:failures"
+        self.opened_at_key = f"circuit-breaker:{name}:opened-at"
+        self.probe_key = f"circuit-breaker:{name}:probe"
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.reset_timeout = reset_timeout
+
+    @property
+    def state(self) -> str:
+        opened_at = cache.get(self.opened_at_key)
+        if opened_at is None:
+            return self.CLOSED
+        return self.OPEN if time.time() - opened_at < self.reset_timeout else self.HALF_OPEN
+
+    @property
+    def failures(self) -> int:
+        return cache.get(self.failures_key, 0)
+
+    def before_call(self) -> bool:
+        """
+        Raises `CircuitOpenError` while the circuit is open. Returns whether the call probes the provider.
+        """
+        try:
+            opened_at = cache.get(self.opened_at_key)
+            if opened_at is None:
+                return False
+            # only one caller probes the provider, until the probe answers or reset_timeout passes
+            if time.time() - opened_at >= self.reset_timeout and cache.add(
+                self.probe_key, 1, timeout=self.reset_timeout
+            ):
+                logger.info("Circuit breaker %s is half open, probing the provider", self.name)
+                return True
+        except RedisError:
+            logger.warning("Circuit breaker %s can't reach the cache, letting the call through", self.name)
+            return False
+        raise CircuitOpenError(f"The {self.name} circuit is open, the provider isn't called")
+
+    def record_failure(self, probing: bool):
+        try:
+            if probing:
+                self.open()
+                return
+            cache.add(self.failures_key, 0, timeout=self.failure_window)
+            try:
+                failures = cache.incr(self.failures_key)
+            except ValueError:
+                # the window expired between add and incr
+                cache.add(self.failures_key, 1, timeout=self.failure_window)
+                failures = 1
+            if failures >= self.failure_threshold:
+                self.open()
+        except RedisError:
+            logger.warning("Circuit breaker %s can't reach the cache to record a failure", self.name)
+
+    def open(self):
+        cache.set(self.opened_at_key, time.time(), timeout=None)
+        cache.delete_many([self.failures_key, self.probe_key])
+        increment_counter("circuit_breaker_opened_total", provider=self.name)
+        logger.warning(
+            "Circuit breaker %s opened, failing calls for %ss",
+            self.name,
+            self.reset_timeout,
+            extra={"circuit_breaker": self.name, "circuit_breaker_state": self.OPEN},
+        )
+
+    def close(self):
+        try:
+            cache.delete_many([self.opened_at_key, self.failures_key, self.probe_key])
+        except RedisError:
+            logger.warning("Circuit breaker %s can't reach the cache to close", self.name)
+            return
+        logger.info(
+            "Circuit breaker %s closed, the provider recovered",
+            self.name,
+            extra={"circuit_breaker": self.name, "circuit_breaker_state": self.CLOSED},
+        )
+
+    @contextmanager
+    def guard(self, is_failure: Callable[[Exception], bool]) -> Iterator[None]:
+        """
+        Runs the block unless the circuit is open, and records its outcome.
+
+        Args:
+            is_failure (Callable): Tells whether an error means the provider is failing, rather than the
+                request being rejected, e.g. an invalid phone number.
+        """
+        probing = self.before_call()
+        try:
+            yield
+        except Exception as error:
+            if is_failure(error):
+                self.record_failure(probing)
+            elif probing:
+                self.close()
+            raise
+        if probing:
+            self.close()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker | None:
+    """
+    Returns the circuit breaker of a provider, or None when circuit breakers are disabled by setting
+    `NOTIFICATION_CIRCUIT_BREAKER_FAILURE_THRESHOLD` to 0.
+
+    Args:
+        provider (str): The provider name, e.g. "termii" or "email".
+    """
+    if not settings.NOTIFICATION_CIRCUIT_BREAKER_FAILURE_THRESHOLD:
+        return None
+    return CircuitBreaker(
+        provider,
+        failure_threshold=settings.NOTIFICATION_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        failure_window=settings.NOTIFICATION_CIRCUIT_BREAKER_FAILURE_WINDOW,
+        reset_timeout=settings.NOTIFICATION_CIRCUIT_BREAKER_RESET_TIMEOUT,
+    )
+
+
+@contextmanager
+def circuit_breaker(provider: str, is_failure: Callable[[Exception], bool]) -> Iterator[None]:
+    """
+    Runs the block through the provider's circuit breaker. Does nothing when circuit breakers are disabled.
+
+    Args:
+        provider (str): The provider name, e.g. "termii" or "email".
+        is_failure (Callable): Tells whether an error means the provider is failing.
+    """
+    breaker = get_circuit_breaker(provider)
+    if breaker is None:
+        yield
+        return
+    with breaker.guard(is_failure):
+        yield
+
+
+def guarded_by_circuit_breaker(provider: str, is_failure: Callable[[Exception], bool]):
+    """
+    Decorates a function or coroutine function that calls the provider with its circuit breaker.
+
+    Args:
+        provider (str): The provider name, e.g. "termii" or "email".
+        is_failure (Callable): Tells whether an error means the provider is failing.
+    """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with circuit_breaker(provider, is_failure):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with circuit_breaker(provider, is_failure):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,84 +1,140 @@
-from importlib import import_module
+from collections.abc import Callable, Iterable, Iterator
 from typing import Any
 
-from core.utils import send_mass_html_mail
+from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
 from django.db.models import QuerySet
-from django.template.loader import render_to_string
 
 from zedasignal_backend.apps.users.utils import get_custom_user_model
+from zedasignal_backend.core.notification_catalog import notification_catalog
+from zedasignal_backend.core.utils import BroadcastEmailMessage, send_mass_html_mail
+from zedasignal_backend.core.utils.async_emails import AsyncSMTPSender, send_mass_html_mail_async
+from zedasignal_backend.core.utils.main import chunked
+from zedasignal_backend.core.utils.smtp_pool import SMTPConnectionPool
+from zedasignal_backend.core.utils.templates import PersonalisedTemplate
 
 User = get_custom_user_model()
 
 
 class MassEmailSender:
+    """
+    Sends the same email template to many users.
+
+    Users are streamed in chunks of `chunk_size` (defaults to `MASS_EMAIL_CHUNK_SIZE`): each chunk is
+    built and sent before the next one is pulled from the database, so memory stays bounded by the
+    chunk size rather than the number of recipients, and sending starts with the first chunk.
+    `on_chunk_sent` is called with the users of each chunk once their emails are accepted. With the sync
+    transport, every chunk is sent over the same `SMTPConnectionPool`.
+
+    Transient failures are retried by the pool, or by the `AsyncSMTPSender` of the async transport. When
+    `on_send_failed` is given, the users whose email still failed are handed to it with the error, and
+    sending carries on with the other users; otherwise the first failure is raised.
+
+    Without `include_user_in_context` every user gets the same email, so it is built once as a
+    `BroadcastEmailMessage` and sent to batches of `EMAIL_BROADCAST_BATCH_SIZE` envelope recipients.
+    """
+
     def __init__(
         self,
-        users: QuerySet[User] | list[User],
-        html_template: str,
+        users: QuerySet[User] | Iterable[User],
+        html_template: str | None = None,
         email_content_object=None,
         include_user_in_context=False,
         context=None,
+        chunk_size: int | None = None,
+        on_chunk_sent: Callable[[list[User]], None] | None = None,
+        on_send_failed: Callable[[list[User], str], None] | None = None,
     ):
         self.users = users
         self.email_content_object = email_content_object
         self.html_template = html_template
         self.include_user_in_context = include_user_in_context
-        self.email_messages_for_users: list[EmailMultiAlternatives] = []
+        self.chunk_size = chunk_size if chunk_size is not None else settings.MASS_EMAIL_CHUNK_SIZE
+        self.on_chunk_sent = on_chunk_sent
+        self.on_send_failed = on_send_failed
+        self.number_of_delivered_emails = 0
 
-        self.context: dict[str, Any] = {} if context is None else context
+        self.context: dict[str, Any] = {} if context is None else dict(context)
 
-        self.setup_user_for_mass_emails()
+        self.setup_email_content()
         self.send_mass_emails_to_users()
 
     def send_mass_emails_to_users(self):
-        number_of_delivered_emails = send_mass_html_mail(self.email_messages_for_users, fail_silently=False)
-        return f"Number of delivered emails {number_of_delivered_emails}"
+        if settings.NOTIFICATION_TRANSPORT == "async":
+            sender = AsyncSMTPSender(fail_silently=self.on_send_failed is not None)
+            for users_chunk in self.iter_user_chunks():
+                send_mass_html_mail_async(self.setup_user_for_mass_emails(users_chunk), sender=sender)
+                failed_usernames = self.report_failures(users_chunk, sender.pop_failures())
+                self.chunk_sent([user for user in users_chunk if user.username not in failed_usernames])
+        else:
+            # the pool's connections stay open from one chunk to the next
+            with SMTPConnectionPool(fail_silently=self.on_send_failed is not None) as pool:
+                for users_chunk in self.iter_user_chunks():
+                    send_mass_html_mail(self.setup_user_for_mass_emails(users_chunk), pool=pool)
+                    failed_usernames = self.report_failures(users_chunk, pool.pop_failures())
+                    self.chunk_sent([user for user in users_chunk if user.username not in failed_usernames])
+        return f"Number of delivered emails {self.number_of_delivered_emails}"
 
-    def setup_user_for_mass_emails(self):
-        assert self.email_content_object is not None, "Email content object is required"
-        file = import_module(self.email_content_object).MyMessages
+    def report_failures(self, users_chunk: list[User], failures: list[tuple[EmailMultiAlternatives, Exception]]):
+        """
+        Hands the users of the failed emails to `on_send_failed`, grouped by error, and returns their usernames.
+        """
+        users_by_username = {user.username: user for user in users_chunk}
+        failed_users_by_error: dict[str, list[User]] = {}
+        for email_message, error in failures:
+            failed_users_by_error.setdefault(repr(error), []).extend(
+                users_by_username[recipient] for recipient in email_message.recipients()
+            )
+        for error, failed_users in failed_users_by_error.items():
+            self.on_send_failed(failed_users, error)  # type: ignore
+        return {user.username for failed_users in failed_users_by_error.values() for user in failed_users}
 
-        self.email_subject = str(file.EMAIL_SUBJECT) if file.EMAIL_SUBJECT else "New Message"
-        self.email_from = (
-            str(file.FROM_ADDRESS)
-            if getattr(file, "FROM_ADDRESS", None)
-            else "Zedasignal Notifier <noreply@zedasignal.com>"
-        )
+    def chunk_sent(self, users_chunk: list[User]):
+        self.number_of_delivered_emails += len(users_chunk)
+        if self.on_chunk_sent is not None:
+            self.on_chunk_sent(users_chunk)
 
-        self.email_message = None if not hasattr(file, "EMAIL_MESSAGE") else file.EMAIL_MESSAGE
+    def iter_user_chunks(self) -> Iterator[list[User]]:
+        users = self.users.iterator(chunk_size=self.chunk_size) if isinstance(self.users, QuerySet) else self.users
+        return chunked(users, self.chunk_size)
 
-        self.template_name = self.html_template if self.html_template else "email/base.html"
+    def setup_email_content(self):
+        assert self.email_content_object is not None, "Email content object is required"
+        message = notification_catalog.get(self.email_content_object)
 
-        subject = self.email_subject
-        context = (
-            self.context
-            if self.context
-            else {
-                "subject": subject,
-                "body": self.email_message,
-            }
+        self.email_subject = message.subject
+        self.email_from = message.from_address
+        self.email_message = message.message
+        self.template = (
+            notification_catalog.get_template(self.html_template) if self.html_template else message.template
         )
-        if not self.include_user_in_context:
-            email_content_object = render_to_string(self.template_name, context=context)
-            for user in self.users:
-                email_message = EmailMultiAlternatives(
-                    subject,
-                    email_content_object,
-                    self.email_from,
-                    [user.username],
-                )
-                email_message.content_subtype = "html"
-                self.email_messages_for_users.append(email_message)
+
+        if not self.context:
+            self.context = message.default_context
+        # the signal-invariant body is rendered once and reused for every chunk
+        if self.include_user_in_context:
+            self.personalised_template = PersonalisedTemplate(self.template, self.context)
         else:
-            for user in self.users:
-                context["user"] = user
-                email_content_object = render_to_string(self.template_name, context=context)
-                email_message = EmailMultiAlternatives(
-                    subject,
-                    email_content_object,
-                    self.email_from,
-                    [user.username],
-                )
-                email_message.content_subtype = "html"
-                self.email_messages_for_users.append(email_message)
+            self.broadcast_message = BroadcastEmailMessage(
+                self.email_subject, self.template.render(self.context), self.email_from
+            )
+
+    def setup_user_for_mass_emails(self, users: list[User]) -> list[EmailMultiAlternatives]:
+        if not self.include_user_in_context:
+            # everyone gets the same payload, only the envelope recipients differ
+            return [
+                self.broadcast_message.for_recipients([user.username for user in batch])
+                for batch in chunked(users, settings.EMAIL_BROADCAST_BATCH_SIZE)
+            ]
+
+        email_messages_for_users = []
+        for user in users:
+            email_message = EmailMultiAlternatives(
+                self.email_subject,
+                self.personalised_template.render(user),
+                self.email_from,
+                [user.username],
+            )
+            email_message.content_subtype = "html"
+            email_messages_for_users.append(email_message)
+        return email_messages_for_users
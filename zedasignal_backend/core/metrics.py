@@ -0,0 +1,46 @@
+import logging
+
+from django.core.cache import cache
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+def get_counter_key(name: str, **labels: str) -> str:
+    return ":".join(["metrics", name, *(f"{label}={value}" for label, value in sorted(labels.items()))])
+
+
+def increment_counter(name: str, value: int = 1, **labels: str):
+    """
+    Adds `value` to a counter kept in the default cache, so every gunicorn and celery worker counts into
+    the same series. A counter that was evicted starts again from zero, which Prometheus reads as a reset.
+    Counting never fails the caller: when the cache can't be reached, the increment is dropped.
+
+    Args:
+        name (str): The metric name, e.g. "signal_deliveries_total".
+        value (int, optional): The amount to add. Defaults to 1.
+        **labels (str): The labels of the series, e.g. channel="email".
+    """
+    if value <= 0:
+        return
+    key = get_counter_key(name, **labels)
+    try:
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key, value)
+        except ValueError:
+            # the counter was evicted between add and incr
+            cache.add(key, value, timeout=None)
+    except RedisError:
+        logger.warning("Can't reach the cache to count %s", name)
+
+
+def get_counter(name: str, **labels: str) -> int:
+    """
+    Returns the value of a counter, or 0 when nothing was counted yet.
+
+    Args:
+        name (str): The metric name.
+        **labels (str): The labels of the series.
+    """
+    return cache.get(get_counter_key(name, **labels), 0)
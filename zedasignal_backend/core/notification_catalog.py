@@ -0,0 +1,108 @@
+import pkgutil
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Any
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
+
+MESSAGES_PACKAGE = "zedasignal_backend.notification.messages"
+DEFAULT_EMAIL_SUBJECT = "New Message"
+DEFAULT_FROM_ADDRESS = "Zedasignal Notifier <noreply@zedasignal.com>"
+DEFAULT_HTML_TEMPLATE = "emails/base.html"
+
+
+@dataclass(frozen=True)
+class NotificationMessage:
+    """
+    The resolved content of a `notification/messages/*` module, with its html template compiled.
+    """
+
+    name: str
+    subject: str
+    from_address: str
+    message: str | None
+    template: Any
+
+    @property
+    def default_context(self) -> dict[str, Any]:
+        return {"subject": self.subject, "body": self.message}
+
+
+class NotificationCatalog:
+    """
+    Every notification message the app can send, built once when the app starts.
+
+    Loading a message used to import its module and look its template up for every email sent. The
+    catalog imports each `notification/messages/*` module and compiles its `HTML_TEMPLATE` once, so
+    sending is reduced to a dict lookup, and a missing module or broken template is reported by
+    `manage.py check` at deploy time instead of by the first send.
+
+    Usage:
+        notification_catalog.get("notification.messages.signals").template.render(context)
+    """
+
+    def __init__(self, package: str = MESSAGES_PACKAGE):
+        self.package = package
+        self.messages: dict[str, NotificationMessage] = {}
+        self.templates: dict[str, Any] = {}
+        self.errors: list[str] = []
+        self.loaded = False
+
+    def load(self):
+        """
+        Imports every message module of the package and compiles its template. Problems are collected in
+        `errors` rather than raised, so a broken message doesn't stop the app from starting.
+        """
+        messages, errors = {}, []
+        package_path = import_module(self.package).__path__
+        for module_info in pkgutil.iter_modules(package_path):
+            name = f"{self.package}.{module_info.name}"
+            try:
+                messages[self.normalise_name(name)] = self.build_message(name)
+            except (ImportError, AttributeError, TemplateDoesNotExist, TemplateSyntaxError) as error:
+                errors.append(f"{name}: {error!r}")
+        self.messages, self.errors, self.loaded = messages, errors, True
+
+    def build_message(self, name: str) -> NotificationMessage:
+        file = import_module(name).MyMessages
+        return NotificationMessage(
+            name=name,
+            subject=str(file.EMAIL_SUBJECT) if file.EMAIL_SUBJECT else DEFAULT_EMAIL_SUBJECT,
+            from_address=str(file.FROM_ADDRESS) if getattr(file, "FROM_ADDRESS", None) else DEFAULT_FROM_ADDRESS,
+            message=getattr(file, "EMAIL_MESSAGE", None),
+            template=self.get_template(getattr(file, "HTML_TEMPLATE", None) or DEFAULT_HTML_TEMPLATE),
+        )
+
+    def normalise_name(self, name: str) -> str:
+        # callers refer to messages both from the project root and from the apps directory
+        return name.removeprefix("zedasignal_backend.")
+
+    def get(self, name: str) -> NotificationMessage:
+        """
+        Returns the message of a `notification.messages.*` module.
+
+        Args:
+            name (str): The dotted path of the message module, e.g. "notification.messages.signals".
+        """
+        if not self.loaded:
+            self.load()
+        try:
+            return self.messages[self.normalise_name(name)]
+        except KeyError:
+            raise LookupError(f"{name} is not a notification message in {self.package}") from None
+
+    def get_template(self, template_name: str):
+        """
+        Returns the compiled template, compiling it on first use.
+
+        Args:
+            template_name (str): The name of the template, e.g. "emails/base.html".
+        """
+        template = self.templates.get(template_name)
+        if template is None:
+            template = self.templates[template_name] = get_template(template_name)
+        return template
+
+
+notification_catalog = NotificationCatalog()
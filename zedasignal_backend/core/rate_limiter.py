@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Refills the bucket for the time elapsed since the last call, then reserves the requested tokens.
+# The balance may go negative: the caller is told how long to wait for its reservation to be covered,
+# so concurrent callers queue up behind each other instead of retrying. Reading TIME before writing
+# requires Redis 5 or later.
+RESERVE_TOKENS_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "timestamp")
+local tokens = tonumber(bucket[1]) or capacity
+local timestamp = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - timestamp) * rate) - requested
+redis.call("HSET", KEYS[1], "tokens", tokens, "timestamp", now)
+redis.call("EXPIRE", KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+return tostring(math.max(0, -tokens) / rate)
+"""
+
+
+class TokenBucket:
+    """
+    A token bucket shared by every process that talks to the same provider.
+
+    The bucket refills at `rate` tokens per second up to `capacity` tokens, so a provider receives short
+    bursts of at most `capacity` messages and otherwise a steady `rate` messages per second. The bucket is
+    kept in the default cache's Redis so the limit holds across all celery workers. When the cache isn't
+    backed by Redis, or Redis can't be reached, each process falls back to its own in-memory bucket.
+
+    Usage:
+        get_rate_limiter("termii").acquire()
+    """
+
+    local_buckets: dict[str, tuple[float, float]] = {}
+    local_lock = threading.Lock()
+
+    def __init__(self, name: str, rate: float, capacity: int):
+        self.name = name
+        self.key = f"rate-limiter:{name}"
+        self.rate = rate
+        self.capacity = capacity
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Reserves `tokens` tokens and returns the number of seconds to wait before using them.
+        """
+        try:
+            redis = get_redis_connection("default")
+        except NotImplementedError:
+            return self.reserve_locally(tokens)
+
+        try:
+            return float(redis.eval(RESERVE_TOKENS_SCRIPT, 1, self.key, self.rate, self.capacity, tokens))
+        except RedisError:
+            logger.warning("Rate limiter %s can't reach redis, falling back to a local bucket", self.name)
+            return self.reserve_locally(tokens)
+
+    def reserve_locally(self, tokens: int) -> float:
+        with self.local_lock:
+            now = time.monotonic()
+            available, timestamp = self.local_buckets.get(self.name, (self.capacity, now))
+            available = min(self.capacity, available + (now - timestamp) * self.rate) - tokens
+            self.local_buckets[self.name] = (available, now)
+        return max(0.0, -available) / self.rate
+
+    def acquire(self, tokens: int = 1):
+        """
+        Blocks until `tokens` tokens are available.
+        """
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 1):
+        """
+        Waits, without blocking the event loop, until `tokens` tokens are available. The reservation is a
+        blocking redis call, so it runs in a worker thread.
+        """
+        wait = await asyncio.to_thread(self.reserve, tokens)
+        if wait:
+            await asyncio.sleep(wait)
+
+
+def get_rate_limiter(provider: str) -> TokenBucket | None:
+    """
+    Returns the token bucket of a provider configured in `NOTIFICATION_RATE_LIMITS`,
+    or None when the provider isn't rate limited.
+
+    Args:
+        provider (str): The provider name, e.g. "termii" or "email".
+    """
+    rate, capacity = settings.NOTIFICATION_RATE_LIMITS.get(provider, (0, 0))
+    if not rate:
+        return None
+    return TokenBucket(provider, rate, capacity or 1)
+
+
+def throttle(provider: str, tokens: int = 1):
+    """
+    Blocks until the provider's rate limit allows `tokens` more messages. Does nothing for providers
+    that aren't rate limited.
+
+    Args:
+        provider (str): The provider name, e.g. "termii" or "email".
+        tokens (int, optional): The number of messages about to be sent. Defaults to 1.
+    """
+    rate_limiter = get_rate_limiter(provider)
+    if rate_limiter is not None:
+        rate_limiter.acquire(tokens)
+
+
+async def throttle_async(provider: str, tokens: int = 1):
+    """
+    The asyncio counterpart of `throttle`.
+    """
+    rate_limiter = get_rate_limiter(provider)
+    if rate_limiter is not None:
+        await rate_limiter.acquire_async(tokens)
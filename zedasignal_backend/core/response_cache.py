@@ -0,0 +1,40 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import models
+
+
+def get_version_key(model: type[models.Model]) -> str:
+    return f"response-cache-version:{model._meta.label_lower}"
+
+
+def get_model_versions(*models_: type[models.Model]) -> list[str]:
+    """
+    Returns the current cache version of each model, in one round trip to the cache.
+
+    A model without a version yet, or whose version was evicted, gets a new one rather than starting
+    over from a fixed value, so responses cached under an older version are never served again.
+    """
+    keys = [get_version_key(model) for model in models_]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, str(time.time_ns()), timeout=None)
+            versions[key] = cache.get(key)
+    return [str(versions[key]) for key in keys]
+
+
+def bump_model_version(model: type[models.Model]):
+    """
+    Invalidates every response cached from the rows of `model`, on every node sharing the cache.
+
+    Args:
+        model (type[Model]): The model whose rows changed.
+    """
+    cache.set(get_version_key(model), str(time.time_ns()), timeout=None)
+
+
+def get_response_cache_key(view_name: str, versions: list[str], url: str) -> str:
+    url_hash = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+    return f"response-cache:{view_name}:{'.'.join(versions)}:{url_hash}"
@@ -1,13 +1,58 @@
-from importlib import import_module
+from functools import partial
+from typing import Any
 
+from django.apps import apps
 from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.db import models, transaction
 
 from zedasignal_backend.apps.users.types import UserType
+from zedasignal_backend.core.circuit_breaker import circuit_breaker
+from zedasignal_backend.core.notification_catalog import notification_catalog
 from zedasignal_backend.core.termii.termii import Termii
+from zedasignal_backend.core.utils.dict_to_object import DictToObject
+from zedasignal_backend.core.utils.smtp_pool import is_transient_smtp_error
+
+MODEL_REFERENCE_KEY = "__model__"
+
+
+def serialize_notification_value(value: Any) -> Any:
+    """
+    Makes a notification recipient or context value JSON serialisable. Model instances are replaced
+    by a reference to their row, which is loaded again when the notification is sent.
+    """
+    if isinstance(value, models.Model):
+        return {MODEL_REFERENCE_KEY: value._meta.label, "pk": value.pk}
+    if isinstance(value, DictToObject):
+        return serialize_notification_value(vars(value))
+    if isinstance(value, dict):
+        return {key: serialize_notification_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [serialize_notification_value(item) for item in value]
+    return value
+
+
+def deserialize_notification_value(value: Any) -> Any:
+    """
+    Reverses `serialize_notification_value`.
+    """
+    if isinstance(value, dict) and MODEL_REFERENCE_KEY in value:
+        return apps.get_model(value[MODEL_REFERENCE_KEY])._default_manager.get(pk=value["pk"])
+    if isinstance(value, dict):
+        return {key: deserialize_notification_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [deserialize_notification_value(item) for item in value]
+    return value
 
 
 class Sender:
+    """
+    Sends a notification to a user by email, sms or push.
+
+    By default the notification is sent from the constructor. With `queued=True` the recipient, template
+    and context are serialised into the `send_queued_notification` celery task instead, which sends it
+    from a worker and retries transient provider failures, so the caller never waits on the provider.
+    """
+
     def __init__(
         self,
         user_account,
@@ -25,6 +70,7 @@ class Sender:
         text=None,
         data=None,
         title=None,
+        queued=False,
         **kwargs,
     ):
         self.user_account: UserType = user_account
@@ -42,38 +88,56 @@ class Sender:
         self.data = data
         self.title = title
 
-        self.send()
+        if queued:
+            self.enqueue()
+        else:
+            self.send()
+
+    def enqueue(self):
+        """
+        Hands the notification over to a celery worker, once the current transaction commits so the
+        worker can load the rows the context refers to.
+        """
+        from zedasignal_backend.apps.notifications.tasks import send_queued_notification
+
+        recipient = self.user_account
+        if not isinstance(recipient, (models.Model, DictToObject)):
+            recipient = DictToObject(
+                {
+                    "email": getattr(recipient, "email", None),
+                    "phone_number": getattr(recipient, "phone_number", None),
+                }
+            )
+        send = partial(
+            send_queued_notification.delay,
+            serialize_notification_value(recipient),
+            email_content_object=self.email_content_object,
+            html_template=self.html_template,
+            context=serialize_notification_value(self.context),
+            email_notif=self.email_notif,
+            sms_notif=self.sms_notif,
+            sms_message=self.sms_message,
+        )
+        transaction.on_commit(send)
+        return "Notification queued"
 
     def email(self):
         """
         Sends an email to the affected party and
         """
 
-        # dynamic file import module and object construction
         assert self.email_content_object is not None, "Email content object is required"
-        file = import_module(self.email_content_object).MyMessages
-
-        self.email_subject = str(file.EMAIL_SUBJECT) if file.EMAIL_SUBJECT else "New Message"
-        self.email_from = (
-            str(file.FROM_ADDRESS)
-            if getattr(file, "FROM_ADDRESS", None)
-            else "Zedasignal Notifier <noreply@zedasignal.com>"
-        )
+        message = notification_catalog.get(self.email_content_object)
 
-        self.email_message = None if not hasattr(file, "EMAIL_MESSAGE") else file.EMAIL_MESSAGE
+        self.email_subject = message.subject
+        self.email_from = message.from_address
+        self.email_message = message.message
 
-        self.template_name = self.html_template if self.html_template else "email/base.html"
+        template = notification_catalog.get_template(self.html_template) if self.html_template else message.template
 
         subject = self.email_subject
-        context = (
-            self.context
-            if self.context
-            else {
-                "subject": subject,
-                "body": self.email_message,
-            }
-        )
-        email_content_object = render_to_string(self.template_name, context=context)
+        context = self.context if self.context else message.default_context
+        email_content_object = template.render(context)
         msg = EmailMultiAlternatives(
             subject,
             email_content_object,
@@ -81,7 +145,8 @@ class Sender:
             [self.user_account.email],
         )
         msg.content_subtype = "html"
-        msg.send(fail_silently=False)
+        with circuit_breaker("email", is_transient_smtp_error):
+            msg.send(fail_silently=False)
 
         return "Mail sent"
 
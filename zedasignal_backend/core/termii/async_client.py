@@ -0,0 +1,105 @@
+import asyncio
+from functools import partial
+
+import httpx
+from django.conf import settings
+
+from zedasignal_backend.core.circuit_breaker import CircuitOpenError, guarded_by_circuit_breaker
+from zedasignal_backend.core.rate_limiter import throttle_async
+from zedasignal_backend.core.termii.bulk_sms_client import BulkSmsBatchResult, BulkSmsResult
+from zedasignal_backend.core.termii.utils import clean_phone_numbers, is_transient_termii_error, remove_plus_prefix
+from zedasignal_backend.core.utils.main import chunked
+from zedasignal_backend.core.utils.retry import retry_transient_async
+
+
+class AsyncTermiiClient:
+    """
+    An asyncio client for termii sms services.
+
+    A single event loop can keep up to `TERMII_ASYNC_MAX_IN_FLIGHT` requests in flight over one pool of
+    keep-alive connections, which lets one worker process send to thousands of recipients concurrently.
+    Use it as an async context manager so the connection pool is closed when the send is over:
+
+        async with AsyncTermiiClient() as client:
+            await client.send_bulk_sms(to=numbers, message=message)
+    """
+
+    def __init__(self) -> None:
+        self.api_key = settings.TERMII_API_KEY
+        self.from_sender = settings.TERMII_SENDER_ID
+        self.channel = "dnd"
+        self.type = "plain"
+        self.sms_url = f"{settings.TERMII_BASE_URL}/api/sms/send"
+        self.bulk_sms_url = f"{settings.TERMII_BASE_URL}/api/sms/send/bulk"
+        self.batch_size = settings.TERMII_BULK_BATCH_SIZE
+        self.max_in_flight = settings.TERMII_ASYNC_MAX_IN_FLIGHT
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight),
+            timeout=httpx.Timeout(settings.TERMII_HTTP_READ_TIMEOUT, connect=settings.TERMII_HTTP_CONNECT_TIMEOUT),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+
+    @guarded_by_circuit_breaker("termii", is_transient_termii_error)
+    async def post(self, url: str, payload: dict) -> dict:
+        await throttle_async("termii")
+        async with self.semaphore:
+            response = await self.client.post(url, json=payload)
+        if not 200 <= response.status_code < 400:
+            raise httpx.HTTPStatusError(
+                f"Termii SMS Sender failed with error code: {response.status_code}",
+                request=response.request,
+                response=response,
+            )
+        return response.json()
+
+    def build_payload(self, to: str | list[str], message: str) -> dict:
+        return {
+            "to": to,
+            "from": self.from_sender,
+            "sms": message,
+            "channel": self.channel,
+            "type": self.type,
+            "api_key": self.api_key,
+        }
+
+    async def send_sms(self, to: str, message: str) -> dict:
+        return await self.post(self.sms_url, self.build_payload(remove_plus_prefix(to), message))
+
+    async def send_many_sms(self, to: list[str], message: str) -> list[dict | BaseException]:
+        """
+        Sends one sms per recipient, concurrently. Failures are returned in place of the response.
+        """
+        return await asyncio.gather(*(self.send_sms(number, message) for number in to), return_exceptions=True)
+
+    async def send_batch(self, to: list[str], message: str) -> BulkSmsBatchResult:
+        payload = self.build_payload(to, message)
+        try:
+            response = await retry_transient_async(
+                partial(self.post, self.bulk_sms_url, payload), is_transient_termii_error
+            )
+            return BulkSmsBatchResult(recipients=to, response=response)
+        except (httpx.HTTPError, CircuitOpenError) as error:
+            return BulkSmsBatchResult(recipients=to, error=str(error))
+
+    async def send_bulk_sms(self, to: list[str], message: str) -> BulkSmsResult:
+        batches = chunked(clean_phone_numbers(to), self.batch_size)
+        results = await asyncio.gather(*(self.send_batch(batch, message) for batch in batches))
+        return BulkSmsResult(batches=list(results))
+
+
+def send_bulk_sms_async(to: list[str], message: str) -> BulkSmsResult:
+    """
+    Blocking entrypoint to `AsyncTermiiClient.send_bulk_sms` for synchronous callers such as celery tasks.
+    """
+
+    async def send() -> BulkSmsResult:
+        async with AsyncTermiiClient() as client:
+            return await client.send_bulk_sms(to=to, message=message)
+
+    return asyncio.run(send())
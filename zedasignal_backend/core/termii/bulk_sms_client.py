@@ -1,14 +1,69 @@
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+
 from django.conf import settings
-from requests import Response
+from requests import RequestException, Response
+from rest_framework.exceptions import ValidationError
+
+from zedasignal_backend.core.circuit_breaker import CircuitOpenError, guarded_by_circuit_breaker
+from zedasignal_backend.core.rate_limiter import throttle
+from zedasignal_backend.core.termii.session import get_http_session, get_http_timeout
+from zedasignal_backend.core.termii.utils import (
+    clean_phone_numbers,
+    is_transient_termii_error,
+    validate_termii_response,
+)
+from zedasignal_backend.core.utils.main import chunked
+from zedasignal_backend.core.utils.retry import retry_transient
+
+
+@dataclass
+class BulkSmsBatchResult:
+    """
+    The outcome of sending one batch of recipients to Termii.
+    """
 
-from zedasignal_backend.core.termii.utils import clean_phone_numbers, validate_termii_response
+    recipients: list[str]
+    response: dict | None = None
+    error: str | None = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkSmsResult:
+    """
+    The aggregated outcome of a bulk send, one entry per batch.
+    """
+
+    batches: list[BulkSmsBatchResult] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> bool:
+        return all(batch.succeeded for batch in self.batches)
+
+    @property
+    def delivered_recipients(self) -> list[str]:
+        return [recipient for batch in self.batches if batch.succeeded for recipient in batch.recipients]
+
+    @property
+    def failed_batches(self) -> list[BulkSmsBatchResult]:
+        return [batch for batch in self.batches if not batch.succeeded]
 
 
 class TermiiBulkSmsClient:
     """
     A client for termii sms services that sends sms to multiple recipients.
     Ensure recipients numbers don't begin with a + sign
+
+    Recipients are split into batches of `TERMII_BULK_BATCH_SIZE` numbers which are sent concurrently
+    by at most `TERMII_BULK_MAX_WORKERS` threads, at the pace allowed by the termii rate limit. A batch
+    that fails with a transient error is retried with a jittered exponential backoff; a batch that still
+    fails, or that isn't sent because the termii circuit is open, is reported in the result instead of
+    aborting the batches that are still in flight.
     """
 
     def __init__(self) -> None:
@@ -18,16 +73,41 @@ class TermiiBulkSmsClient:
         self.type = "plain"
         self.sms_url = f"{settings.TERMII_BASE_URL}/api/sms/send/bulk"
         self.headers = {"Content-Type": "application/json"}
+        self.batch_size = settings.TERMII_BULK_BATCH_SIZE
+        self.max_workers = settings.TERMII_BULK_MAX_WORKERS
 
+    @guarded_by_circuit_breaker("termii", is_transient_termii_error)
     @validate_termii_response
-    def post(self, to: list[str], message: str, *args, **kwargs) -> Response:
-        cleaned_numbers = clean_phone_numbers(to)
+    def post_batch(self, to: list[str], message: str) -> Response:
         payload = {
-            "to": cleaned_numbers,
+            "to": to,
             "from": self.from_sender,
             "sms": message,
             "channel": self.channel,
             "type": self.type,
             "api_key": self.api_key,  # Include the API key in the query parameters
         }
-        return requests.post(url=self.sms_url, json=payload, headers=self.headers)
+        throttle("termii")
+        return get_http_session().post(
+            url=self.sms_url,
+            json=payload,
+            headers=self.headers,
+            timeout=get_http_timeout(),
+        )
+
+    def send_batch(self, to: list[str], message: str) -> BulkSmsBatchResult:
+        try:
+            response = retry_transient(partial(self.post_batch, to, message), is_transient_termii_error)
+            return BulkSmsBatchResult(recipients=to, response=response)
+        except (ValidationError, RequestException, CircuitOpenError) as error:
+            return BulkSmsBatchResult(recipients=to, error=str(error))
+
+    def post(self, to: list[str], message: str, *args, **kwargs) -> BulkSmsResult:
+        cleaned_numbers = clean_phone_numbers(to)
+        batches = list(chunked(cleaned_numbers, self.batch_size))
+        if not batches:
+            return BulkSmsResult()
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            results = executor.map(lambda batch: self.send_batch(batch, message), batches)
+            return BulkSmsResult(batches=list(results))
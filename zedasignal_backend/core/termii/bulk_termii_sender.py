@@ -1,8 +1,10 @@
+from functools import cached_property
+
 from zedasignal_backend.core.termii.bulk_sms_client import TermiiBulkSmsClient
 
 
 class TermiiBulkSmsSender:
-    @property
+    @cached_property
     def bulk_client(self):
         return TermiiBulkSmsClient()
 
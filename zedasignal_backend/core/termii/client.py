@@ -1,8 +1,14 @@
-import requests
 from django.conf import settings
 from requests import Response
 
-from zedasignal_backend.core.termii.utils import remove_plus_prefix, validate_termii_response
+from zedasignal_backend.core.circuit_breaker import guarded_by_circuit_breaker
+from zedasignal_backend.core.rate_limiter import throttle
+from zedasignal_backend.core.termii.session import get_http_session, get_http_timeout
+from zedasignal_backend.core.termii.utils import (
+    is_transient_termii_error,
+    remove_plus_prefix,
+    validate_termii_response,
+)
 
 
 class TermiiClient:
@@ -18,6 +24,7 @@ class TermiiClient:
         self.sms_url = f"{settings.TERMII_BASE_URL}/api/sms/send"
         self.headers = {"Content-Type": "application/json"}
 
+    @guarded_by_circuit_breaker("termii", is_transient_termii_error)
     @validate_termii_response
     def post(self, to: str, message: str, *args, **kwargs) -> Response:
         params = {
@@ -28,4 +35,10 @@ class TermiiClient:
             "type": self.type,
             "api_key": self.api_key,  # Include the API key in the query parameters
         }
-        return requests.post(url=self.sms_url, params=params, headers=self.headers)
+        throttle("termii")
+        return get_http_session().post(
+            url=self.sms_url,
+            params=params,
+            headers=self.headers,
+            timeout=get_http_timeout(),
+        )
@@ -0,0 +1,53 @@
+import os
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+_session: requests.Session | None = None
+_session_pid: int | None = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the process-wide pooled session shared by the SMS clients.
+
+    Connections to the SMS providers are kept alive and reused across requests, so only the first
+    request to a host pays for the TCP and TLS handshakes. The session is rebuilt after a fork so
+    that celery worker processes never share sockets with their parent.
+    """
+    global _session, _session_pid
+
+    if _session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=settings.TERMII_HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=settings.TERMII_HTTP_POOL_SIZE,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session, _session_pid = session, os.getpid()
+    return _session
+
+
+def get_http_timeout() -> tuple[float, float]:
+    """
+    Returns the (connect, read) timeout used for every request made with the pooled session.
+    """
+    return settings.TERMII_HTTP_CONNECT_TIMEOUT, settings.TERMII_HTTP_READ_TIMEOUT
+
+
+def close_http_session():
+    """
+    Closes the pooled session and its connections. The next call to `get_http_session` opens a new one.
+    """
+    global _session, _session_pid
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session, _session_pid = None, None
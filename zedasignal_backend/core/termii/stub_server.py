@@ -0,0 +1,92 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    # Concurrent clients open many connections at once, the default backlog of 5 would drop them
+    request_queue_size = 1024
+
+
+class StubTermiiServer:
+    """
+    A local stand-in for the Termii SMS API, used by tests and benchmarks.
+
+    It accepts the single and bulk send endpoints over keep-alive HTTP/1.1, records every request
+    it receives and answers like Termii does. Set `status_code` to simulate provider failures, or queue
+    codes in `status_codes` to answer only the next requests with them, e.g. a brief outage.
+
+    Usage:
+        with StubTermiiServer() as server:
+            settings.TERMII_BASE_URL = server.base_url
+    """
+
+    def __init__(self, status_code: int = 200):
+        self.status_code = status_code
+        self.status_codes: list[int] = []
+        self.requests: list[dict] = []
+        self.lock = threading.Lock()
+        self.server = StubHTTPServer(("127.0.0.1", 0), self.build_handler())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def recipients(self) -> list[str]:
+        recipients = []
+        for request in self.requests:
+            to = request["payload"].get("to", [])
+            recipients.extend(to if isinstance(to, list) else [to])
+        return recipients
+
+    def build_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.handle_sms_request()
+
+            def do_POST(self):
+                self.handle_sms_request()
+
+            def handle_sms_request(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                payload = json.loads(body) if body else dict(parse_qsl(url.query))
+                with stub.lock:
+                    stub.requests.append({"path": url.path, "client_port": self.client_address[1], "payload": payload})
+                    status_code = stub.status_codes.pop(0) if stub.status_codes else stub.status_code
+
+                content = json.dumps({"message_id": str(len(stub.requests)), "message": "Successfully Sent"}).encode()
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
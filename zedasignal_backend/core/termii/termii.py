@@ -1,8 +1,10 @@
+from functools import cached_property
+
 from zedasignal_backend.core.termii.client import TermiiClient
 
 
 class Termii:
-    @property
+    @cached_property
     def client(self):
         return TermiiClient()
 
@@ -1,11 +1,38 @@
+import httpx
+from requests import ConnectionError, Timeout
 from rest_framework.exceptions import ValidationError
 
+# Termii answers these when it is overloaded or briefly unavailable, the request may succeed if retried
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class TermiiResponseError(ValidationError):
+    """
+    Raised when Termii rejects a request. `response_status` is the HTTP status Termii answered with.
+    """
+
+    def __init__(self, response_status: int):
+        super().__init__(f"Termii SMS Sender failed with error code: {response_status}")
+        self.response_status = response_status
+
+
+def is_transient_termii_error(error: Exception) -> bool:
+    """
+    Tells whether a failed Termii request is worth retrying: the connection failed or timed out, or
+    Termii answered with a status that means "try again later".
+    """
+    if isinstance(error, TermiiResponseError):
+        return error.response_status in TRANSIENT_STATUS_CODES
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+    return isinstance(error, (ConnectionError, Timeout, httpx.TransportError))
+
 
 def validate_termii_response(func):
     def wrapper(*args, **kwargs):
         response = func(*args, **kwargs)
         if not 200 <= response.status_code < 400:
-            raise ValidationError(f"Termii SMS Sender failed with error code: {response.status_code}")
+            raise TermiiResponseError(response.status_code)
 
         return response.json()
 
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from django.core.mail import EmailMultiAlternatives
+
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory
+from zedasignal_backend.apps.users.models import User
+from zedasignal_backend.apps.users.tests.factories import UserFactory
+from zedasignal_backend.core.mass_email_sender import MassEmailSender
+from zedasignal_backend.core.termii.async_client import AsyncTermiiClient, send_bulk_sms_async
+from zedasignal_backend.core.utils.async_emails import AsyncSMTPSender, send_mass_html_mail_async
+
+
+def test_async_termii_client_sends_bulk_batches_concurrently(settings, termii_server):
+    settings.TERMII_BULK_BATCH_SIZE = 1000
+    recipients = [f"+234803{index:07d}" for index in range(10_000)]
+
+    result = send_bulk_sms_async(to=recipients, message="Signal Alert")
+
+    assert result.succeeded
+    assert len(result.batches) == 10
+    assert {request["path"] for request in termii_server.requests} == {"/api/sms/send/bulk"}
+    assert sorted(termii_server.recipients) == [recipient.lstrip("+") for recipient in recipients]
+
+
+def test_async_termii_client_reports_failures(settings, termii_server):
+    settings.TERMII_BULK_BATCH_SIZE = 2
+    termii_server.status_code = 503
+
+    async def send():
+        async with AsyncTermiiClient() as client:
+            bulk = await client.send_bulk_sms(to=["+2348030000001", "+2348030000002", "+2348030000003"], message="x")
+            single = await client.send_many_sms(to=["+2348030000004"], message="x")
+        return bulk, single
+
+    bulk, single = asyncio.run(send())
+
+    assert not bulk.succeeded
+    assert len(bulk.failed_batches) == 2
+    assert "503" in bulk.failed_batches[0].error
+    assert isinstance(single[0], Exception)
+
+
+def test_async_smtp_sender_spreads_messages_across_connections(settings, smtp_server):
+    messages = [
+        EmailMultiAlternatives("Signal Alert", "body", "alerts@zedasignal.com", [f"user{index}@example.com"])
+        for index in range(20)
+    ]
+
+    assert asyncio.run(AsyncSMTPSender(connections=4).send_messages(messages)) == 20
+    assert sorted(smtp_server.recipients) == sorted(f"user{index}@example.com" for index in range(20))
+    assert len(smtp_server.sessions) == 4
+    assert send_mass_html_mail_async([]) == 0
+
+
+def test_async_smtp_sender_retries_deferred_messages_and_keeps_refused_ones(settings, smtp_server):
+    settings.NOTIFICATION_RETRY_ATTEMPTS = 2
+    smtp_server.refused_recipients = {"user0@example.com"}
+    smtp_server.deferred_recipients = {"user1@example.com": 2}
+    messages = [
+        EmailMultiAlternatives("Signal Alert", "body", "alerts@zedasignal.com", [f"user{index}@example.com"])
+        for index in range(6)
+    ]
+    sender = AsyncSMTPSender(connections=2, fail_silently=True)
+
+    assert send_mass_html_mail_async(messages, sender=sender) == 5
+    (failure,) = sender.pop_failures()
+
+    assert failure[0].recipients() == ["user0@example.com"]
+    assert failure[1].code == 550
+    assert sorted(smtp_server.recipients) == [f"user{index}@example.com" for index in range(1, 6)]
+
+
+@pytest.mark.django_db
+def test_async_mass_email_sender_reports_refused_users_and_carries_on(settings, smtp_server):
+    settings.NOTIFICATION_TRANSPORT = "async"
+    users = UserFactory.create_batch(4)
+    smtp_server.refused_recipients = {users[0].username}
+    failed, sent = [], []
+
+    MassEmailSender(
+        users=User.objects.filter(id__in=[user.id for user in users]).order_by("id"),
+        email_content_object="zedasignal_backend.notification.messages.signals",
+        html_template="emails/trading/signals/notification.html",
+        include_user_in_context=True,
+        context={"signal": SignalFactory(), "domain": "http://localhost:3000"},
+        chunk_size=2,
+        on_chunk_sent=sent.extend,
+        on_send_failed=lambda failed_users, error: failed.append((failed_users, error)),
+    )
+
+    assert [(failed_users, "550" in error) for failed_users, error in failed] == [([users[0]], True)]
+    assert sent == users[1:]
+    assert sorted(smtp_server.recipients) == sorted(user.username for user in users[1:])
+
+
+@pytest.mark.django_db
+def test_mass_email_sender_uses_async_transport(settings, smtp_server):
+    settings.NOTIFICATION_TRANSPORT = "async"
+    users = UserFactory.create_batch(3)
+
+    sender = MassEmailSender(
+        users=User.objects.filter(id__in=[user.id for user in users]),
+        email_content_object="zedasignal_backend.notification.messages.signals",
+        html_template="emails/trading/signals/notification.html",
+        include_user_in_context=True,
+        context={"signal": SignalFactory(), "domain": "http://localhost:3000"},
+    )
+
+    assert sender.number_of_delivered_emails == 3
+    assert sorted(smtp_server.recipients) == sorted(user.username for user in users)
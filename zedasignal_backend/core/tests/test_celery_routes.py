@@ -0,0 +1,30 @@
+import pytest
+
+from config import celery_app
+
+TASKS_BY_QUEUE = {
+    "signals": [
+        "zedasignal_backend.apps.trading.tasks.dispatch_signal_notifications",
+        "zedasignal_backend.apps.trading.tasks.send_signal_to_subscribers_by_email",
+        "zedasignal_backend.apps.trading.tasks.send_signal_to_subscribers_by_sms",
+        "zedasignal_backend.apps.notifications.tasks.relay_outbox_events",
+    ],
+    "transactional": ["zedasignal_backend.apps.notifications.tasks.send_queued_notification"],
+    "maintenance": ["zedasignal_backend.apps.users.tasks.get_users_count", "celery.backend_cleanup"],
+}
+
+
+@pytest.mark.parametrize(
+    "task_name, queue", [(task_name, queue) for queue, names in TASKS_BY_QUEUE.items() for task_name in names]
+)
+def test_tasks_are_routed_to_their_queue(task_name, queue):
+    assert celery_app.amqp.router.route({}, task_name)["queue"].name == queue
+
+
+def test_signal_tasks_are_acknowledged_late_and_store_no_results():
+    for task_name in TASKS_BY_QUEUE["signals"]:
+        task = celery_app.tasks[task_name]
+        assert task.acks_late
+        assert task.ignore_result
+    assert celery_app.tasks[TASKS_BY_QUEUE["transactional"][0]].ignore_result
+    assert not celery_app.tasks[TASKS_BY_QUEUE["transactional"][0]].acks_late
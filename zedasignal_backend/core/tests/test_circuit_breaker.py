@@ -0,0 +1,106 @@
+import time
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+
+from zedasignal_backend.core.circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from zedasignal_backend.core.termii.bulk_termii_sender import TermiiBulkSmsSender
+from zedasignal_backend.core.termii.termii import Termii
+from zedasignal_backend.core.termii.utils import TermiiResponseError
+from zedasignal_backend.core.tests.test_smtp_pool import DroppingEmailBackend, build_messages
+from zedasignal_backend.core.utils.smtp_pool import SMTPConnectionPool
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers(settings):
+    settings.NOTIFICATION_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3
+    settings.NOTIFICATION_CIRCUIT_BREAKER_FAILURE_WINDOW = 60
+    settings.NOTIFICATION_CIRCUIT_BREAKER_RESET_TIMEOUT = 30
+    settings.NOTIFICATION_RETRY_ATTEMPTS = 0
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_termii_circuit_opens_after_repeated_failures_and_fails_fast(termii_server):
+    termii_server.status_code = 503
+    termii = Termii()
+
+    for _ in range(3):
+        with pytest.raises(TermiiResponseError):
+            termii.send_sms(to="+2348030000001", message="x")
+    with pytest.raises(CircuitOpenError):
+        termii.send_sms(to="+2348030000001", message="x")
+    result = TermiiBulkSmsSender().send_bulk_sms(to=["+2348030000002"], message="x")
+
+    assert len(termii_server.requests) == 3
+    assert get_circuit_breaker("termii").state == CircuitBreaker.OPEN
+    assert "circuit is open" in result.failed_batches[0].error
+    assert get_circuit_breaker("email").state == CircuitBreaker.CLOSED
+
+
+def test_rejected_requests_do_not_open_the_circuit(termii_server):
+    termii_server.status_code = 400
+
+    for _ in range(5):
+        with pytest.raises(TermiiResponseError):
+            Termii().send_sms(to="+2348030000001", message="x")
+
+    assert len(termii_server.requests) == 5
+    assert get_circuit_breaker("termii").state == CircuitBreaker.CLOSED
+
+
+def test_half_open_circuit_lets_one_probe_through(settings, termii_server):
+    settings.NOTIFICATION_CIRCUIT_BREAKER_RESET_TIMEOUT = 0
+    breaker = get_circuit_breaker("termii")
+    breaker.open()
+    termii_server.status_codes = [503]
+
+    # the failed probe opens the circuit again
+    with pytest.raises(TermiiResponseError):
+        Termii().send_sms(to="+2348030000001", message="x")
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert cache.get(breaker.opened_at_key) is not None
+
+    Termii().send_sms(to="+2348030000001", message="x")
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert len(termii_server.requests) == 2
+
+
+def test_other_callers_fail_fast_while_a_probe_is_in_flight():
+    breaker = get_circuit_breaker("termii")
+    cache.set(breaker.opened_at_key, time.time() - 60)
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.before_call() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_email_pool_stops_calling_a_failing_server(monkeypatch):
+    monkeypatch.setattr(DroppingEmailBackend, "drop_every", 1)
+    backend = f"{__name__}.DroppingEmailBackend"
+
+    with SMTPConnectionPool(size=1, fail_silently=True, backend=backend) as pool:
+        assert pool.send_messages(build_messages(6)) == 0
+        failures = pool.pop_failures()
+
+    assert [type(error) for _, error in failures].count(CircuitOpenError) == 3
+    assert pool.connections[0].backend.attempts == 3
+    assert get_circuit_breaker("email").state == CircuitBreaker.OPEN
+    assert mail.outbox == []
+
+
+def test_command_reports_and_closes_the_circuits():
+    get_circuit_breaker("email").open()
+    output = StringIO()
+
+    call_command("notification_circuit_breakers", stdout=output)
+    assert "email: open" in output.getvalue()
+    assert "termii: closed, 0/3 failures" in output.getvalue()
+
+    call_command("notification_circuit_breakers", "--close", stdout=output)
+    assert get_circuit_breaker("email").state == CircuitBreaker.CLOSED
@@ -0,0 +1,104 @@
+from email import message_from_bytes
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory
+from zedasignal_backend.apps.users.models import User
+from zedasignal_backend.apps.users.tests.factories import UserFactory
+from zedasignal_backend.core.mass_email_sender import MassEmailSender
+from zedasignal_backend.core.utils import BroadcastEmailMessage
+
+SIGNAL_MESSAGES = "zedasignal_backend.notification.messages.signals"
+SIGNAL_TEMPLATE = "emails/trading/signals/notification.html"
+
+
+@pytest.mark.django_db
+def test_mass_email_sender_sends_personalised_email_to_every_user():
+    users = UserFactory.create_batch(5)
+    signal = SignalFactory()
+
+    sender = MassEmailSender(
+        users=User.objects.filter(id__in=[user.id for user in users]),
+        email_content_object=SIGNAL_MESSAGES,
+        html_template=SIGNAL_TEMPLATE,
+        include_user_in_context=True,
+        context={"signal": signal, "domain": "http://localhost:3000"},
+        chunk_size=2,
+    )
+
+    assert sender.number_of_delivered_emails == 5
+    assert sorted(message.to[0] for message in mail.outbox) == sorted(user.username for user in users)
+    for user in users:
+        (message,) = [message for message in mail.outbox if message.to == [user.username]]
+        assert f"Hello, {user.first_name}." in message.body
+
+
+def test_mass_email_sender_streams_users_in_chunks():
+    pulled_users = 0
+    chunk_sizes_and_pulled_users = []
+
+    def users():
+        nonlocal pulled_users
+        for index in range(10_000):
+            pulled_users += 1
+            yield User(username=f"user{index}@example.com")
+
+    def send_mass_html_mail(messages, **kwargs):
+        recipients = sum(len(message.recipients()) for message in messages)
+        chunk_sizes_and_pulled_users.append((recipients, pulled_users))
+        return len(messages)
+
+    with mock.patch("zedasignal_backend.core.mass_email_sender.send_mass_html_mail", send_mass_html_mail):
+        sender = MassEmailSender(
+            users=users(),
+            email_content_object=SIGNAL_MESSAGES,
+            html_template="emails/base.html",
+            chunk_size=100,
+        )
+
+    assert sender.number_of_delivered_emails == 10_000
+    assert len(chunk_sizes_and_pulled_users) == 100
+    assert chunk_sizes_and_pulled_users[0] == (100, 100)
+    assert all(chunk_size == 100 for chunk_size, _ in chunk_sizes_and_pulled_users)
+
+
+def test_broadcast_message_shares_one_serialised_payload():
+    broadcast = BroadcastEmailMessage("Signal Alert", "<p>New signal</p>", "alerts@zedasignal.com")
+
+    create_message = EmailMultiAlternatives._create_message
+
+    with mock.patch.object(
+        EmailMultiAlternatives, "_create_message", autospec=True, side_effect=create_message
+    ) as build_mime:
+        first = broadcast.for_recipients(["a@example.com", "b@example.com"])
+        second = broadcast.for_recipients(["c@example.com"])
+        payloads = [first.message().as_bytes(), second.message().as_bytes()]
+
+    assert first.recipients() == ["a@example.com", "b@example.com"]
+    assert second.recipients() == ["c@example.com"]
+    assert payloads[0] is payloads[1]
+    assert build_mime.call_count == 1
+    headers = message_from_bytes(first.message().as_bytes())
+    assert headers["To"] == "undisclosed-recipients:;"
+    assert "a@example.com" not in first.message().as_bytes().decode()
+
+
+@pytest.mark.django_db
+def test_non_personalised_email_is_sent_to_batches_of_envelope_recipients(settings, smtp_server):
+    settings.EMAIL_BROADCAST_BATCH_SIZE = 3
+    users = UserFactory.create_batch(7)
+
+    sender = MassEmailSender(
+        users=User.objects.filter(id__in=[user.id for user in users]),
+        email_content_object=SIGNAL_MESSAGES,
+        html_template="emails/base.html",
+        chunk_size=5,
+    )
+
+    assert sender.number_of_delivered_emails == 7
+    assert sorted(smtp_server.recipients) == sorted(user.username for user in users)
+    assert sorted(len(envelope.rcpt_tos) for envelope in smtp_server.envelopes) == [2, 2, 3]
+    assert len({envelope.content for envelope in smtp_server.envelopes}) == 1
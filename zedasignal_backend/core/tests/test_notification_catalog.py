@@ -0,0 +1,81 @@
+from unittest import mock
+
+import pytest
+from django.core.checks import run_checks
+from django.core.mail import EmailMultiAlternatives
+
+from zedasignal_backend.apps.users.tests.factories import UserFactory
+from zedasignal_backend.core.notification_catalog import (
+    DEFAULT_FROM_ADDRESS,
+    NotificationCatalog,
+    notification_catalog,
+)
+from zedasignal_backend.core.sender import Sender
+
+
+def test_catalog_registers_every_message_with_its_compiled_template():
+    catalog = NotificationCatalog()
+    catalog.load()
+
+    assert catalog.errors == []
+    assert "notification.messages.ping_technician" in catalog.messages
+    message = catalog.get("notification.messages.signals")
+    assert catalog.get("zedasignal_backend.notification.messages.signals") is message
+    assert message.subject == "New Signal Notification"
+    assert message.from_address == DEFAULT_FROM_ADDRESS
+    assert message.template.template.name == "emails/trading/signals/notification.html"
+
+    with pytest.raises(LookupError):
+        catalog.get("notification.messages.missing")
+
+
+def test_broken_messages_fail_the_system_checks(tmp_path, monkeypatch):
+    package = tmp_path / "broken_messages"
+    package.mkdir()
+    (package / "welcome.py").write_text('class MyMessages:\n    EMAIL_SUBJECT = "Welcome"\n')
+    (package / "missing_template.py").write_text(
+        'class MyMessages:\n    EMAIL_SUBJECT = "x"\n    HTML_TEMPLATE = "emails/missing.html"\n'
+    )
+    (package / "missing_class.py").write_text("")
+    monkeypatch.syspath_prepend(tmp_path)
+    catalog = NotificationCatalog("broken_messages")
+    catalog.load()
+
+    assert list(catalog.messages) == ["broken_messages.welcome"]
+    assert sorted(error.split(":")[0] for error in catalog.errors) == [
+        "broken_messages.missing_class",
+        "broken_messages.missing_template",
+    ]
+    with mock.patch("zedasignal_backend.apps.notifications.checks.notification_catalog", catalog):
+        errors = [error for error in run_checks() if error.id == "notifications.E001"]
+    assert len(errors) == 2
+
+
+@pytest.mark.django_db
+def test_sending_does_not_import_or_load_templates():
+    user = UserFactory()
+
+    with mock.patch("zedasignal_backend.core.notification_catalog.get_template") as get_template:
+        with mock.patch("zedasignal_backend.core.notification_catalog.import_module") as import_module:
+            Sender(user, email_content_object="notification.messages.registration_success_welcome", email_notif=True)
+
+    get_template.assert_not_called()
+    import_module.assert_not_called()
+    assert notification_catalog.loaded
+
+
+@pytest.mark.django_db
+def test_sender_renders_the_catalog_template(mailoutbox):
+    user = UserFactory()
+
+    Sender(
+        user,
+        email_content_object="notification.messages.registration_success_welcome",
+        email_notif=True,
+        context={"user": user},
+    )
+
+    (email,) = mailoutbox
+    assert isinstance(email, EmailMultiAlternatives)
+    assert email.subject == notification_catalog.get("notification.messages.registration_success_welcome").subject
+    assert email.content_subtype == "html"
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from redis.exceptions import ConnectionError
+
+from zedasignal_backend.core.rate_limiter import TokenBucket, get_rate_limiter
+from zedasignal_backend.core.termii.bulk_termii_sender import TermiiBulkSmsSender
+from zedasignal_backend.core.utils import send_mass_html_mail
+
+
+@pytest.fixture(autouse=True)
+def local_buckets():
+    TokenBucket.local_buckets.clear()
+    yield
+    TokenBucket.local_buckets.clear()
+
+
+def test_local_bucket_allows_a_burst_then_paces_reservations():
+    bucket = TokenBucket("test", rate=10, capacity=2)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0, 0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_bucket_is_shared_through_redis_and_falls_back_when_unreachable():
+    bucket = TokenBucket("termii", rate=10, capacity=2)
+    redis = mock.Mock()
+    redis.eval.return_value = b"0.25"
+
+    with mock.patch("zedasignal_backend.core.rate_limiter.get_redis_connection", return_value=redis):
+        assert bucket.reserve(3) == 0.25
+        assert redis.eval.call_args.args[1:] == (1, "rate-limiter:termii", 10, 2, 3)
+
+        redis.eval.side_effect = ConnectionError
+        assert bucket.reserve() == 0
+
+
+def test_async_acquire_reserves_off_the_event_loop():
+    bucket = TokenBucket("termii", rate=10, capacity=2)
+    reserving_threads = []
+    redis = mock.Mock()
+    redis.eval.side_effect = lambda *args: reserving_threads.append(threading.current_thread()) or b"0"
+
+    async def acquire():
+        await bucket.acquire_async()
+        return threading.current_thread()
+
+    with mock.patch("zedasignal_backend.core.rate_limiter.get_redis_connection", return_value=redis):
+        event_loop_thread = asyncio.run(acquire())
+
+    assert len(reserving_threads) == 1
+    assert reserving_threads[0] is not event_loop_thread
+
+
+def test_rate_limiter_is_disabled_without_a_rate(settings):
+    settings.NOTIFICATION_RATE_LIMITS = {"termii": (0, 10)}
+
+    assert get_rate_limiter("termii") is None
+    assert get_rate_limiter("email") is None
+
+
+def test_emails_are_sent_at_the_configured_rate(settings):
+    settings.NOTIFICATION_RATE_LIMITS = {"email": (100, 5)}
+    messages = [EmailMultiAlternatives("Signal", "body", "alerts@zedasignal.com", [f"{i}@x.com"]) for i in range(15)]
+
+    started_at = time.perf_counter()
+    assert send_mass_html_mail(messages) == 15
+    elapsed = time.perf_counter() - started_at
+
+    assert len(mail.outbox) == 15
+    assert elapsed >= 0.09
+
+
+def test_termii_batches_are_sent_at_the_configured_rate(settings, termii_server):
+    settings.NOTIFICATION_RATE_LIMITS = {"termii": (50, 1)}
+    settings.TERMII_BULK_BATCH_SIZE = 1
+
+    started_at = time.perf_counter()
+    result = TermiiBulkSmsSender().send_bulk_sms(to=[f"+23480300000{i:02d}" for i in range(6)], message="x")
+    elapsed = time.perf_counter() - started_at
+
+    assert result.succeeded
+    assert len(termii_server.requests) == 6
+    assert elapsed >= 0.09
@@ -0,0 +1,76 @@
+from smtplib import SMTPServerDisconnected
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+
+from zedasignal_backend.apps.notifications.tasks import send_queued_notification
+from zedasignal_backend.apps.trading.tests.factories import SubscriptionFactory
+from zedasignal_backend.core.sender import Sender
+from zedasignal_backend.core.utils.dict_to_object import DictToObject
+
+pytestmark = pytest.mark.django_db
+
+ACTIVATION_EMAIL = {
+    "email_content_object": "zedasignal_backend.notification.messages.subscription_activation",
+    "html_template": "emails/trading/subscription/activation-notification.html",
+    "email_notif": True,
+}
+
+
+def test_queued_sender_serialises_models_as_references_after_commit(django_capture_on_commit_callbacks):
+    subscription = SubscriptionFactory()
+
+    with mock.patch.object(send_queued_notification, "delay") as delay:
+        with django_capture_on_commit_callbacks() as callbacks:
+            Sender(
+                subscription.user,
+                context={"subscription": subscription, "domain": "x"},
+                queued=True,
+                **ACTIVATION_EMAIL,
+            )
+        delay.assert_not_called()
+        for callback in callbacks:
+            callback()
+
+    (recipient,), kwargs = delay.call_args
+    assert recipient == {"__model__": "users.User", "pk": subscription.user.pk}
+    assert kwargs["context"] == {
+        "subscription": {"__model__": "trading.Subscription", "pk": subscription.pk},
+        "domain": "x",
+    }
+    assert mail.outbox == []
+
+
+def test_queued_sender_sends_from_the_worker(settings, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    subscription = SubscriptionFactory()
+    context = {"subscription_plan": subscription.plan, "subscription": subscription, "user": subscription.user}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Sender(subscription.user, context=context, queued=True, **ACTIVATION_EMAIL)
+        Sender(DictToObject({"email": "guest@example.com"}), context=context, queued=True, **ACTIVATION_EMAIL)
+
+    assert [message.to for message in mail.outbox] == [[subscription.user.email], ["guest@example.com"]]
+    assert subscription.plan.name in mail.outbox[0].body
+
+
+def test_queued_notifications_are_retried_on_smtp_failures(settings, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    subscription = SubscriptionFactory()
+    send = EmailMultiAlternatives.send
+    attempts = []
+
+    def flaky_send(message, fail_silently=False):
+        attempts.append(message)
+        if len(attempts) == 1:
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        return send(message, fail_silently=fail_silently)
+
+    with mock.patch.object(EmailMultiAlternatives, "send", flaky_send):
+        with django_capture_on_commit_callbacks(execute=True):
+            Sender(subscription.user, context={"user": subscription.user}, queued=True, **ACTIVATION_EMAIL)
+
+    assert len(attempts) == 2
+    assert [message.to for message in mail.outbox] == [[subscription.user.email]]
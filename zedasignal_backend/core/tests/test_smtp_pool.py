@@ -0,0 +1,105 @@
+from smtplib import SMTPServerDisconnected
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.backends.locmem import EmailBackend
+
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory
+from zedasignal_backend.apps.users.models import User
+from zedasignal_backend.apps.users.tests.factories import UserFactory
+from zedasignal_backend.core.mass_email_sender import MassEmailSender
+from zedasignal_backend.core.utils import send_mass_html_mail
+from zedasignal_backend.core.utils.smtp_pool import SMTPConnectionPool
+
+
+class DroppingEmailBackend(EmailBackend):
+    """
+    Drops the connection on every `drop_every`-th message, like a relay that times idle sessions out.
+    """
+
+    drop_every = 3
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.attempts = 0
+
+    def send_messages(self, messages):
+        self.attempts += 1
+        if self.attempts % self.drop_every == 0:
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        return super().send_messages(messages)
+
+
+def build_messages(count: int) -> list[EmailMultiAlternatives]:
+    return [
+        EmailMultiAlternatives("Signal Alert", "body", "alerts@zedasignal.com", [f"user{index}@example.com"])
+        for index in range(count)
+    ]
+
+
+def test_pool_sends_over_several_reused_connections(smtp_server):
+    # a little latency keeps one connection from draining the queue before the others start
+    smtp_server.latency = 0.005
+    with SMTPConnectionPool(size=4) as pool:
+        assert pool.send_messages(build_messages(20)) == 20
+        assert pool.send_messages(build_messages(20)) == 20
+
+    assert len(smtp_server.recipients) == 40
+    assert len(smtp_server.sessions) == 4
+    assert sum(stats.sent for stats in pool.stats) == 40
+    assert all(stats.throughput > 0 for stats in pool.stats)
+
+
+def test_pool_retries_dropped_connections():
+    backend = f"{__name__}.DroppingEmailBackend"
+
+    with SMTPConnectionPool(size=2, backend=backend) as pool:
+        assert pool.send_messages(build_messages(10)) == 10
+
+    assert sorted(message.to[0] for message in mail.outbox) == sorted(
+        f"user{index}@example.com" for index in range(10)
+    )
+    assert sum(stats.retries for stats in pool.stats) >= 4
+    assert sum(stats.failed for stats in pool.stats) == 0
+
+
+def test_pool_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(DroppingEmailBackend, "drop_every", 1)
+    backend = f"{__name__}.DroppingEmailBackend"
+
+    with SMTPConnectionPool(size=2, max_retries=1, backend=backend) as pool:
+        with pytest.raises(SMTPServerDisconnected):
+            pool.send_messages(build_messages(4))
+
+    with SMTPConnectionPool(size=2, max_retries=1, fail_silently=True, backend=backend) as pool:
+        assert pool.send_messages(build_messages(4)) == 0
+    assert sum(stats.failed for stats in pool.stats) == 4
+    assert mail.outbox == []
+
+
+def test_send_mass_html_mail_uses_the_pool(settings, smtp_server):
+    settings.EMAIL_POOL_CONNECTIONS = 3
+    smtp_server.latency = 0.005
+
+    assert send_mass_html_mail(build_messages(12)) == 12
+    assert len(smtp_server.sessions) == 3
+
+
+@pytest.mark.django_db
+def test_mass_email_sender_keeps_pool_connections_across_chunks(settings, smtp_server):
+    settings.EMAIL_POOL_CONNECTIONS = 2
+    smtp_server.latency = 0.005
+    users = UserFactory.create_batch(6)
+
+    sender = MassEmailSender(
+        users=User.objects.filter(id__in=[user.id for user in users]),
+        email_content_object="notification.messages.signals",
+        include_user_in_context=True,
+        context={"signal": SignalFactory(), "domain": "http://localhost:3000"},
+        chunk_size=2,
+    )
+
+    assert sender.number_of_delivered_emails == 6
+    assert sorted(smtp_server.recipients) == sorted(user.username for user in users)
+    assert len(smtp_server.sessions) == 2
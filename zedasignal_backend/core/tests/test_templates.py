@@ -0,0 +1,43 @@
+from zedasignal_backend.apps.trading.tests.factories import SignalFactory
+from zedasignal_backend.apps.users.tests.factories import UserFactory
+from zedasignal_backend.core.utils.templates import PersonalisedTemplate
+
+SIGNAL_TEMPLATE = "emails/trading/signals/notification.html"
+
+
+def test_personalised_template_matches_full_render():
+    signal = SignalFactory.build(author=UserFactory.build(nickname="zedapex"))
+    users = [UserFactory.build(first_name=name) for name in ("Ada", "Tolu <b>", "Chidi & Co")]
+    context = {"signal": signal, "domain": "http://localhost:3000"}
+    template = PersonalisedTemplate(SIGNAL_TEMPLATE, context)
+
+    rendered = [template.render(user) for user in users]
+
+    assert template.is_personalisable is True
+    assert rendered == [template.render_full(user) for user in users]
+    assert "Hello, Tolu &lt;b&gt;." in rendered[1]
+
+
+def test_personalised_template_falls_back_to_full_render(settings, tmp_path):
+    (tmp_path / "greeting.html").write_text("Hello {{ user.first_name|upper }}")
+    settings.TEMPLATES = [{**settings.TEMPLATES[0], "DIRS": [str(tmp_path)]}]
+    template = PersonalisedTemplate("greeting.html", {})
+
+    rendered = [template.render(UserFactory.build(first_name=name)) for name in ("ada", "tolu")]
+
+    assert template.is_personalisable is False
+    assert rendered == ["Hello ADA", "Hello TOLU"]
+
+
+def test_personalised_template_renders_conditions_on_personal_fields_in_full(settings, tmp_path):
+    (tmp_path / "greeting.html").write_text(
+        "Hi {{ user.first_name }}{% if user.last_name %} {{ user.last_name }}{% else %} trader{% endif %}"
+    )
+    settings.TEMPLATES = [{**settings.TEMPLATES[0], "DIRS": [str(tmp_path)]}]
+    template = PersonalisedTemplate("greeting.html", {})
+    users = [UserFactory.build(first_name="A", last_name="B"), UserFactory.build(first_name="C", last_name="")]
+
+    rendered = [template.render(user) for user in users]
+
+    assert template.is_personalisable is False
+    assert rendered == ["Hi A B", "Hi C trader"]
@@ -0,0 +1,66 @@
+from unittest import mock
+
+from zedasignal_backend.core.termii.bulk_termii_sender import TermiiBulkSmsSender
+from zedasignal_backend.core.termii.session import close_http_session, get_http_session
+from zedasignal_backend.core.termii.termii import Termii
+
+
+def test_termii_clients_share_one_keep_alive_connection(termii_server):
+    termii = Termii()
+    termii.send_sms(to="+2348030000001", message="Signal Alert")
+    termii.send_sms(to="+2348030000002", message="Signal Alert")
+    TermiiBulkSmsSender().send_bulk_sms(to=["+2348030000003", "+2348030000004"], message="Signal Alert")
+
+    assert [request["path"] for request in termii_server.requests] == [
+        "/api/sms/send",
+        "/api/sms/send",
+        "/api/sms/send/bulk",
+    ]
+    assert len({request["client_port"] for request in termii_server.requests}) == 1
+    assert termii.client is termii.client
+
+
+def test_pooled_session_uses_configured_pool_and_timeouts(settings, termii_server):
+    settings.TERMII_HTTP_POOL_SIZE = 7
+    settings.TERMII_HTTP_CONNECT_TIMEOUT = 1.5
+    settings.TERMII_HTTP_READ_TIMEOUT = 9
+    close_http_session()
+
+    session = get_http_session()
+    assert session is get_http_session()
+    assert session.get_adapter("https://api.ng.termii.com")._pool_maxsize == 7  # type: ignore
+
+    with mock.patch.object(session, "post", wraps=session.post) as post:
+        Termii().send_sms(to="+2348030000001", message="Signal Alert")
+    assert post.call_args.kwargs["timeout"] == (1.5, 9)
+
+
+def test_bulk_client_sends_recipients_in_concurrent_batches(settings, termii_server):
+    settings.TERMII_BULK_BATCH_SIZE = 1000
+    settings.TERMII_BULK_MAX_WORKERS = 8
+    recipients = [f"+234803{index:07d}" for index in range(50_000)]
+
+    result = TermiiBulkSmsSender().send_bulk_sms(to=recipients, message="Signal Alert")
+
+    assert result.succeeded
+    assert len(result.batches) == 50
+    assert all(len(batch.recipients) == 1000 for batch in result.batches)
+    assert len(termii_server.requests) == 50
+    assert sorted(termii_server.recipients) == [recipient.lstrip("+") for recipient in recipients]
+    assert len(result.delivered_recipients) == 50_000
+
+
+def test_bulk_client_reports_failed_batches_without_raising(settings, termii_server):
+    settings.TERMII_BULK_BATCH_SIZE = 2
+    termii_server.status_code = 503
+
+    result = TermiiBulkSmsSender().send_bulk_sms(
+        to=["+2348030000001", "+2348030000002", "+2348030000003"], message="x"
+    )
+
+    assert not result.succeeded
+    assert [batch.recipients for batch in result.failed_batches] == [
+        ["2348030000001", "2348030000002"],
+        ["2348030000003"],
+    ]
+    assert result.delivered_recipients == []
@@ -1,6 +1,7 @@
 from .dict_to_object import *  # noqa
 from .emails import *  # noqa
 from .main import *  # noqa
+from .templates import *  # noqa
 
 # __all__ = [
 #     "DictToObject",
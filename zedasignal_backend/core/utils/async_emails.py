@@ -0,0 +1,105 @@
+import asyncio
+import logging
+from functools import partial
+
+import aiosmtplib
+from django.conf import settings
+from django.core.mail import EmailMessage
+
+from zedasignal_backend.core.circuit_breaker import circuit_breaker
+from zedasignal_backend.core.rate_limiter import throttle_async
+from zedasignal_backend.core.utils.retry import retry_transient_async
+from zedasignal_backend.core.utils.smtp_pool import is_transient_smtp_error
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSMTPSender:
+    """
+    Sends emails over several concurrent SMTP sessions from a single event loop.
+
+    Each of the `EMAIL_ASYNC_CONNECTIONS` sessions pulls the next message from a shared queue as soon
+    as the previous one is accepted, so a slow server response only stalls one session.
+    Connection settings are read from the same `EMAIL_*` settings as Django's SMTP backend.
+
+    Like `SMTPConnectionPool`, each message is retried on transient failures, reconnecting the session
+    when it dropped. With `fail_silently`, messages that still fail are kept with their error for
+    `pop_failures()` and the other messages are sent; otherwise the first failure is raised.
+    """
+
+    def __init__(self, connections: int | None = None, fail_silently: bool = False):
+        self.connections = connections if connections is not None else settings.EMAIL_ASYNC_CONNECTIONS
+        self.fail_silently = fail_silently
+        self.failures: list[tuple[EmailMessage, Exception]] = []
+
+    def build_smtp_client(self) -> aiosmtplib.SMTP:
+        return aiosmtplib.SMTP(
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            username=settings.EMAIL_HOST_USER or None,
+            password=settings.EMAIL_HOST_PASSWORD or None,
+            use_tls=settings.EMAIL_USE_SSL,
+            start_tls=settings.EMAIL_USE_TLS,
+            timeout=settings.EMAIL_TIMEOUT,
+        )
+
+    async def send_messages(self, messages: list[EmailMessage]) -> int:
+        queue: asyncio.Queue[EmailMessage] = asyncio.Queue()
+        for message in messages:
+            queue.put_nowait(message)
+
+        sessions = [self.run_session(queue) for _ in range(min(self.connections, len(messages)))]
+        return sum(await asyncio.gather(*sessions))
+
+    async def run_session(self, queue: asyncio.Queue[EmailMessage]) -> int:
+        number_of_sent_emails = 0
+        smtp = self.build_smtp_client()
+        try:
+            while not queue.empty():
+                message = queue.get_nowait()
+                await throttle_async("email", len(message.recipients()))
+                try:
+                    await retry_transient_async(partial(self.send_message, smtp, message), is_transient_smtp_error)
+                except Exception as error:
+                    if not self.fail_silently:
+                        raise
+                    logger.warning("Sending an email to %s failed with %r", message.recipients(), error)
+                    self.failures.append((message, error))
+                else:
+                    number_of_sent_emails += 1
+        finally:
+            if smtp.is_connected:
+                try:
+                    await smtp.quit()
+                except aiosmtplib.SMTPException:
+                    smtp.close()
+        return number_of_sent_emails
+
+    async def send_message(self, smtp: aiosmtplib.SMTP, message: EmailMessage):
+        # a server that can't be reached fails the message straight away while the email circuit is open
+        with circuit_breaker("email", is_transient_smtp_error):
+            if not smtp.is_connected:
+                await smtp.connect()
+            await smtp.sendmail(
+                message.from_email,
+                message.recipients(),
+                message.message().as_bytes(linesep="\r\n"),
+            )
+
+    def pop_failures(self) -> list[tuple[EmailMessage, Exception]]:
+        """
+        Returns the messages that failed for good since the last call, with their error.
+        """
+        failures, self.failures = self.failures, []
+        return failures
+
+
+def send_mass_html_mail_async(messages: list[EmailMessage], sender: AsyncSMTPSender | None = None) -> int:
+    """
+    Blocking entrypoint to `AsyncSMTPSender` for synchronous callers such as celery tasks.
+    Returns the number of emails sent.
+    """
+    if not messages:
+        return 0
+    sender = sender if sender is not None else AsyncSMTPSender()
+    return asyncio.run(sender.send_messages(messages))
@@ -1,5 +1,73 @@
+import copy
+import threading
+
+from django.conf import settings
 from django.core.mail import EmailMultiAlternatives, get_connection
 
+from zedasignal_backend.core.rate_limiter import get_rate_limiter
+from zedasignal_backend.core.utils.smtp_pool import SMTPConnectionPool
+
+UNDISCLOSED_RECIPIENTS = "undisclosed-recipients:;"
+
+
+class _SerialisedMIME:
+    """
+    Wraps a MIME message and serialises it only once, however many times it is sent.
+    """
+
+    def __init__(self, mime):
+        self.mime = mime
+        self.serialised: dict[tuple, bytes] = {}
+        # copies of the message are sent from several pool threads at once
+        self.lock = threading.Lock()
+
+    def as_bytes(self, unixfrom=False, linesep="\n") -> bytes:
+        key = (unixfrom, linesep)
+        with self.lock:
+            if key not in self.serialised:
+                self.serialised[key] = self.mime.as_bytes(unixfrom, linesep)
+            return self.serialised[key]
+
+    def __getattr__(self, name):
+        return getattr(self.mime, name)
+
+
+class BroadcastEmailMessage(EmailMultiAlternatives):
+    """
+    An html email whose MIME payload is built and serialised once, then sent unchanged to any number
+    of recipients.
+
+    The recipients are only given in the SMTP envelope, like Bcc, and the To header reads
+    "undisclosed-recipients:;", so no recipient sees the others. `for_recipients()` returns copies
+    that share the serialised payload and only differ by their envelope recipients, so sending a
+    broadcast costs one MIME build in total rather than one per recipient.
+
+    Usage:
+        broadcast = BroadcastEmailMessage(subject, html, from_email)
+        send_mass_html_mail([broadcast.for_recipients(batch) for batch in chunked(emails, 50)])
+    """
+
+    content_subtype = "html"
+
+    def __init__(self, subject="", body="", from_email=None, recipients=None, **kwargs):
+        headers = {"To": UNDISCLOSED_RECIPIENTS, **kwargs.pop("headers", {})}
+        super().__init__(subject, body, from_email, bcc=recipients, headers=headers, **kwargs)
+        self.serialised_message = None
+
+    def message(self):
+        if self.serialised_message is None:
+            self.serialised_message = _SerialisedMIME(super().message())
+        return self.serialised_message
+
+    def for_recipients(self, recipients: list[str]) -> "BroadcastEmailMessage":
+        """
+        Returns a copy of the message, sharing its payload, addressed to `recipients`.
+        """
+        self.message()
+        message = copy.copy(self)
+        message.bcc = list(recipients)
+        return message
+
 
 def send_mass_html_mail(
     messages: list[EmailMultiAlternatives],
@@ -7,6 +75,7 @@ def send_mass_html_mail(
     user=None,
     password=None,
     connection=None,
+    pool: SMTPConnectionPool | None = None,
 ):
     """
     Given a datatuple of (subject, text_content, html_content, from_email,
@@ -18,8 +87,27 @@ def send_mass_html_mail(
     If auth_user is None, the EMAIL_HOST_USER setting is used.
     If auth_password is None, the EMAIL_HOST_PASSWORD setting is used.
 
+    Unless a connection is given, messages are sent concurrently over an `SMTPConnectionPool` of
+    `EMAIL_POOL_CONNECTIONS` connections. Pass `pool` to reuse the connections of an open pool.
+
+    When the email rate limit is set, messages are sent one at a time per connection, at the pace
+    the limit allows.
     """
+    if pool is not None:
+        return pool.send_messages(messages)
+    if connection is None and settings.EMAIL_POOL_CONNECTIONS > 1 and len(messages) > 1:
+        with SMTPConnectionPool(fail_silently=fail_silently, username=user, password=password) as pool:
+            return pool.send_messages(messages)
+
     connection = connection or get_connection(username=user, password=password, fail_silently=fail_silently)
+    rate_limiter = get_rate_limiter("email")
+    if rate_limiter is not None:
+        number_of_sent_emails = 0
+        with connection:
+            for message in messages:
+                rate_limiter.acquire(len(message.recipients()))
+                number_of_sent_emails += connection.send_messages([message]) or 0
+        return number_of_sent_emails
     # messages = []
     # for subject, text, html, from_email, recipient in datatuple:
     #     message = EmailMultiAlternatives(subject, text, from_email, recipient)
@@ -1,11 +1,14 @@
 import string
-from typing import TypedDict
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import TypedDict, TypeVar
 
 import phonenumbers
-import requests
 from django.conf import settings
 from django.utils.crypto import get_random_string
 
+from zedasignal_backend.core.termii.session import get_http_session, get_http_timeout
+
 
 def generate_numeric_code(length=6):
     """
@@ -19,6 +22,20 @@ def add_count(data: dict | list, count: int) -> dict:
     return dict(data=data, count=count)
 
 
+T = TypeVar("T")
+
+
+def chunked(iterable: Iterable[T], chunk_size: int) -> Iterator[list[T]]:
+    """
+    Lazily splits an iterable into consecutive lists of at most `chunk_size` items.
+    Only one chunk is held in memory at a time, so it is safe to use with
+    `QuerySet.iterator()` over large tables.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
 class SmsParams(TypedDict):
     username: str
     from_: str
@@ -44,8 +61,8 @@ def send_sms_using_proxy_server(params: SmsParams):
         "to": params["to"],
         "message": params["message"],
     }
-    # Send the GET request
-    response = requests.get(url, params=payload)
+    # Send the GET request over the pooled SMS session
+    response = get_http_session().get(url, params=payload, timeout=get_http_timeout())
 
     return response
 
@@ -0,0 +1,54 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from django.conf import settings
+
+T = TypeVar("T")
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Returns how long to wait before retrying after the `attempt`-th failure (counted from 0).
+
+    The delay is drawn at random between 0 and `NOTIFICATION_RETRY_BASE_DELAY * 2 ** attempt` seconds,
+    capped at `NOTIFICATION_RETRY_MAX_DELAY` ("full jitter"), so senders that failed together don't all
+    retry at the same moment.
+    """
+    ceiling = min(settings.NOTIFICATION_RETRY_MAX_DELAY, settings.NOTIFICATION_RETRY_BASE_DELAY * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+def retry_transient(func: Callable[[], T], is_transient: Callable[[Exception], bool]) -> T:
+    """
+    Calls `func`, retrying it up to `NOTIFICATION_RETRY_ATTEMPTS` times with a jittered exponential
+    backoff while it fails with an error `is_transient` accepts. Other errors are raised straight away.
+
+    Args:
+        func (Callable): The call to make, e.g. a `functools.partial` of the provider request.
+        is_transient (Callable): Tells whether an error is worth retrying.
+    """
+    for attempt in range(settings.NOTIFICATION_RETRY_ATTEMPTS + 1):
+        try:
+            return func()
+        except Exception as error:
+            if attempt == settings.NOTIFICATION_RETRY_ATTEMPTS or not is_transient(error):
+                raise
+            time.sleep(backoff_delay(attempt))
+    raise AssertionError("unreachable")
+
+
+async def retry_transient_async(func: Callable[[], Awaitable[T]], is_transient: Callable[[Exception], bool]) -> T:
+    """
+    The asyncio counterpart of `retry_transient`.
+    """
+    for attempt in range(settings.NOTIFICATION_RETRY_ATTEMPTS + 1):
+        try:
+            return await func()
+        except Exception as error:
+            if attempt == settings.NOTIFICATION_RETRY_ATTEMPTS or not is_transient(error):
+                raise
+            await asyncio.sleep(backoff_delay(attempt))
+    raise AssertionError("unreachable")
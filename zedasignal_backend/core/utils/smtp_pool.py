@@ -0,0 +1,203 @@
+import logging
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from smtplib import SMTPRecipientsRefused, SMTPResponseException, SMTPServerDisconnected
+
+import aiosmtplib
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from zedasignal_backend.core.circuit_breaker import circuit_breaker
+from zedasignal_backend.core.rate_limiter import throttle
+from zedasignal_backend.core.utils.retry import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+# errors after which the connection is assumed to be dead and is opened again
+RECONNECT_ERRORS = (SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def is_transient_smtp_error(error: Exception) -> bool:
+    """
+    Tells whether sending a message again may succeed: the connection dropped, or the server answered
+    with a 4xx (try again later) code rather than a permanent 5xx rejection. Understands the errors of
+    both `smtplib` and `aiosmtplib`.
+    """
+    if isinstance(error, RECONNECT_ERRORS):
+        return True
+    if isinstance(error, SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(400 <= refused.code < 500 for refused in error.recipients)
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return 400 <= error.code < 500
+    return False
+
+
+@dataclass
+class ConnectionStats:
+    index: int
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.sent / self.busy_seconds if self.busy_seconds else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"connection {self.index}: {self.sent} sent ({self.throughput:.0f}/s), "
+            f"{self.failed} failed, {self.retries} retries"
+        )
+
+
+class PooledConnection:
+    def __init__(self, index: int, **connection_kwargs):
+        # errors are always raised to the pool, which decides whether to retry or give up on the message
+        self.backend = get_connection(fail_silently=False, **connection_kwargs)
+        self.stats = ConnectionStats(index)
+        self.is_open = False
+
+    def open(self):
+        if not self.is_open:
+            self.backend.open()
+            self.is_open = True
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            try:
+                self.backend.close()
+            except OSError:
+                # the server already went away, there's nothing left to close
+                pass
+
+
+class SMTPConnectionPool:
+    """
+    A bounded pool of email connections that sends messages from several threads at once.
+
+    Each of the `size` connections (defaults to `EMAIL_POOL_CONNECTIONS`) is owned by one worker thread
+    at a time and pulls the next message from a shared queue as soon as the previous one is accepted.
+    Connections are opened on first use and kept open between `send_messages` calls until the pool is
+    closed, so the handshake is paid once per connection rather than once per chunk. A message that fails
+    with a transient error (a dropped connection or a 4xx reply) is retried with a jittered exponential
+    backoff, up to `max_retries` times (defaults to `NOTIFICATION_RETRY_ATTEMPTS`); a dropped connection is
+    opened again first. Messages that still fail, or aren't sent because the email circuit is open, are kept
+    in `failures` until `pop_failures()` is called, and either raised or, with `fail_silently`, counted as
+    not sent.
+
+    The connections come from `get_connection()`, so the pool works with any email backend. Throughput
+    per connection is kept in `stats` and logged when the pool is closed.
+
+    Usage:
+        with SMTPConnectionPool() as pool:
+            pool.send_messages(messages)
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        max_retries: int | None = None,
+        fail_silently: bool = False,
+        **connection_kwargs,
+    ):
+        self.size = size if size is not None else settings.EMAIL_POOL_CONNECTIONS
+        self.max_retries = max_retries if max_retries is not None else settings.NOTIFICATION_RETRY_ATTEMPTS
+        self.fail_silently = fail_silently
+        self.failures: list[tuple[EmailMessage, OSError]] = []
+        self.connections = [PooledConnection(index, **connection_kwargs) for index in range(self.size)]
+        self.idle_connections: queue.SimpleQueue[PooledConnection] = queue.SimpleQueue()
+        for connection in self.connections:
+            self.idle_connections.put(connection)
+        self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="smtp-pool")
+
+    @property
+    def stats(self) -> list[ConnectionStats]:
+        return [connection.stats for connection in self.connections]
+
+    def send_messages(self, messages: list[EmailMessage]) -> int:
+        """
+        Sends the messages over the pooled connections and returns the number of emails sent.
+
+        Args:
+            messages (list[EmailMessage]): The messages to send.
+        """
+        pending: queue.SimpleQueue[EmailMessage] = queue.SimpleQueue()
+        for message in messages:
+            pending.put(message)
+
+        workers = [self.executor.submit(self.run_worker, pending) for _ in range(min(self.size, len(messages)))]
+        # every worker is waited for before an error is raised, so no thread is left sending
+        results = [worker.exception() or worker.result() for worker in workers]
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return sum(results)
+
+    def run_worker(self, pending: queue.SimpleQueue[EmailMessage]) -> int:
+        connection = self.idle_connections.get()
+        number_of_sent_emails = 0
+        try:
+            while True:
+                try:
+                    message = pending.get_nowait()
+                except queue.Empty:
+                    return number_of_sent_emails
+                number_of_sent_emails += self.send_message(connection, message)
+        finally:
+            self.idle_connections.put(connection)
+
+    def send_message(self, connection: PooledConnection, message: EmailMessage) -> int:
+        throttle("email", len(message.recipients()))
+        started_at = time.perf_counter()
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    with circuit_breaker("email", is_transient_smtp_error):
+                        connection.open()
+                        sent = connection.backend.send_messages([message]) or 0
+                    break
+                except OSError as error:
+                    if isinstance(error, RECONNECT_ERRORS):
+                        connection.close()
+                    if attempt == self.max_retries or not is_transient_smtp_error(error):
+                        connection.stats.failed += 1
+                        self.failures.append((message, error))
+                        if self.fail_silently:
+                            return 0
+                        raise
+                    logger.warning("Email connection %d failed with %r, retrying", connection.stats.index, error)
+                    connection.stats.retries += 1
+                    time.sleep(backoff_delay(attempt))
+        finally:
+            connection.stats.busy_seconds += time.perf_counter() - started_at
+        connection.stats.sent += sent
+        connection.stats.failed += 1 - sent
+        return sent
+
+    def pop_failures(self) -> list[tuple[EmailMessage, OSError]]:
+        """
+        Returns the messages that failed for good since the last call, with their error.
+        """
+        failures, self.failures = self.failures, []
+        return failures
+
+    def close(self):
+        self.executor.shutdown()
+        for connection in self.connections:
+            connection.close()
+            if connection.stats.sent or connection.stats.failed:
+                logger.info("Email pool %s", connection.stats)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
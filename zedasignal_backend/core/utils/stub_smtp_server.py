@@ -0,0 +1,67 @@
+import asyncio
+import socket
+import threading
+
+from aiosmtpd.controller import Controller
+
+
+class StubSMTPServer:
+    """
+    A local SMTP server that accepts and records every message, used by tests and benchmarks.
+
+    Set `latency` to the number of seconds the server waits before accepting each message, to
+    simulate a remote relay. Messages to one of `refused_recipients` are refused for good, and messages
+    to a recipient of `deferred_recipients` are deferred that many times before they are accepted.
+
+    Usage:
+        with StubSMTPServer() as server:
+            settings.EMAIL_HOST, settings.EMAIL_PORT = server.host, server.port
+    """
+
+    def __init__(self, latency: float = 0):
+        self.latency = latency
+        self.host = "127.0.0.1"
+        self.port = self.find_free_port()
+        self.envelopes: list = []
+        self.sessions: set[int] = set()
+        self.refused_recipients: set[str] = set()
+        self.deferred_recipients: dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.controller = Controller(self, hostname=self.host, port=self.port)
+
+    def find_free_port(self) -> int:
+        with socket.socket() as sock:
+            sock.bind((self.host, 0))
+            return sock.getsockname()[1]
+
+    @property
+    def recipients(self) -> list[str]:
+        return [recipient for envelope in self.envelopes for recipient in envelope.rcpt_tos]
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        with self.lock:
+            if self.refused_recipients.intersection(envelope.rcpt_tos):
+                return "550 No such user"
+            deferred = [recipient for recipient in envelope.rcpt_tos if self.deferred_recipients.get(recipient)]
+            if deferred:
+                for recipient in deferred:
+                    self.deferred_recipients[recipient] -= 1
+                return "451 Try again later"
+            self.envelopes.append(envelope)
+            self.sessions.add(id(session))
+        return "250 Message accepted for delivery"
+
+    def start(self):
+        self.controller.start()
+        return self
+
+    def stop(self):
+        self.controller.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
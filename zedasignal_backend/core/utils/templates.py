@@ -0,0 +1,131 @@
+import re
+import uuid
+from typing import Any
+
+from django.template.loader import get_template
+from django.utils.html import conditional_escape
+
+
+class _PersonalisedFieldMarker(str):
+    """
+    The marker rendered in place of a per-recipient field. Rendering it with autoescaping only calls
+    `__html__`, so any other use, e.g. `{% if user.last_name %}`, a filter or a nested lookup, means the
+    template depends on the value of the field, and flags the placeholder as misused.
+    """
+
+    def __new__(cls, value: str, placeholder: "_PersonalisedFieldPlaceholder"):
+        marker = super().__new__(cls, value)
+        object.__setattr__(marker, "_placeholder", placeholder)
+        return marker
+
+    def __html__(self) -> str:
+        return str.__str__(self)
+
+    def __bool__(self) -> bool:
+        object.__getattribute__(self, "_placeholder").misused = True
+        return True
+
+    def __getattribute__(self, name: str) -> Any:
+        if name not in ("__html__", "__class__", "_placeholder"):
+            object.__getattribute__(self, "_placeholder").misused = True
+        return super().__getattribute__(name)
+
+
+def _flag_misuse(name: str):
+    method = getattr(str, name)
+
+    def flagged(self, *args, **kwargs):
+        object.__getattribute__(self, "_placeholder").misused = True
+        return method(self, *args, **kwargs)
+
+    return flagged
+
+
+# implicit uses like comparisons or `str()` bypass `__getattribute__`
+for _name in (
+    "__len__",
+    "__iter__",
+    "__getitem__",
+    "__contains__",
+    "__eq__",
+    "__ne__",
+    "__lt__",
+    "__le__",
+    "__gt__",
+    "__ge__",
+    "__hash__",
+    "__str__",
+    "__add__",
+    "__mul__",
+    "__mod__",
+    "__format__",
+):
+    setattr(_PersonalisedFieldMarker, _name, _flag_misuse(_name))
+
+
+class _PersonalisedFieldPlaceholder:
+    """
+    Stands in for the per-recipient object while the shared part of a template is rendered.
+    Every attribute lookup renders as a unique marker naming the attribute.
+    """
+
+    def __init__(self, token: str):
+        self._token = token
+        self.misused = False
+
+    def __getattr__(self, name: str) -> str:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _PersonalisedFieldMarker(f"{self._token}:{name}:", self)
+
+
+class PersonalisedTemplate:
+    """
+    Renders a template once per batch of recipients and fills in only the per-recipient fields
+    for each of them.
+
+    The template is rendered a single time with a placeholder in place of `context[personal_key]`,
+    and the output is split around the placeholder markers. `render()` then joins the static parts
+    with the escaped attributes of each recipient. This only works for templates that output the
+    recipient's attributes directly (e.g. `{{ user.first_name }}`). Templates that test or filter them
+    (e.g. `{% if user.last_name %}`) would be rendered once for every recipient with the branch taken for
+    the placeholder, so they are always rendered in full. As a last check, the first render is compared
+    with a full render and the template falls back to full per-recipient rendering on mismatch.
+    """
+
+    def __init__(self, template: Any, context: dict[str, Any], personal_key: str = "user"):
+        # either a template name or an already compiled template
+        self.template = get_template(template) if isinstance(template, str) else template
+        self.context = context
+        self.personal_key = personal_key
+        # unknown until the first render has been checked against a full render
+        self.is_personalisable: bool | None = None
+
+        token = f"zs-personal-{uuid.uuid4().hex}"
+        placeholder = _PersonalisedFieldPlaceholder(token)
+        shared_content = self.template.render({**context, personal_key: placeholder})
+        self.segments = re.split(rf"{re.escape(token)}:(\w+):", shared_content)
+        if placeholder.misused:
+            self.is_personalisable = False
+
+    def render_full(self, personal_object: Any) -> str:
+        return self.template.render({**self.context, self.personal_key: personal_object})
+
+    def render_fast(self, personal_object: Any) -> str:
+        parts = []
+        for index, segment in enumerate(self.segments):
+            # odd segments are the attribute names captured by the split
+            parts.append(conditional_escape(getattr(personal_object, segment)) if index % 2 else segment)
+        return "".join(parts)
+
+    def render(self, personal_object: Any) -> str:
+        if self.is_personalisable:
+            return self.render_fast(personal_object)
+
+        content = self.render_full(personal_object)
+        if self.is_personalisable is None:
+            try:
+                self.is_personalisable = self.render_fast(personal_object) == content
+            except AttributeError:
+                self.is_personalisable = False
+        return content
@@ -1,10 +1,21 @@
+import hashlib
+from collections.abc import Callable
 from typing import Any
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import Max
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 from rest_framework import mixins
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from zedasignal_backend.core.response_cache import get_model_versions, get_response_cache_key
 from zedasignal_backend.core.success_response import SuccessResponse
 
 
@@ -13,16 +24,101 @@ class CustomReadOnlyViewSet(
     mixins.ListModelMixin,
     GenericViewSet,
 ):
+    """
+    A read only viewset whose responses are wrapped in a `SuccessResponse`.
+
+    Views that list `cache_models` keep their serialised payloads in the default cache, so requests for
+    the same url skip the database and the serializer until a row of one of those models changes. Each
+    model has a version in the cache that is bumped on save and delete (see `bump_model_version`), and the
+    versions are part of the cache key, so a change is seen at once by every node. Updates that bypass the
+    model signals, like `QuerySet.update()`, must bump the version themselves. Permission checks still run
+    on every request, so only cache views whose payload is the same for every user allowed to see it.
+
+    The same views answer conditional GETs. The `ETag` of a response is built from its url and the model
+    versions, so it changes exactly when its cache key does, without querying the rows. Views that set
+    `last_modified_field` also send a `Last-Modified` header, the latest value of that column, which
+    should be indexed. A request whose `If-None-Match` or `If-Modified-Since` header still matches gets a
+    `304 Not Modified` without serialising or rendering anything. The versions are read before the rows,
+    so a write landing in between can only pair a fresh payload with an older `ETag`, which the next
+    poll revalidates, and never a stale payload with a newer one.
+    """
+
+    cache_models: tuple[type[models.Model], ...] = ()
+    last_modified_field: str | None = None
+
     def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        response = super().list(request, *args, **kwargs)
-        return SuccessResponse(
-            status=response.status_code,
-            data=response.data,
-        )
+        response = self.get_cached_response(super().list, request, *args, **kwargs)
+        return self.finalize_success_response(response)
 
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        response = super().retrieve(request, *args, **kwargs)
-        return SuccessResponse(
+        response = self.get_cached_response(super().retrieve, request, *args, **kwargs)
+        return self.finalize_success_response(response)
+
+    def finalize_success_response(self, response: Response) -> Response:
+        if response.status_code == 304:
+            return response
+        success_response = SuccessResponse(
             status=response.status_code,
             data=response.data,
         )
+        for header in ("ETag", "Last-Modified"):
+            if header in response:
+                success_response[header] = response[header]
+        return success_response
+
+    def get_cached_response(self, view: Callable[..., Response], request: Request, *args: Any, **kwargs: Any):
+        if not self.cache_models:
+            return view(request, *args, **kwargs)
+
+        versions = get_model_versions(*self.cache_models)
+        # the absolute url covers the lookup, the query string and the links built by the paginator
+        url = request.build_absolute_uri()
+        key = get_response_cache_key(f"{type(self).__name__}.{self.action}", versions, url)
+        entry = cache.get(key)
+
+        etag = get_response_cache_key("etag", versions, url)
+        etag = f'W/"{hashlib.md5(etag.encode(), usedforsecurity=False).hexdigest()}"'
+        last_modified = entry["last_modified"] if entry else self.get_last_modified(**kwargs)
+        not_modified = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            set_validator_headers(not_modified, etag, last_modified)
+            return not_modified
+
+        if entry:
+            response = Response(entry["data"])
+        else:
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cache.set(
+                key,
+                {"data": response.data, "last_modified": last_modified},
+                timeout=settings.RESPONSE_CACHE_TIMEOUT,
+            )
+        set_validator_headers(response, etag, last_modified)
+        return response
+
+    def get_last_modified(self, **kwargs: Any) -> int | None:
+        """
+        Returns the `Last-Modified` timestamp of the response, the latest `last_modified_field` of its rows,
+        or None when the view doesn't set `last_modified_field`. It is a single `MAX` over that column,
+        which the database reads off the end of its index.
+        """
+        if self.last_modified_field is None:
+            return None
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            if self.action == "retrieve":
+                lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+                queryset = queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+            last_modified = queryset.aggregate(last_modified=Max(self.last_modified_field))["last_modified"]
+        except (TypeError, ValueError, ValidationError):
+            # a malformed lookup, left to the view to answer with a 404
+            return None
+        return int(last_modified.timestamp()) if last_modified else None
+
+
+def set_validator_headers(response: HttpResponseBase, etag: str, last_modified: int | None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
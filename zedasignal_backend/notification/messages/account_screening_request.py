@@ -19,6 +19,8 @@ class MyMessages:
 
     EMAIL_SUBJECT = "Account Screening Request"
 
+    HTML_TEMPLATE = "emails/account-screening-request/notification.html"
+
     # EMAIL_MESSAGE = """"""
 
     # SMS_MESSAGE = """{}"""
@@ -19,6 +19,8 @@ class MyMessages:
 
     EMAIL_SUBJECT = "Account Upgrade Payment Request"
 
+    HTML_TEMPLATE = "emails/account-upgrade-payment-request/notification.html"
+
     # EMAIL_MESSAGE = """"""
 
     # SMS_MESSAGE = """{}"""
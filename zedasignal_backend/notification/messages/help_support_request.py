@@ -19,6 +19,8 @@ class MyMessages:
 
     EMAIL_SUBJECT = "Request for Help/Support"
 
+    HTML_TEMPLATE = "emails/help-support-request/notification.html"
+
     # EMAIL_MESSAGE = """"""
 
     # SMS_MESSAGE = """{}"""
@@ -19,6 +19,8 @@ class MyMessages:
 
     EMAIL_SUBJECT = "Welcome to Zedasignal 🚀🥳"
 
+    HTML_TEMPLATE = "emails/authentication/registration-welcome-message.html"
+
     # EMAIL_MESSAGE = """"""
 
     # SMS_MESSAGE = """{}"""
@@ -19,6 +19,8 @@ class MyMessages:
 
     EMAIL_SUBJECT = "Password Reset Token"
 
+    HTML_TEMPLATE = "emails/authentication/password-reset.html"
+
     # EMAIL_MESSAGE = """"""
 
     # SMS_MESSAGE = """{}"""
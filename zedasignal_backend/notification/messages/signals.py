@@ -19,6 +19,8 @@ class MyMessages:
 
     EMAIL_SUBJECT = "New Signal Notification"
 
+    HTML_TEMPLATE = "emails/trading/signals/notification.html"
+
     # EMAIL_MESSAGE = """"""
 
     # SMS_MESSAGE = """{}"""
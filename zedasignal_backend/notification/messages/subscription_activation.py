@@ -19,6 +19,8 @@ class MyMessages:
 
     EMAIL_SUBJECT = "Subscription Activation Notification"
 
+    HTML_TEMPLATE = "emails/trading/subscription/activation-notification.html"
+
     # EMAIL_MESSAGE = """"""
 
     # SMS_MESSAGE = """{}"""
@@ -19,6 +19,8 @@ class MyMessages:
 
     EMAIL_SUBJECT = "Account Verification"
 
+    HTML_TEMPLATE = "emails/authentication/user-verification.html"
+
     # EMAIL_MESSAGE = """"""
 
     # SMS_MESSAGE = """{}"""